@@ -0,0 +1,38 @@
+"""
+Comando para exportar el historial completo de uno o varios pacientes
+
+Se ejecuta desde la raiz del proyecto:
+
+    python -m src.comandos.exportar_pacientes salida.ndjson 12
+    python -m src.comandos.exportar_pacientes salida.csv 12 15 40 --formato csv
+    python -m src.comandos.exportar_pacientes todos.ndjson --todos
+"""
+import argparse
+from src.controllers.paciente_controller import PacienteController
+from src.config.constantes import FORMATOS_EXPORTACION
+
+def main() -> None:
+    """Exporta los pacientes indicados y muestra el resumen"""
+    parser = argparse.ArgumentParser(description="Exporta el historial completo de pacientes")
+    parser.add_argument("ruta", help="Archivo de salida")
+    parser.add_argument("ids", nargs="*", type=int, help="IDs de los pacientes")
+    parser.add_argument("--todos", action="store_true", help="Exportar todos los pacientes")
+    parser.add_argument("--formato", choices=FORMATOS_EXPORTACION, default="ndjson", help="Formato de salida")
+    argumentos = parser.parse_args()
+
+    if not argumentos.ids and not argumentos.todos:
+        parser.error("Indique al menos un ID de paciente o --todos")
+
+    controlador = PacienteController()
+
+    # Un solo paciente se resuelve por indices; varios en una pasada por los archivos
+    if len(argumentos.ids) == 1 and not argumentos.todos:
+        resultado = controlador.exportar_historial(argumentos.ids[0], argumentos.ruta, argumentos.formato)
+    else:
+        ids = None if argumentos.todos else argumentos.ids
+        resultado = controlador.exportar_historiales(ids, argumentos.ruta, argumentos.formato)
+
+    print(resultado["mensaje"])
+
+if __name__ == "__main__":
+    main()
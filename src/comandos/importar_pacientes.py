@@ -0,0 +1,33 @@
+"""
+Comando para registrar pacientes en bloque desde un archivo CSV
+
+Se ejecuta desde la raiz del proyecto:
+
+    python -m src.comandos.importar_pacientes pacientes.csv
+    python -m src.comandos.importar_pacientes pacientes.csv --rechazos errores.csv --procesos 4
+
+Columnas del CSV: dni, nombre, fecha_nacimiento, telefono, tipo_seguro, fecha_registro
+"""
+import argparse
+from src.controllers.paciente_controller import PacienteController
+
+def main() -> None:
+    """Importa el CSV indicado y muestra el resumen"""
+    parser = argparse.ArgumentParser(description="Importa pacientes desde un archivo CSV")
+    parser.add_argument("ruta_csv", help="Archivo CSV con los pacientes")
+    parser.add_argument("--rechazos", default=None, help="CSV donde se guardan las filas rechazadas")
+    parser.add_argument("--procesos", type=int, default=None, help="Procesos de validacion (1 = sin paralelo)")
+    argumentos = parser.parse_args()
+
+    resultado = PacienteController().importar_pacientes(
+        argumentos.ruta_csv,
+        ruta_rechazos=argumentos.rechazos,
+        procesos=argumentos.procesos
+    )
+    print(resultado["mensaje"])
+
+    if resultado["datos"] and resultado["datos"]["rechazados"]:
+        print(f"Detalle de rechazos: {resultado['datos']['ruta_rechazos']}")
+
+if __name__ == "__main__":
+    main()
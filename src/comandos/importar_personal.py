@@ -0,0 +1,34 @@
+"""
+Comando para registrar personal en bloque (con su contrato inicial) desde un CSV o JSON
+
+Se ejecuta desde la raiz del proyecto:
+
+    python -m src.comandos.importar_personal personal.csv
+    python -m src.comandos.importar_personal personal.json --rechazos errores.csv --procesos 4
+
+Campos: dni, nombre, fecha_nacimiento, telefono, rol, especialidad, departamentos,
+jornada, turno, salario_base, fecha_contratacion, tipo_contrato, fecha_fin
+"""
+import argparse
+from src.controllers.personal_controller import PersonalController
+
+def main() -> None:
+    """Importa el archivo indicado y muestra el resumen"""
+    parser = argparse.ArgumentParser(description="Importa personal desde un archivo CSV o JSON")
+    parser.add_argument("ruta", help="Archivo .csv o .json con el personal")
+    parser.add_argument("--rechazos", default=None, help="CSV donde se guardan las filas rechazadas")
+    parser.add_argument("--procesos", type=int, default=None, help="Procesos de validacion (1 = sin paralelo)")
+    argumentos = parser.parse_args()
+
+    resultado = PersonalController().importar_personal(
+        argumentos.ruta,
+        ruta_rechazos=argumentos.rechazos,
+        procesos=argumentos.procesos
+    )
+    print(resultado["mensaje"])
+
+    if resultado["datos"] and resultado["datos"]["rechazados"]:
+        print(f"Detalle de rechazos: {resultado['datos']['ruta_rechazos']}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,20 @@
+"""
+Comando para cerrar las citas vencidas que siguen como Agendada
+
+Se puede ejecutar a mano o programar (cron / Programador de tareas) una vez
+al dia desde la raiz del proyecto:
+
+    python -m src.comandos.vencer_citas
+"""
+from src.controllers.cita_controller import CitaController
+
+def main() -> None:
+    """Marca como 'No asistio' las citas Agendadas de dias anteriores"""
+    resultado = CitaController().marcar_citas_vencidas()
+    print(resultado["mensaje"])
+
+    if resultado["datos"]:
+        print("IDs: " + ", ".join(map(str, resultado["datos"])))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,20 @@
+"""
+Comando para cerrar los contratos temporales cuya fecha fin ya llego
+
+Se puede ejecutar a mano o programar (cron / Programador de tareas) una vez
+al dia desde la raiz del proyecto:
+
+    python -m src.comandos.vencer_contratos
+"""
+from src.controllers.personal_controller import PersonalController
+
+def main() -> None:
+    """Marca como 'Vencido' los contratos temporales activos con fecha fin hasta hoy"""
+    resultado = PersonalController().vencer_contratos()
+    print(resultado["mensaje"])
+
+    if resultado["datos"]:
+        print("IDs: " + ", ".join(map(str, resultado["datos"])))
+
+if __name__ == "__main__":
+    main()
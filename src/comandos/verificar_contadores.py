@@ -0,0 +1,25 @@
+"""
+Comando para comparar los contadores de RRHH con un recalculo desde data/personal.json
+
+Se ejecuta desde la raiz del proyecto:
+
+    python -m src.comandos.verificar_contadores
+    python -m src.comandos.verificar_contadores --reparar
+"""
+import argparse
+from src.controllers.personal_controller import PersonalController
+
+def main() -> None:
+    """Muestra las diferencias entre los contadores guardados y los recalculados"""
+    parser = argparse.ArgumentParser(description="Verifica los contadores de los reportes de RRHH")
+    parser.add_argument("--reparar", action="store_true", help="Reemplazar los contadores si hay diferencias")
+    argumentos = parser.parse_args()
+
+    resultado = PersonalController().verificar_contadores(reparar=argumentos.reparar)
+    print(resultado["mensaje"])
+
+    for contador, clave, actual, correcto in resultado["datos"]:
+        print(f"{contador} {clave}: {actual} (correcto: {correcto})")
+
+if __name__ == "__main__":
+    main()
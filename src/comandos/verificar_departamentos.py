@@ -0,0 +1,32 @@
+"""
+Comando para comparar el personal de cada departamento con los departamentos del personal
+
+Se ejecuta desde la raiz del proyecto:
+
+    python -m src.comandos.verificar_departamentos
+    python -m src.comandos.verificar_departamentos --reparar
+"""
+import argparse
+from src.controllers.departamento_controller import DepartamentoController
+
+def main() -> None:
+    """Muestra las diferencias entre data/departamentos.json y data/personal.json"""
+    parser = argparse.ArgumentParser(description="Verifica el personal asignado a los departamentos")
+    parser.add_argument("--reparar", action="store_true", help="Guardar las correcciones")
+    argumentos = parser.parse_args()
+
+    resultado = DepartamentoController().verificar_consistencia(reparar=argumentos.reparar)
+    print(resultado["mensaje"])
+
+    if not resultado["datos"]:
+        return
+
+    for id_departamento, id_personal in resultado["datos"]["faltantes"]:
+        print(f"Falta en el departamento {id_departamento}: personal {id_personal}")
+    for id_departamento, id_personal in resultado["datos"]["sobrantes"]:
+        print(f"Sobra en el departamento {id_departamento}: personal {id_personal}")
+    for id_departamento in resultado["datos"]["jefes_invalidos"]:
+        print(f"El jefe del departamento {id_departamento} no es personal activo")
+
+if __name__ == "__main__":
+    main()
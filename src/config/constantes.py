@@ -49,7 +49,25 @@ TIPOS_SEGURO = {
 }
 
 # Estado de Cita
-ESTADOS_CITA = ["Agendada", "Completada", "Cancelada"]
+ESTADOS_CITA = ["Agendada", "Completada", "Cancelada", "No asistio"]
+
+# Horario de atencion de citas (07:00 a 22:00 en bloques de 15 minutos)
+HORA_APERTURA = 7
+HORA_CIERRE = 22
+MINUTOS_POR_BLOQUE = 15
+BLOQUES_POR_DIA = (HORA_CIERRE - HORA_APERTURA) * 60 // MINUTOS_POR_BLOQUE
+
+# Prioridades de la Lista de Espera (menor numero = mayor prioridad)
+PRIORIDADES_ESPERA = {1: "Alta", 2: "Media", 3: "Baja"}
+
+# Estados de Solicitud en Lista de Espera
+ESTADOS_ESPERA = ["Pendiente", "Ofrecida", "Asignada", "Cancelada"]
+
+# Maximo de dias que puede abarcar la ventana de fechas de una solicitud de espera
+MAX_DIAS_VENTANA_ESPERA = 60
+
+# Horas que tiene un paciente para responder un hueco ofrecido desde la lista de espera
+HORAS_RESPUESTA_OFERTA = 24
 
 # Categorias de Medicamentos 
 CATEGORIAS_MEDICAMENTO = [
@@ -81,4 +99,62 @@ SALARIOS_BASE = {
     "Doctor": 5000.00,
     "Enfermera": 2500.00,
     "Administrativo": 1800.00
-}
\ No newline at end of file
+}
+
+# Planilla: fraccion del salario base segun la jornada
+FACTORES_JORNADA = {
+    "Medio tiempo": 0.5,
+    "Tiempo completo": 1.0,
+    "Por turnos": 1.0
+}
+
+# Planilla: recargo sobre el basico segun el turno
+RECARGOS_TURNO = {
+    "Manana": 0.00,
+    "Tarde": 0.10,
+    "Noche": 0.25
+}
+
+# Planilla: bono mensual fijo por rol
+BONOS_ROL = {
+    "Doctor": 400.00,
+    "Enfermera": 200.00,
+    "Administrativo": 100.00
+}
+
+# Planilla: bono por antiguedad (porcentaje del basico por año completo, con tope de años)
+BONO_ANTIGUEDAD_ANUAL = 0.01
+TOPE_ANOS_ANTIGUEDAD = 10
+
+# Formatos de exportacion de historiales
+FORMATOS_EXPORTACION = ["ndjson", "csv"]
+
+# Rol de turnos: turnos maximos al mes segun la jornada
+TURNOS_MAXIMOS_MES = {
+    "Medio tiempo": 11,
+    "Tiempo completo": 22,
+    "Por turnos": 20
+}
+
+# Rol de turnos: turnos que cubre el personal sin jornada por turnos
+TURNOS_JORNADA_FIJA = ["Manana", "Tarde"]
+
+# Rol de turnos: dias seguidos de trabajo como maximo
+DIAS_SEGUIDOS_MAXIMOS = 6
+
+# Disponibilidad para citas: horario (hora inicio, hora fin) de cada turno dentro de 07:00 - 22:00
+HORARIOS_TURNO = {
+    "Manana": (7, 13),
+    "Tarde": (13, 19),
+    "Noche": (19, 22)
+}
+
+# Disponibilidad para citas: horario del personal sin jornada por turnos
+# (tiempo completo cubre todo el horario de atencion, como antes de los turnos)
+HORARIOS_JORNADA = {
+    "Medio tiempo": (7, 13),
+    "Tiempo completo": (HORA_APERTURA, HORA_CIERRE)
+}
+
+# Excepciones de horario por fecha (Ausencia quita horas, Horario extra las agrega)
+TIPOS_EXCEPCION_HORARIO = ["Ausencia", "Horario extra"]
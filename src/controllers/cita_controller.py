@@ -4,8 +4,13 @@ Responsable de la gestion de citas medicas
 """
 from src.utils.persistencia import Persistencia
 from datetime import date, time, datetime
+from heapq import merge
 from src.models.cita import Cita
-from src.utils.excepciones import ValidationException
+from src.utils.excepciones import ValidationException, EstadoInvalidoException
+from src.utils.indices import IndiceAgrupado, MapaOcupacion, IndiceOrdenado, CacheModelos, IndiceCompuesto
+from src.utils.proyecciones import DisponibilidadPersonal
+from src.models.personal import Personal
+from src.controllers.lista_espera_controller import ListaEsperaController
 from src.config.constantes import ESTADOS_CITA
 
 class CitaController:
@@ -26,10 +31,82 @@ class CitaController:
             persistencia (Persistencia): Repositorio de datos para el registro de las citas
             persistencia_personal (Persistencia): Repositorio de datos para evaluar la disponibilidad del personal
             persistencia_paciente (Persistencia): Repositorio de datos para evaluar existencia de pacientes
+            agenda (IndiceAgrupado): Agenda materializada por fecha y doctor, ordenada por hora
+            ocupacion (MapaOcupacion): Bloques de 15 minutos ocupados por doctor y dia
+            agendadas (IndiceOrdenado): Citas agendadas ordenadas por fecha y hora
+            pendientes_paciente (IndiceAgrupado): Citas agendadas por paciente y fecha, ordenadas por hora
+            ocupacion_paciente (MapaOcupacion): Bloques de 15 minutos ocupados por paciente y dia
+            lista_espera (ListaEsperaController): Lista de espera que recibe los huecos liberados
+            personal (CacheModelos): Registros (e instancias) del personal por ID
+            indice_roles (IndiceCompuesto): IDs del personal por (rol, estado, especialidad)
+            disponibilidad (DisponibilidadPersonal): Bloques en que atiende cada doctor (turno, jornada y excepciones)
         """
         self.persistencia = Persistencia("data/citas.json")
         self.persistencia_personal = Persistencia("data/personal.json")
         self.persistencia_paciente = Persistencia("data/pacientes.json")
+        self.persistencia_excepciones = Persistencia("data/excepciones_horario.json")
+        
+        # Agenda compartida: se construye una vez y se parcha en cada escritura de citas
+        self.agenda = IndiceAgrupado.compartido(
+            self.persistencia,
+            campo_grupo="fecha",
+            campo_subgrupo="id_doctor",
+            campo_orden="hora",
+            campo_id="id_cita"
+        )
+        
+        # Mapa de bits de bloques ocupados por citas agendadas
+        self.ocupacion = MapaOcupacion.compartido(
+            self.persistencia,
+            campo_recurso="id_doctor",
+            campo_fecha="fecha",
+            campo_hora="hora",
+            filtro={"estado": "Agendada"}
+        )
+        
+        # Citas agendadas en orden cronologico (para cerrar las vencidas)
+        self.agendadas = IndiceOrdenado.compartido(
+            self.persistencia,
+            campos_orden=("fecha", "hora"),
+            campo_id="id_cita",
+            filtro={"estado": "Agendada"}
+        )
+        
+        # Citas activas del lado del paciente (listado y doble reserva)
+        self.pendientes_paciente = IndiceAgrupado.compartido(
+            self.persistencia,
+            campo_grupo="id_paciente",
+            campo_subgrupo="fecha",
+            campo_orden="hora",
+            campo_id="id_cita",
+            filtro={"estado": "Agendada"}
+        )
+        self.ocupacion_paciente = MapaOcupacion.compartido(
+            self.persistencia,
+            campo_recurso="id_paciente",
+            campo_fecha="fecha",
+            campo_hora="hora",
+            filtro={"estado": "Agendada"}
+        )
+        self.lista_espera = ListaEsperaController()
+        
+        # Personal compartido con PersonalController (mismas opciones = mismo indice)
+        self.personal = CacheModelos.compartido(
+            self.persistencia_personal,
+            campo_id="id_personal",
+            fabrica=Personal.from_dict
+        )
+        self.indice_roles = IndiceCompuesto.compartido(
+            self.persistencia_personal,
+            campos=("rol", "estado", "especialidad"),
+            campo_id="id_personal"
+        )
+        
+        # Horario de atencion de cada doctor (compartido con PersonalController)
+        self.disponibilidad = DisponibilidadPersonal.compartido(
+            self.persistencia_personal,
+            self.persistencia_excepciones
+        )
 
     # ========== OPERACIONES CRUD ==========
     def agendar_cita(
@@ -83,7 +160,7 @@ class CitaController:
         
         # Verificar existencia del doctor
         try:
-            doctor_encontrado = self.persistencia_personal.buscar_por_id(id_doctor)
+            doctor_encontrado = self.personal.obtener(id_doctor)
             
             if doctor_encontrado is None:
                 return {"exito": False, "mensaje": f"No se encuentra registrado un doctor con el ID {id_doctor}", "datos": None}
@@ -94,9 +171,10 @@ class CitaController:
         except Exception as e:
             return {"exito": False, "mensaje": f"{str(e)}", "id": None}
         
-        # Verificar disponibilidad del doctor
-        if not self._doctor_disponible(id_doctor, fecha, hora):
-            return {"exito": False, "mensaje": f"El doctor ya tiene una cita agendada en ese horario", "datos": None}
+        # Verificar disponibilidad del doctor y del paciente
+        conflicto = self._conflicto_horario(id_doctor, id_paciente, fecha, hora)
+        if conflicto:
+            return {"exito": False, "mensaje": conflicto, "datos": None}
 
         # Crear instancia Cita
         try: 
@@ -118,6 +196,7 @@ class CitaController:
             
             # Exito
             datos = {
+                "id_cita": id_cita,
                 "paciente": paciente_encontrado["nombre"],
                 "doctor": doctor_encontrado["nombre"],
                 "especialidad": doctor_encontrado["especialidad"],
@@ -176,7 +255,7 @@ class CitaController:
         
         # Validar que el personal responsable exista
         try:
-            personal_encontrado = self.persistencia_personal.buscar_por_id(usuario)
+            personal_encontrado = self.personal.obtener(usuario)
             
             if personal_encontrado is None:
                 return {"exito": False, "mensaje": f"No se encontro un personal registrado con ID {usuario}", "datos": None}
@@ -204,11 +283,15 @@ class CitaController:
         if momento_cita < datetime.now():
             return {"exito": False, "mensaje": "La fecha y hora de la cita no pueden ser en el pasado", "datos": None}
 
-        # Validar disponibilidad del doctor en el nuevo horario
-        if not self._doctor_disponible(obj_cita.id_doctor, nueva_fecha, nueva_hora):
-            return {"exito": False, "mensaje": "El doctor ya tiene agendada una cita en este horario", "datos": None}
+        # Validar disponibilidad del doctor y del paciente en el nuevo horario (su propio bloque no cuenta como ocupado)
+        mismo_bloque = nueva_fecha == obj_cita.fecha and MapaOcupacion.bloque_de(nueva_hora) == MapaOcupacion.bloque_de(obj_cita.hora)
+        conflicto = self._conflicto_horario(obj_cita.id_doctor, obj_cita.id_paciente, nueva_fecha, nueva_hora,
+                                            revisar_ocupacion=not mismo_bloque)
+        if conflicto:
+            return {"exito": False, "mensaje": conflicto, "datos": None}
 
-        # Reprogramar cita
+        # Reprogramar cita (guardando el hueco que se libera)
+        fecha_anterior, hora_anterior = obj_cita.fecha, obj_cita.hora
         try:
             obj_cita.reprogramar(nueva_fecha, nueva_hora, usuario)
         except ValidationException as e:
@@ -222,13 +305,18 @@ class CitaController:
         except Exception as e:
             return {"exito": False, "mensaje": f"{str(e)}", "datos": None}
         
+        # Ofrecer el horario anterior a la lista de espera (dentro del mismo bloque sigue ocupado)
+        oferta = "La cita sigue en el mismo bloque, no se libera un hueco"
+        if not mismo_bloque:
+            oferta = self._ofrecer_hueco(obj_cita.id_doctor, obj_cita.especialidad, fecha_anterior, hora_anterior)
+
         # Exito
         datos = {
             "fecha": obj_cita.fecha,
             "hora": obj_cita.hora
         }
 
-        return {"exito": True, "mensaje": f"Cita reprogramada exitosamente", "datos": datos}
+        return {"exito": True, "mensaje": f"Cita reprogramada exitosamente", "datos": datos, "oferta": oferta}
 
     def cancelar_cita(self, id_cita: int) -> dict:
         """
@@ -272,8 +360,53 @@ class CitaController:
         except Exception as e:
             return {"exito": False, "mensaje": f"{str(e)}", "id": None}
 
+        # Ofrecer el hueco liberado a la lista de espera
+        oferta = self._ofrecer_hueco(obj_cita.id_doctor, obj_cita.especialidad, obj_cita.fecha, obj_cita.hora)
+
         # Exito
-        return {"exito": True, "mensaje": "Cita cancelada exitosamente", "id": obj_cita.id_cita}
+        return {"exito": True, "mensaje": "Cita cancelada exitosamente", "id": obj_cita.id_cita, "oferta": oferta}
+
+    def aceptar_oferta_espera(self, id_solicitud: int, motivo: str) -> dict:
+        """
+        Agenda la cita de un paciente que acepto el hueco ofrecido desde la lista de espera
+        
+        Args:
+            id_solicitud (int): ID de la solicitud de espera con oferta vigente
+            motivo (str): Motivo de la cita
+        
+        Returns:
+            dict: {"exito": bool, "mensaje": str, "datos": dict | None}
+        """
+        
+        # Buscar solicitud
+        resultado = self.lista_espera.buscar_por_id(id_solicitud)
+        if not resultado["exito"]:
+            return resultado
+        
+        solicitud = resultado["datos"]
+        oferta = solicitud.oferta
+        
+        if solicitud.estado != "Ofrecida" or oferta is None:
+            return {"exito": False, "mensaje": f"La solicitud no tiene una oferta vigente. Estado: {solicitud.estado}", "datos": None}
+        
+        # Agendar en el hueco ofrecido
+        resultado = self.agendar_cita(
+            id_paciente=solicitud.id_paciente,
+            id_doctor=oferta["id_doctor"],
+            fecha=date.fromisoformat(oferta["fecha"]),
+            hora=time.fromisoformat(oferta["hora"]),
+            motivo=motivo
+        )
+        
+        # El hueco ya no esta disponible: la solicitud vuelve a la cola
+        if not resultado["exito"]:
+            self.lista_espera.devolver_a_cola(id_solicitud)
+            return resultado
+        
+        # Cerrar la solicitud con la cita creada
+        self.lista_espera.marcar_asignada(id_solicitud, resultado["datos"]["id_cita"])
+        
+        return resultado
 
     def buscar_por_id(self, id_cita: int) -> dict:
         """
@@ -335,13 +468,16 @@ class CitaController:
         if not isinstance(fecha, date):
             return {"exito": False, "mensaje": "Formato de fecha invalido. Debe ser de tipo date", "datos": []}
 
-        # Buscar citas
+        # Buscar citas en la agenda materializada
         try:
-            citas_encontradas = self.persistencia.buscar({"fecha": fecha})
+            por_doctor = self.agenda.obtener(fecha.isoformat())
             
-            if not citas_encontradas:
+            if not por_doctor:
                 return {"exito": False, "mensaje": f"No se encontraron citas para la fecha {fecha}", "datos": []}
             
+            # Cada doctor ya esta ordenado por hora, solo se intercalan
+            citas_encontradas = list(merge(*por_doctor.values(), key=lambda cita: cita["hora"]))
+            
         except Exception as e:
             return {"exito": False, "mensaje": f"{str(e)}", "datos": []}
 
@@ -389,11 +525,11 @@ class CitaController:
             estado = estado.strip().capitalize()
             
             if estado not in ESTADOS_CITA:
-                return {"exito": False, "mensaje": "Estado invalido. Debe ser Agendada, Cancelada o Completada", "datos": []}        
+                return {"exito": False, "mensaje": "Estado invalido. Debe ser Agendada, Cancelada, Completada o No asistio", "datos": []}        
         
         # Buscar doctor
         try:
-            doctor_encontrado = self.persistencia_personal.buscar_por_id(id_doctor)
+            doctor_encontrado = self.personal.obtener(id_doctor)
             
             if doctor_encontrado is None:
                 return {"exito": False, "mensaje": f"No se encontro ningun doctor registrado con el ID {id_doctor}", "datos": []}
@@ -460,16 +596,15 @@ class CitaController:
 
         try:
             # Buscar en Persistencia
-            doctor_encontrado = self.persistencia_personal.buscar_por_id(id_doctor)
+            doctor_encontrado = self.personal.obtener(id_doctor)
             if not doctor_encontrado:
                 return {"exito": False, "mensaje": f"No se encontró al doctor con ID {id_doctor}", "datos": []}
             
-            # Busqueda con triple filtro
-            citas_data = self.persistencia.buscar({
-                "id_doctor": id_doctor,
-                "estado": estado,
-                "fecha": fecha_hoy.isoformat()
-            })
+            # Agenda del dia del doctor (ya ordenada por hora) filtrada por estado
+            citas_data = [
+                cita for cita in self.agenda.obtener_subgrupo(fecha_hoy.isoformat(), id_doctor)
+                if cita.get("estado") == estado
+            ]
 
             if not citas_data:
                 return {
@@ -487,9 +622,6 @@ class CitaController:
                 except Exception:
                     continue # Ignorar registros corruptos
 
-            # Ordenar por hora
-            instancias_citas.sort(key=lambda x: x.hora)
-
             return {
                 "exito": True,
                 "mensaje": f"Agenda de hoy para el Dr. {doctor_encontrado['nombre']} recuperada.",
@@ -525,7 +657,7 @@ class CitaController:
 
         try:
             # Buscar en Persistencia
-            doctor_encontrado = self.persistencia_personal.buscar_por_id(id_doctor)
+            doctor_encontrado = self.personal.obtener(id_doctor)
             if not doctor_encontrado:
                 return {"exito": False, "mensaje": f"No se encontró al doctor con ID {id_doctor}", "datos": []}
             
@@ -581,11 +713,9 @@ class CitaController:
             return {"exito": False, "mensaje": "ID de paciente inválido", "datos": []}
 
         try:
-            # Buscar en persistencia por ID de paciente y estado
-            citas_data = self.persistencia.buscar({
-                "id_paciente": id_paciente,
-                "estado": "Agendada"
-            })
+            # Citas agendadas del paciente desde el indice (por fecha, cada fecha ordenada por hora)
+            por_fecha = self.pendientes_paciente.obtener(id_paciente)
+            citas_data = [cita for fecha in sorted(por_fecha) for cita in por_fecha[fecha]]
 
             if not citas_data:
                 return {
@@ -603,9 +733,6 @@ class CitaController:
                     print(f"Error al procesar cita ID {item.get('id_cita')}: {e}")
                     continue
 
-            # 4. Ordenar por fecha y hora
-            lista_instancias.sort(key=lambda x: (x.fecha, x.hora))
-
             return {
                 "exito": True,
                 "mensaje": f"Se encontraron {len(lista_instancias)} citas pendientes",
@@ -615,28 +742,177 @@ class CitaController:
         except Exception as e:
             return {"exito": False, "mensaje": f"Error al buscar citas: {str(e)}", "datos": []}
     
+    def marcar_citas_vencidas(self, limite: datetime | None = None) -> dict:
+        """
+        Marca como 'No asistio' todas las citas Agendadas anteriores al limite
+        
+        Por defecto el limite es el inicio del dia de hoy: las citas de hoy aun
+        pueden ser completadas por el doctor. Solo se recorren las citas vencidas
+        (indice por fecha y hora) y se guardan todas en una sola escritura.
+        
+        Args:
+            limite (datetime | None): Momento hasta el que se consideran vencidas
+        
+        Returns:
+            dict: {"exito": bool, "mensaje": str, "datos": list[int]}
+        """
+        
+        # Definir limite
+        if limite is None:
+            limite = datetime.combine(date.today(), time(0, 0))
+        
+        if not isinstance(limite, datetime):
+            return {"exito": False, "mensaje": "Formato de limite invalido. Debe ser de tipo datetime", "datos": []}
+        
+        # Citas agendadas anteriores al limite
+        try:
+            vencidas = self.agendadas.anteriores((limite.date().isoformat(), limite.time().isoformat()))
+        except Exception as e:
+            return {"exito": False, "mensaje": f"Error al buscar citas vencidas: {str(e)}", "datos": []}
+        
+        if not vencidas:
+            return {"exito": True, "mensaje": "No hay citas vencidas por cerrar", "datos": []}
+        
+        # Transicion en memoria
+        cambios = {}
+        for data in vencidas:
+            try:
+                obj_cita = Cita.from_dict(data)
+                obj_cita.marcar_no_asistio(limite)
+                cita_actualizada = obj_cita.to_dict()
+                cambios[obj_cita.id_cita] = {
+                    "estado": cita_actualizada["estado"],
+                    "historial_cambios": cita_actualizada["historial_cambios"]
+                }
+            except (ValueError, EstadoInvalidoException) as e:
+                print(f"Cita {data.get('id_cita')} ignorada: {e}")
+                continue
+        
+        # Una sola escritura para todo el lote
+        try:
+            actualizadas = self.persistencia.actualizar_varios(cambios)
+        except Exception as e:
+            return {"exito": False, "mensaje": f"Error al guardar las citas vencidas: {str(e)}", "datos": []}
+        
+        return {"exito": True, "mensaje": f"{actualizadas} citas marcadas como 'No asistio'", "datos": list(cambios)}
+
+    # ========== DISPONIBILIDAD ==========
+    def listar_horarios_libres(self, id_doctor: int, fecha: date) -> dict:
+        """
+        Lista los bloques de 15 minutos libres de un doctor en un dia
+        
+        Args:
+            id_doctor (int): ID del doctor
+            fecha (date): Dia a consultar
+        
+        Returns:
+            dict: {"exito": bool, "mensaje": str, "datos": list[time]}
+        """
+        
+        # Validar datos
+        if not isinstance(id_doctor, int) or id_doctor <= 0:
+            return {"exito": False, "mensaje": "Formato de ID de doctor invalido. Debe ser un numero entero positivo", "datos": []}
+        
+        if not isinstance(fecha, date):
+            return {"exito": False, "mensaje": "Formato de fecha invalido. Debe ser de tipo date", "datos": []}
+        
+        try:
+            # Solo los bloques del horario del doctor (los demas no se recorren)
+            horarios = self.ocupacion.bloques_libres(id_doctor, fecha, self.disponibilidad.mascara(id_doctor, fecha))
+        except Exception as e:
+            return {"exito": False, "mensaje": f"Error al consultar disponibilidad: {str(e)}", "datos": []}
+        
+        # Si es hoy, descartar los bloques que ya pasaron
+        if fecha == date.today():
+            ahora = datetime.now().time()
+            horarios = [hora for hora in horarios if hora >= ahora]
+        
+        if not horarios:
+            return {"exito": False, "mensaje": f"El doctor no tiene horarios libres el {fecha}", "datos": []}
+        
+        return {"exito": True, "mensaje": f"{len(horarios)} horarios libres el {fecha}", "datos": horarios}
+
+    def doctores_libres(self, especialidad: str, fecha: date, hora: time) -> dict:
+        """
+        Lista los doctores activos de una especialidad libres en una fecha y hora
+        
+        Args:
+            especialidad (str): Especialidad requerida
+            fecha (date): Dia a consultar
+            hora (time): Hora a consultar
+        
+        Returns:
+            dict: {"exito": bool, "mensaje": str, "datos": list[dict]}
+        """
+        
+        # Validar datos
+        if not isinstance(fecha, date) or not isinstance(hora, time):
+            return {"exito": False, "mensaje": "Formato de fecha/hora invalido", "datos": []}
+        
+        if MapaOcupacion.bloque_de(hora) < 0:
+            return {"exito": False, "mensaje": "Hora invalida. Debe de ser entre 7:00AM y 10:00PM", "datos": []}
+        
+        try:
+            doctores = self.personal.obtener_varios(
+                self.indice_roles.ids("Doctor", "Activo", especialidad.strip().title())
+            )
+            
+            # Un chequeo de bit por doctor: que atienda a esa hora y que no tenga cita
+            en_horario = self.disponibilidad.filtrar([d["id_personal"] for d in doctores], fecha, hora)
+            libres = set(self.ocupacion.recursos_libres(en_horario, fecha, hora))
+            datos = [doctor for doctor in doctores if doctor["id_personal"] in libres]
+            
+        except Exception as e:
+            return {"exito": False, "mensaje": f"Error al consultar disponibilidad: {str(e)}", "datos": []}
+        
+        if not datos:
+            return {"exito": False, "mensaje": f"No hay doctores de {especialidad} libres el {fecha} a las {hora.strftime('%H:%M')}", "datos": []}
+        
+        return {"exito": True, "mensaje": f"{len(datos)} doctores libres", "datos": datos}
+
     # ========== METODOS PRIVADOS ==========
-    def _doctor_disponible(self, id_doctor: int, fecha: date, hora: time) -> bool:
+    def _conflicto_horario(self, id_doctor: int, id_paciente: int, fecha: date, hora: time,
+                           revisar_ocupacion: bool = True) -> str | None:
         """
-        Verifica si el doctor está disponible en fecha/hora específica.
+        Verifica en un solo paso que el doctor atienda y que el doctor y el paciente esten libres en el bloque de esa hora
+        
+        Args:
+            revisar_ocupacion (bool): False para solo revisar el horario del doctor
+                                      (una cita que se mueve dentro de su propio bloque)
         
         Returns:
-            bool: True si está disponible, False si tiene cita o hubo error
+            str | None: Mensaje del conflicto o None si ambos estan libres
         """
         try:
-            citas_doctor = self.persistencia.buscar({
-                "id_doctor": id_doctor,
-                "fecha": fecha.isoformat(),
-                "hora": hora.isoformat(),
-                "estado": "Agendada"
-            })
+            if not self.disponibilidad.disponible(id_doctor, fecha, hora):
+                return "El doctor no atiende en ese horario (fuera de su turno, jornada o con ausencia registrada)"
+            
+            if not revisar_ocupacion:
+                return None
+            
+            if not self.ocupacion.libre(id_doctor, fecha, hora):
+                return "El doctor ya tiene una cita agendada en ese horario"
+            
+            if not self.ocupacion_paciente.libre(id_paciente, fecha, hora):
+                return "El paciente ya tiene otra cita agendada en ese horario"
             
-            return len(citas_doctor) == 0
+            return None
         
         except Exception as e:
             # En caso de error asumir no disponible
-            print(f"Error al verificar disponibilidad: {e}")
-            return False
+            return f"Error al verificar disponibilidad: {e}"
+
+    def _ofrecer_hueco(self, id_doctor: int, especialidad: str, fecha: date, hora: time) -> str:
+        """
+        Ofrece un hueco liberado a la lista de espera (solo si aun no paso)
+        
+        Returns:
+            str: Resultado de la oferta para mostrar junto a la operacion
+        """
+        if datetime.combine(fecha, hora) < datetime.now():
+            return "El horario liberado ya paso, no se ofrece a la lista de espera"
+        
+        return self.lista_espera.ofrecer_hueco(id_doctor, especialidad, fecha, hora)["mensaje"]
 
     def _generar_id(self) -> int:
         """
@@ -5,10 +5,13 @@ Responsable de completar consultas medicas
 from src.utils.persistencia import Persistencia
 from src.controllers.inventario_controller import InventarioController
 from src.controllers.facturacion_controller import FacturacionController
+from datetime import date
 from typing import List
 from src.utils.validaciones import Validaciones
 from src.models.consulta import Consulta
 from src.models.paciente import Paciente
+from src.utils.transaccion import Transaccion
+from src.utils.indices import IndicePrimario, IndiceTexto
 class ConsultaController:
     """
     Clase "controlador" encargada de completar una consulta
@@ -17,6 +20,9 @@ class ConsultaController:
     Vista, Modelo y Persistencia
     """
     
+    # Las transacciones pendientes del diario se revisan una vez por proceso
+    _diario_recuperado = False
+    
     # ========== INICIALIZA ==========
     def __init__(self) -> None:
         """
@@ -29,6 +35,8 @@ class ConsultaController:
             persistencia_pacientes (Persistencia): Repositorio de datos de los pacientes para su historial
             inventario_controller (InventarioController): Controlador del Inventario para los medicamentos a recetar
             facturacion_controller (FacturacionController): Controlador de las Facturas para el pago de la Consulta
+            indice_consultas (IndicePrimario): Consultas por ID y por id_paciente
+            indice_texto (IndiceTexto): Palabras de diagnosticos y tratamientos (se guarda en data/indice_consultas.json)
         """
         
         self.persistencia_consultas = Persistencia("data/consultas.json")
@@ -36,6 +44,22 @@ class ConsultaController:
         self.persistencia_pacientes = Persistencia("data/pacientes.json")
         self.inventario_controller = InventarioController()
         self.facturacion_controller = FacturacionController()
+        self.indice_consultas = IndicePrimario.compartido(
+            self.persistencia_consultas,
+            campo_id="id_consulta",
+            campos_secundarios=("id_paciente",)
+        )
+        self.indice_texto = IndiceTexto.compartido(
+            self.persistencia_consultas,
+            campos_texto=("diagnostico", "tratamiento"),
+            campo_id="id_consulta",
+            campos_filtro=("especialidad", "id_doctor"),
+            campo_fecha="fecha_hora",
+            ruta_cache="data/indice_consultas.json"
+        )
+        
+        # Revertir consultas que quedaron a medias (programa cortado)
+        self._recuperar_transacciones()
 
     # ========== METODOS ==========
     def completar_consulta(self, 
@@ -55,38 +79,18 @@ class ConsultaController:
         Returns:
             dict: {"exito": bool, "mensaje": str, "datos": dict | None}
         """
-        # Validar IDs
-        if not isinstance(id_cita, int) or id_cita <= 0:
-            return {"exito": False, "mensaje": "Formato de ID de Cita invalido. Debe ser un numero entero positivo", "datos": None}
+        # Validar datos
+        error = self._validar_datos_consulta(id_cita, id_doctor, diagnostico, tratamiento, recetas)
+        if error:
+            return {"exito": False, "mensaje": error, "datos": None}
         
-        if not isinstance(id_doctor, int) or id_doctor <= 0:
-            return {"exito": False, "mensaje": "Formato de ID de Doctor invalido. Debe ser un numero entero positivo", "datos": None}
-        
-        # Validar diagnostico
-        if not Validaciones.validar_longitud_minima(diagnostico, 20):
-            return {"exito": False, "mensaje": "Diagnostico invalido. Debe ser texto con 20 caracteres minimo", "datos": None}
-        
-        # Validar tratamiento si aplica
-        if tratamiento:
-            if not Validaciones.validar_longitud_minima(tratamiento, 10):
-                return {"exito": False, "mensaje": "Tratamiento invalido. Debe ser texto con 10 caracteres minimo", "datos": None}
-        
-        # Validar recetas si aplica
-        if recetas:
-            if not isinstance(recetas, list):
-                return {"exito": False, "mensaje": "Recetas debe ser una lista", "datos": None}
-            
-            for i, receta in enumerate(recetas):
-                if not isinstance(receta, dict):
-                    return {"exito": False, "mensaje": f"Receta {i} debe ser un diccionario", "datos": None}
-                
-                if "id_medicamento" not in receta or "cantidad" not in receta:
-                    return {"exito": False, "mensaje": f"Receta {i} debe tener 'id_medicamento' y 'cantidad'", "datos": None}
+        # Los cambios se preparan en una transaccion: cada archivo se lee y se escribe una sola vez
+        transaccion = Transaccion("completar_consulta")
         
         # Crear Consulta
         try:
             # Obtener cita
-            cita = self.persistencia_citas.buscar_por_id(id_cita)
+            cita = transaccion.buscar_por_id(self.persistencia_citas, id_cita)
             if not cita:
                 return {"exito": False, "mensaje": f"No se encontro una cita con el ID ({id_cita})", "datos": None}
             
@@ -100,14 +104,14 @@ class ConsultaController:
             
             # Obtener paciente para historial
             id_paciente = cita["id_paciente"]
-            paciente = self.persistencia_pacientes.buscar_por_id(id_paciente)
+            paciente = transaccion.buscar_por_id(self.persistencia_pacientes, id_paciente)
             
             if not paciente:
                 return {"exito": False, "mensaje": "No se pudo acceder al registro del paciente", "datos": None}
             obj_paciente = Paciente.from_dict(paciente)
             
             # Crear instancia
-            id_consulta = self._generar_id()
+            id_consulta = transaccion.generar_id(self.persistencia_consultas)
             consulta = Consulta(
                 id_consulta=id_consulta,
                 id_cita=id_cita,
@@ -126,10 +130,17 @@ class ConsultaController:
                     for receta in recetas
                 ]
                 
-                # descuenta stock, registra movimientos
-                receta_resultado = self.inventario_controller.procesar_recetas(recetas_con_consulta)
+                # descuenta stock, registra movimientos (queda en el diario con su compensacion)
+                receta_resultado = transaccion.ejecutar(
+                    "procesar_recetas",
+                    self.inventario_controller.procesar_recetas,
+                    recetas_con_consulta,
+                    compensacion="restaurar_stock",
+                    funcion_compensacion=self.inventario_controller.restaurar_stock
+                )
                 
                 if not receta_resultado["exito"]:
+                    transaccion.revertir()
                     return {"exito": False, "mensaje": f"Error en recetas: {receta_resultado['mensaje']}", "datos": None}
                 
                 # Agregar recetas al objeto consulta
@@ -139,35 +150,45 @@ class ConsultaController:
                         receta["cantidad"]
                     )
             
-            # Guardar consulta
-            self.persistencia_consultas.agregar(consulta.to_dict())
+            # Preparar consulta
+            transaccion.agregar(self.persistencia_consultas, consulta.to_dict())
             
-            # Actualizar estado de la cita
-            self.persistencia_citas.actualizar(id_cita, {"estado": "Completada"})
+            # Preparar estado de la cita
+            transaccion.actualizar(self.persistencia_citas, id_cita, {"estado": "Completada"})
             
             # Agregar consulta al historial del paciente
             obj_paciente.agregar_consulta_historial(id_consulta)
-            
-            # Guardar cambios del paciente
-            datos_actualizados = obj_paciente.to_dict()
-            self.persistencia_pacientes.actualizar(
+            transaccion.actualizar(
+                self.persistencia_pacientes,
                 obj_paciente.id_paciente,
-                datos_actualizados
+                obj_paciente.to_dict()
             )
             
+            # Guardar consulta, cita y paciente (una escritura por archivo)
+            transaccion.confirmar()
+            
             # Generar factura automaticamente
-            resultado_factura = self.facturacion_controller.generar_factura_automatica(
-                id_consulta=id_consulta,
-                id_paciente=cita["id_paciente"],
-                especialidad=cita["especialidad"],
-                recetas=recetas
+            resultado_factura = transaccion.ejecutar(
+                "generar_factura",
+                lambda datos: self.facturacion_controller.generar_factura_automatica(**datos),
+                {
+                    "id_consulta": id_consulta,
+                    "id_paciente": cita["id_paciente"],
+                    "especialidad": cita["especialidad"],
+                    "recetas": recetas
+                },
+                compensacion="anular_factura",
+                funcion_compensacion=lambda datos: self.facturacion_controller.anular_facturas([datos])
             )
             
-            # Revertir todo si falla la factura
+            # Revertir todo desde el diario si falla la factura
             if not resultado_factura["exito"]:
-                self._revertir_consulta(id_consulta, id_cita, obj_paciente.id_paciente, recetas)
+                self._reportar_errores_reversion(id_consulta, transaccion.revertir())
                 return {"exito": False, "mensaje": "Error al generar factura", "datos": None}
             
+            # Cerrar la transaccion
+            transaccion.terminar()
+            
             # Exito
             datos = {"id_consulta": id_consulta, "id_factura": resultado_factura["id_factura"]}
             return {
@@ -177,8 +198,202 @@ class ConsultaController:
             }
             
         except Exception as e:
+            self._reportar_errores_reversion(id_cita, transaccion.revertir())
             return {"exito": False, "mensaje": f"Error crítico: {str(e)}", "datos": None}
 
+    def completar_consultas_lote(self, id_doctor: int, items: List[dict]) -> dict:
+        """
+        Completa en bloque varias consultas de un doctor (ej: al final del turno)
+        
+        Todas las citas se validan en una pasada, las recetas de todo el lote se
+        descuentan del inventario en una sola reserva (si no alcanza el stock se
+        reserva por consulta y solo se rechazan las que no se pueden cubrir), las
+        facturas se generan juntas y cada archivo se escribe una sola vez.
+        
+        Args:
+            id_doctor (int): ID del doctor que completa las consultas
+            items (List[dict]): [{"id_cita", "diagnostico", "tratamiento" (opcional), "recetas" (opcional)}]
+        
+        Returns:
+            dict: {"exito": bool, "mensaje": str, "datos": list[dict]} con un resultado por item:
+                  {"id_cita", "exito", "mensaje", "id_consulta", "id_factura"}
+        """
+        # Validar datos generales
+        if not isinstance(id_doctor, int) or id_doctor <= 0:
+            return {"exito": False, "mensaje": "Formato de ID de Doctor invalido. Debe ser un numero entero positivo", "datos": []}
+        
+        if not isinstance(items, list) or not items:
+            return {"exito": False, "mensaje": "Debe indicar al menos una consulta a completar", "datos": []}
+        
+        resultados = []
+        preparados = []  # (resultado, consulta, obj_paciente, recetas)
+        transaccion = Transaccion("completar_consultas_lote")
+        
+        try:
+            # Validar todas las citas en una pasada (cada archivo se lee una sola vez)
+            citas_vistas = set()
+            siguiente_id = transaccion.generar_id(self.persistencia_consultas)
+            pacientes = {}
+            
+            for item in items:
+                item = item if isinstance(item, dict) else {}
+                id_cita = item.get("id_cita")
+                recetas = item.get("recetas") or None
+                resultado = {"id_cita": id_cita, "exito": False, "mensaje": "", "id_consulta": None, "id_factura": None}
+                resultados.append(resultado)
+                
+                error = self._validar_datos_consulta(id_cita, id_doctor, item.get("diagnostico"), item.get("tratamiento"), recetas)
+                if error:
+                    resultado["mensaje"] = error
+                    continue
+                
+                if id_cita in citas_vistas:
+                    resultado["mensaje"] = "La cita esta repetida en el lote"
+                    continue
+                citas_vistas.add(id_cita)
+                
+                cita = transaccion.buscar_por_id(self.persistencia_citas, id_cita)
+                if not cita:
+                    resultado["mensaje"] = f"No se encontro una cita con el ID ({id_cita})"
+                    continue
+                
+                if cita["estado"] != "Agendada":
+                    resultado["mensaje"] = f"Solo se pueden completar cita Agendadas. Estado de la cita: {cita['estado']}"
+                    continue
+                
+                if cita["id_doctor"] != id_doctor:
+                    resultado["mensaje"] = "Esta cita esta asignada a otro doctor"
+                    continue
+                
+                # Un mismo paciente puede tener varias citas en el lote: se reutiliza su instancia
+                id_paciente = cita["id_paciente"]
+                if id_paciente not in pacientes:
+                    paciente = transaccion.buscar_por_id(self.persistencia_pacientes, id_paciente)
+                    pacientes[id_paciente] = Paciente.from_dict(paciente) if paciente else None
+                
+                if pacientes[id_paciente] is None:
+                    resultado["mensaje"] = "No se pudo acceder al registro del paciente"
+                    continue
+                
+                try:
+                    consulta = Consulta(
+                        id_consulta=siguiente_id,
+                        id_cita=id_cita,
+                        id_paciente=id_paciente,
+                        id_doctor=id_doctor,
+                        especialidad=cita["especialidad"],
+                        diagnostico=item["diagnostico"],
+                        tratamiento=item.get("tratamiento")
+                    )
+                    for receta in recetas or []:
+                        consulta.agregar_receta(receta["id_medicamento"], receta["cantidad"])
+                except Exception as e:
+                    resultado["mensaje"] = f"Datos invalidos: {str(e)}"
+                    continue
+                
+                siguiente_id += 1
+                preparados.append((resultado, consulta, pacientes[id_paciente], recetas))
+            
+            if not preparados:
+                return {"exito": False, "mensaje": "Ninguna consulta del lote es valida", "datos": resultados}
+            
+            # Una sola reserva de inventario con las recetas de todo el lote
+            recetas_lote = [
+                {**receta, "id_consulta": consulta.id_consulta}
+                for _, consulta, _, recetas in preparados for receta in recetas or []
+            ]
+            
+            if recetas_lote:
+                receta_resultado = transaccion.ejecutar(
+                    "procesar_recetas",
+                    self.inventario_controller.procesar_recetas,
+                    recetas_lote,
+                    compensacion="restaurar_stock",
+                    funcion_compensacion=self.inventario_controller.restaurar_stock
+                )
+                
+                # Sin stock para el lote: se reserva consulta por consulta, asi un
+                # medicamento agotado solo rechaza las consultas que lo recetan
+                if not receta_resultado["exito"]:
+                    reservados = []
+                    for preparado in preparados:
+                        resultado, consulta, _, recetas = preparado
+                        if not recetas:
+                            reservados.append(preparado)
+                            continue
+                        
+                        receta_item = transaccion.ejecutar(
+                            "procesar_recetas",
+                            self.inventario_controller.procesar_recetas,
+                            [{**receta, "id_consulta": consulta.id_consulta} for receta in recetas],
+                            compensacion="restaurar_stock",
+                            funcion_compensacion=self.inventario_controller.restaurar_stock
+                        )
+                        if receta_item["exito"]:
+                            reservados.append(preparado)
+                        else:
+                            resultado["mensaje"] = f"Error en recetas: {receta_item['mensaje']}"
+                    preparados = reservados
+                    
+                    if not preparados:
+                        transaccion.revertir()
+                        return {"exito": False, "mensaje": "No se pudo reservar el inventario del lote", "datos": resultados}
+            
+            # Preparar consultas, citas y pacientes
+            for _, consulta, obj_paciente, _ in preparados:
+                transaccion.agregar(self.persistencia_consultas, consulta.to_dict())
+                transaccion.actualizar(self.persistencia_citas, consulta.id_cita, {"estado": "Completada"})
+                obj_paciente.agregar_consulta_historial(consulta.id_consulta)
+                transaccion.actualizar(self.persistencia_pacientes, obj_paciente.id_paciente, obj_paciente.to_dict())
+            
+            # Una escritura por archivo
+            transaccion.confirmar()
+            
+            # Facturas de todo el lote
+            resultado_facturas = transaccion.ejecutar(
+                "generar_facturas_lote",
+                self.facturacion_controller.generar_facturas_lote,
+                [
+                    {
+                        "id_consulta": consulta.id_consulta,
+                        "id_paciente": consulta.id_paciente,
+                        "especialidad": consulta.especialidad,
+                        "recetas": recetas
+                    }
+                    for _, consulta, _, recetas in preparados
+                ],
+                compensacion="anular_facturas",
+                funcion_compensacion=self.facturacion_controller.anular_facturas
+            )
+            
+            # Revertir todo el lote desde el diario si fallan las facturas
+            if not resultado_facturas["exito"]:
+                self._reportar_errores_reversion(id_doctor, transaccion.revertir())
+                for resultado, _, _, _ in preparados:
+                    resultado["mensaje"] = "Error al generar factura"
+                return {"exito": False, "mensaje": "Error al generar las facturas del lote", "datos": resultados}
+            
+            # Cerrar la transaccion
+            transaccion.terminar()
+            
+        except Exception as e:
+            self._reportar_errores_reversion(id_doctor, transaccion.revertir())
+            return {"exito": False, "mensaje": f"Error crítico: {str(e)}", "datos": resultados}
+        
+        # Resultado por item
+        ids_factura = resultado_facturas.get("ids_factura")
+        for posicion, (resultado, consulta, _, _) in enumerate(preparados):
+            resultado["exito"] = True
+            resultado["mensaje"] = "Consulta completada exitosamente"
+            resultado["id_consulta"] = consulta.id_consulta
+            resultado["id_factura"] = ids_factura[posicion] if isinstance(ids_factura, list) and posicion < len(ids_factura) else None
+        
+        return {
+            "exito": True,
+            "mensaje": f"{len(preparados)} de {len(items)} consultas completadas",
+            "datos": resultados
+        }
+
     def buscar_consulta(self, id_consulta: int) -> dict:
         """
         Busca una consulta por su ID.
@@ -197,7 +412,7 @@ class ConsultaController:
             }
         
         try:
-            consulta_data = self.persistencia_consultas.buscar_por_id(id_consulta)
+            consulta_data = self.indice_consultas.obtener(id_consulta)
             
             if not consulta_data:
                 return {
@@ -221,41 +436,140 @@ class ConsultaController:
                 "datos": None
             }
 
-    # ========== METODOS PRIVADOS ==========
-    def _revertir_consulta(self, id_consulta: int, id_cita: int, id_paciente: int, recetas: List[dict] | None = None) -> None:
+    def buscar_casos(
+        self,
+        texto: str,
+        especialidad: str | None = None,
+        id_doctor: int | None = None,
+        fecha_desde: date | None = None,
+        fecha_hasta: date | None = None,
+        limite: int = 20
+    ) -> dict:
         """
-        Revierte cambios si falla la generacion de la factura
+        Busca consultas anteriores por palabras del diagnostico o del tratamiento
+        
+        No importan tildes ni mayusculas. Primero aparecen las consultas que
+        contienen mas palabras de la busqueda y luego las mas relevantes.
         
         Args:
-            id_consulta (int): ID de la consulta a cancelar
-            id_cita (int): ID de la cita 
-            id_paciente (int): ID del paciente
-            recetas (List[dict] | None = None): Receta con medicamentos a revertir (si aplica)
+            texto (str): Palabras a buscar (ej: "dolor toracico")
+            especialidad (str | None): Solo consultas de esa especialidad
+            id_doctor (int | None): Solo consultas de ese doctor
+            fecha_desde (date | None): Desde esa fecha (inclusive)
+            fecha_hasta (date | None): Hasta esa fecha (inclusive)
+            limite (int): Cantidad maxima de resultados
+        
+        Returns:
+            dict: {"exito": bool, "mensaje": str, "datos": List[dict] | None}
+                  Cada dato es la consulta con "coincidencias" y "puntaje"
         """
+        
+        # Validaciones
+        if not texto or not isinstance(texto, str) or not IndiceTexto.palabras_de(texto):
+            return {"exito": False, "mensaje": "Debe ingresar palabras a buscar", "datos": None}
+        
+        if not isinstance(limite, int) or limite <= 0:
+            return {"exito": False, "mensaje": "El limite debe ser un numero entero positivo", "datos": None}
+        
+        if fecha_desde and fecha_hasta and fecha_desde > fecha_hasta:
+            return {"exito": False, "mensaje": "La fecha inicial no puede ser mayor a la final", "datos": None}
+        
+        # Filtros
+        filtros = {}
+        if especialidad:
+            filtros["especialidad"] = especialidad.strip().title()
+        if id_doctor is not None:
+            filtros["id_doctor"] = id_doctor
+        
         try:
-            # Eliminar consulta
-            self.persistencia_consultas.eliminar(id_consulta)
+            resultados = self.indice_texto.buscar(
+                texto,
+                limite,
+                filtros=filtros,
+                fecha_desde=fecha_desde.isoformat() if fecha_desde else None,
+                fecha_hasta=fecha_hasta.isoformat() if fecha_hasta else None
+            )
             
-            # Restablecer estado de cita
-            self.persistencia_citas.actualizar(id_cita, {"estado": "Agendada"})
+            if not resultados:
+                return {"exito": False, "mensaje": "No se encontraron consultas con esas palabras", "datos": None}
             
-            # Borrar consulta del historial del paciente
-            paciente_data = self.persistencia_pacientes.buscar_por_id(id_paciente)
-            if paciente_data:
-                historial_actual = paciente_data.get("historial_consultas", [])
-                if id_consulta in historial_actual:
-                    historial_actual.remove(id_consulta)
-                
-                self.persistencia_pacientes.actualizar(
-                    id_paciente,
-                    {"historial_consultas": historial_actual}
-                )
+            # Traer las consultas encontradas en el orden del ranking
+            registros = {c["id_consulta"]: c for c in self.indice_consultas.obtener_varios([r[0] for r in resultados])}
+            casos = [
+                {**registros[id_consulta], "coincidencias": coincidencias, "puntaje": puntaje}
+                for id_consulta, coincidencias, puntaje in resultados
+                if id_consulta in registros
+            ]
             
-            # Restaurar stock
-            if recetas:
-                self.inventario_controller.restaurar_stock(recetas)
+            return {"exito": True, "mensaje": f"Se encontraron {len(casos)} consultas", "datos": casos}
+        
         except Exception as e:
-            print(f"ERROR CRITICO al revertir consulta {id_consulta}: {str(e)} ")
+            return {"exito": False, "mensaje": f"Error: {str(e)}", "datos": None}
+
+    # ========== METODOS PRIVADOS ==========
+    def _validar_datos_consulta(self, id_cita: int, id_doctor: int, diagnostico: str,
+                                tratamiento: str | None, recetas: List[dict] | None) -> str | None:
+        """
+        Valida el formato de los datos para completar una consulta
+        
+        Returns:
+            str | None: Mensaje de error o None si los datos son validos
+        """
+        # Validar IDs
+        if not isinstance(id_cita, int) or id_cita <= 0:
+            return "Formato de ID de Cita invalido. Debe ser un numero entero positivo"
+        
+        if not isinstance(id_doctor, int) or id_doctor <= 0:
+            return "Formato de ID de Doctor invalido. Debe ser un numero entero positivo"
+        
+        # Validar diagnostico
+        if not Validaciones.validar_longitud_minima(diagnostico, 20):
+            return "Diagnostico invalido. Debe ser texto con 20 caracteres minimo"
+        
+        # Validar tratamiento si aplica
+        if tratamiento:
+            if not Validaciones.validar_longitud_minima(tratamiento, 10):
+                return "Tratamiento invalido. Debe ser texto con 10 caracteres minimo"
+        
+        # Validar recetas si aplica
+        if recetas:
+            if not isinstance(recetas, list):
+                return "Recetas debe ser una lista"
+            
+            for i, receta in enumerate(recetas):
+                if not isinstance(receta, dict):
+                    return f"Receta {i} debe ser un diccionario"
+                
+                if "id_medicamento" not in receta or "cantidad" not in receta:
+                    return f"Receta {i} debe tener 'id_medicamento' y 'cantidad'"
+        
+        return None
+
+    def _recuperar_transacciones(self) -> None:
+        """
+        Revierte las consultas que quedaron a medias si el programa se corto
+        
+        Se ejecuta una sola vez por proceso, al crear el primer controlador
+        """
+        if ConsultaController._diario_recuperado:
+            return
+        ConsultaController._diario_recuperado = True
+        
+        try:
+            mensajes = Transaccion.recuperar({
+                "restaurar_stock": self.inventario_controller.restaurar_stock,
+                "anular_factura": lambda datos: self.facturacion_controller.anular_facturas([datos]),
+                "anular_facturas": self.facturacion_controller.anular_facturas
+            })
+            for mensaje in mensajes:
+                print(f"Recuperacion: {mensaje}")
+        except Exception as e:
+            print(f"ERROR CRITICO al recuperar transacciones pendientes: {str(e)}")
+
+    def _reportar_errores_reversion(self, id_referencia: int, errores: List[str]) -> None:
+        """Muestra los errores que impidieron revertir una consulta (quedan en el diario)"""
+        for error in errores:
+            print(f"ERROR CRITICO al revertir consulta {id_referencia}: {error}")
 
     def _generar_id(self) -> int:
         """
@@ -0,0 +1,365 @@
+"""
+Responsable de los departamentos del hospital y de su personal asignado
+
+"""
+from collections import defaultdict
+from typing import Iterable
+from src.utils.persistencia import Persistencia
+from src.utils.indices import IndicePrimario, CacheModelos, IndiceMultivalor
+from src.utils.transaccion import Transaccion
+from src.utils.excepciones import ValidationException, EstadoInvalidoException
+from src.models.departamento import Departamento
+from src.models.personal import Personal
+from src.config.constantes import DEPARTAMENTOS
+
+class DepartamentoController:
+    """
+    Clase "controlador" encargada de los departamentos
+
+    La pertenencia de un empleado a un departamento se guarda en los dos
+    archivos: Personal.departamentos (data/personal.json) y
+    Departamento.personal_asignado (data/departamentos.json). Cada cambio
+    actualiza ambos lados en una misma transaccion, y verificar_consistencia()
+    detecta (y opcionalmente corrige) las diferencias que hayan quedado.
+
+    Personal.departamentos del personal activo es la referencia: es lo que
+    usan los listados y reportes del resto del sistema.
+    """
+
+    # ========== INICIALIZA ==========
+    def __init__(self) -> None:
+        """
+        Inicializa el controlador de departamentos configurando las rutas de los archivos
+        de persistencia
+
+        Atributos:
+            persistencia (Persistencia): Repositorio de datos de los departamentos
+            persistencia_personal (Persistencia): Repositorio de datos del personal
+            indice_departamentos (IndicePrimario): Departamentos por ID
+            indice_personal (CacheModelos): Personal por ID (compartido con PersonalController)
+            indice_miembros (IndiceMultivalor): IDs del personal activo por departamento
+        """
+        self.persistencia = Persistencia("data/departamentos.json")
+        self.persistencia_personal = Persistencia("data/personal.json")
+
+        self.indice_departamentos = IndicePrimario.compartido(
+            self.persistencia,
+            campo_id="id_departamento"
+        )
+        self.indice_personal = CacheModelos.compartido(
+            self.persistencia_personal,
+            campo_id="id_personal",
+            fabrica=Personal.from_dict
+        )
+        self.indice_miembros = IndiceMultivalor.compartido(
+            self.persistencia_personal,
+            campo_lista="departamentos",
+            campo_id="id_personal",
+            filtro={"estado": "Activo"}
+        )
+
+    # ========== OPERACIONES CRUD ==========
+    def crear_departamento(self, id_departamento: int, id_jefe: int) -> dict:
+        """
+        Registra un departamento del catalogo (DEPARTAMENTOS) con su jefe
+
+        El personal asignado inicial es el personal activo que ya tiene el
+        departamento en su registro, mas el jefe (a quien se le agrega el
+        departamento si no lo tenia).
+
+        Args:
+            id_departamento (int): ID del departamento en DEPARTAMENTOS
+            id_jefe (int): ID del personal activo que sera el jefe
+
+        Returns:
+            dict: {"exito": bool, "mensaje": str, "id": int | None}
+        """
+
+        # Validaciones
+        if id_departamento not in DEPARTAMENTOS:
+            return {"exito": False, "mensaje": f"No existe el departamento {id_departamento} en el catalogo del hospital", "id": None}
+
+        if self.indice_departamentos.obtener(id_departamento) is not None:
+            return {"exito": False, "mensaje": f"El departamento {id_departamento} ya esta registrado", "id": None}
+
+        jefe = self.indice_personal.instancia(id_jefe)
+        if jefe is None or not jefe.esta_activo():
+            return {"exito": False, "mensaje": f"No se encontro personal activo con ID {id_jefe}", "id": None}
+
+        try:
+            miembros = set(self.indice_miembros.ids(id_departamento)) | {id_jefe}
+
+            departamento = Departamento(
+                id_departamento=id_departamento,
+                nombre=DEPARTAMENTOS[id_departamento]["nombre"],
+                descripcion=DEPARTAMENTOS[id_departamento]["descripcion"],
+                id_jefe=id_jefe,
+                personal_asignado=miembros
+            )
+
+            # Ambos lados en una transaccion: una escritura por archivo
+            transaccion = Transaccion("crear_departamento")
+            transaccion.agregar(self.persistencia, departamento.to_dict(), "id_departamento")
+
+            if id_departamento not in jefe.departamentos:
+                transaccion.actualizar(self.persistencia_personal, id_jefe,
+                                       {"departamentos": jefe.departamentos + [id_departamento]}, "id_personal")
+
+            transaccion.confirmar()
+            transaccion.terminar()
+
+            return {"exito": True, "mensaje": f"Departamento {departamento.nombre} registrado con {len(miembros)} empleados", "id": id_departamento}
+
+        except ValidationException as e:
+            return {"exito": False, "mensaje": f"Datos inválidos: {str(e)}", "id": None}
+        except Exception as e:
+            return {"exito": False, "mensaje": f"Error interno del sistema: {str(e)}", "id": None}
+
+    def obtener_departamento(self, id_departamento: int) -> dict:
+        """
+        Devuelve un departamento registrado
+
+        Returns:
+            dict: {"exito": bool, "mensaje": str, "datos": dict | None}
+        """
+        data = self.indice_departamentos.obtener(id_departamento)
+
+        if data is None:
+            return {"exito": False, "mensaje": f"No se encontro el departamento {id_departamento}", "datos": None}
+
+        return {"exito": True, "mensaje": "Departamento encontrado", "datos": data}
+
+    # ========== PERSONAL ASIGNADO ==========
+    def asignar_personal(self, id_departamento: int, id_personal: int) -> dict:
+        """
+        Asigna un empleado a un departamento en ambos archivos a la vez
+
+        Si el departamento aun no esta registrado solo se actualiza el personal.
+
+        Args:
+            id_departamento (int): ID del departamento
+            id_personal (int): ID del personal
+
+        Returns:
+            dict: {"exito": bool, "mensaje": str, "datos": dict | None}
+                  datos = {"personal": dict, "departamento": dict | None}
+        """
+        return self._cambiar_membresia(id_departamento, id_personal, agregar=True)
+
+    def remover_personal(self, id_departamento: int, id_personal: int) -> dict:
+        """
+        Quita a un empleado de un departamento en ambos archivos a la vez
+
+        Args:
+            id_departamento (int): ID del departamento
+            id_personal (int): ID del personal
+
+        Returns:
+            dict: {"exito": bool, "mensaje": str, "datos": dict | None}
+                  datos = {"personal": dict, "departamento": dict | None}
+        """
+        return self._cambiar_membresia(id_departamento, id_personal, agregar=False)
+
+    def asignar_jefe(self, id_departamento: int, id_personal: int) -> dict:
+        """
+        Cambia el jefe de un departamento (debe ser personal activo del departamento)
+
+        Returns:
+            dict: {"exito": bool, "mensaje": str, "datos": dict | None}
+        """
+        data = self.indice_departamentos.obtener(id_departamento)
+        if data is None:
+            return {"exito": False, "mensaje": f"No se encontro el departamento {id_departamento}", "datos": None}
+
+        empleado = self.indice_personal.instancia(id_personal)
+        if empleado is None or not empleado.esta_activo():
+            return {"exito": False, "mensaje": f"No se encontro personal activo con ID {id_personal}", "datos": None}
+
+        try:
+            departamento = Departamento.from_dict(data)
+            departamento.asignar_jefe(id_personal)
+
+            self.persistencia.actualizar(id_departamento, {"id_jefe": departamento.id_jefe}, "id_departamento")
+            return {"exito": True, "mensaje": f"Nuevo jefe del departamento {departamento.nombre}: {empleado.nombre}", "datos": departamento.to_dict()}
+
+        except (ValidationException, EstadoInvalidoException) as e:
+            return {"exito": False, "mensaje": f"Error: {str(e)}", "datos": None}
+        except Exception as e:
+            return {"exito": False, "mensaje": f"Error al guardar en base de datos: {str(e)}", "datos": None}
+
+    def preparar_membresia(self, transaccion: Transaccion, id_personal: int,
+                           agregar: Iterable[int] = (), quitar: Iterable[int] = ()) -> None:
+        """
+        Prepara el lado de los departamentos dentro de una transaccion del llamador
+
+        Lo usan el registro, la baja y la importacion de personal, que guardan
+        el lado del personal en la misma transaccion. Los departamentos aun no
+        registrados se omiten y el jefe no se quita (igual que verificar_consistencia).
+
+        Args:
+            transaccion (Transaccion): Transaccion abierta del llamador
+            id_personal (int): ID del personal
+            agregar (Iterable[int]): Departamentos a los que se suma
+            quitar (Iterable[int]): Departamentos de los que sale
+        """
+        cambios = [(id_departamento, True) for id_departamento in agregar] + [(id_departamento, False) for id_departamento in quitar]
+
+        for id_departamento, sumar in cambios:
+            data = transaccion.buscar_por_id(self.persistencia, id_departamento, "id_departamento")
+            if data is None:
+                continue
+
+            departamento = Departamento.from_dict(data)
+            if sumar and not departamento.tiene_personal(id_personal):
+                departamento.agregar_personal(id_personal)
+            elif not sumar and departamento.tiene_personal(id_personal) and departamento.id_jefe != id_personal:
+                departamento.remover_personal(id_personal)
+            else:
+                continue
+
+            transaccion.actualizar(self.persistencia, id_departamento,
+                                   {"personal_asignado": departamento.personal_asignado}, "id_departamento")
+
+    # ========== CONSISTENCIA ==========
+    def verificar_consistencia(self, reparar: bool = False) -> dict:
+        """
+        Compara el personal asignado de cada departamento con los departamentos
+        del personal activo
+
+        Cada archivo se recorre una sola vez: se arma un diccionario
+        {departamento: IDs del personal activo} y cada departamento se compara
+        contra el con operaciones de conjuntos (sin bucles anidados).
+
+        Al reparar, Personal.departamentos manda:
+        - faltantes: personal activo que tiene el departamento pero no figura en el -> se agrega al departamento
+        - sobrantes: personal que figura en el departamento pero no lo tiene (o esta inactivo) -> se quita del departamento
+        - El jefe nunca se quita: si esta activo se le agrega el departamento; si no, se informa
+          en "jefes_invalidos" para asignar otro con asignar_jefe()
+
+        Args:
+            reparar (bool): Guardar las correcciones (una escritura por archivo)
+
+        Returns:
+            dict: {"exito": bool, "mensaje": str, "datos": dict | None}
+                  datos = {"faltantes": [(id_departamento, id_personal)], "sobrantes": [...],
+                           "jefes_invalidos": [id_departamento], "reparados": int}
+        """
+        try:
+            # Personal activo por departamento (hash del lado del personal)
+            miembros = defaultdict(set)
+            activos = {}
+            for registro in self.persistencia_personal.iterar():
+                if registro.get("estado") != "Activo":
+                    continue
+                activos[registro["id_personal"]] = registro
+                for id_departamento in registro.get("departamentos") or []:
+                    miembros[id_departamento].add(registro["id_personal"])
+
+            faltantes, sobrantes, jefes_invalidos = [], [], []
+            cambios_departamentos, cambios_personal = {}, {}
+
+            # Cada departamento contra su conjunto esperado
+            for departamento in self.persistencia.iterar():
+                id_departamento = departamento["id_departamento"]
+                id_jefe = departamento.get("id_jefe")
+                asignados = set(departamento.get("personal_asignado") or [])
+                esperados = miembros.get(id_departamento, set())
+
+                faltan = esperados - asignados
+                sobran = asignados - esperados
+
+                # El jefe se conserva en el departamento
+                if id_jefe in sobran:
+                    if id_jefe in activos:
+                        departamentos_jefe = cambios_personal.get(id_jefe, activos[id_jefe].get("departamentos") or [])
+                        cambios_personal[id_jefe] = departamentos_jefe + [id_departamento]
+                    else:
+                        jefes_invalidos.append(id_departamento)
+
+                faltantes.extend((id_departamento, id_personal) for id_personal in sorted(faltan))
+                sobrantes.extend((id_departamento, id_personal) for id_personal in sorted(sobran))
+
+                if faltan or sobran - {id_jefe}:
+                    cambios_departamentos[id_departamento] = {"personal_asignado": sorted(esperados | {id_jefe})}
+
+            reparados = 0
+            if reparar and (cambios_departamentos or cambios_personal):
+                transaccion = Transaccion("reparar_departamentos")
+                for id_departamento, campos in cambios_departamentos.items():
+                    transaccion.actualizar(self.persistencia, id_departamento, campos, "id_departamento")
+                for id_personal, departamentos in cambios_personal.items():
+                    transaccion.actualizar(self.persistencia_personal, id_personal, {"departamentos": departamentos}, "id_personal")
+                transaccion.confirmar()
+                transaccion.terminar()
+                reparados = len(cambios_departamentos) + len(cambios_personal)
+
+            diferencias = len(faltantes) + len(sobrantes)
+            mensaje = f"Diferencias encontradas: {diferencias} | Jefes invalidos: {len(jefes_invalidos)}"
+            if reparar:
+                mensaje += f" | Registros corregidos: {reparados}"
+
+            return {
+                "exito": True,
+                "mensaje": mensaje,
+                "datos": {
+                    "faltantes": faltantes,
+                    "sobrantes": sobrantes,
+                    "jefes_invalidos": jefes_invalidos,
+                    "reparados": reparados
+                }
+            }
+
+        except Exception as e:
+            return {"exito": False, "mensaje": f"Error al verificar los departamentos: {str(e)}", "datos": None}
+
+    # ========== METODOS PRIVADOS ==========
+    def _cambiar_membresia(self, id_departamento: int, id_personal: int, agregar: bool) -> dict:
+        """Aplica el cambio con los modelos y guarda ambos lados en una transaccion"""
+
+        if not isinstance(id_personal, int) or id_personal <= 0:
+            return {"exito": False, "mensaje": "Formato de ID invalido", "datos": None}
+
+        data_personal = self.indice_personal.obtener(id_personal)
+        if data_personal is None:
+            return {"exito": False, "mensaje": f"No se encontro un personal con ID {id_personal}", "datos": None}
+
+        try:
+            # Lado del personal (reglas del modelo Personal)
+            personal = Personal.from_dict(data_personal)
+            if agregar:
+                personal.asignar_departamento(id_departamento)
+            else:
+                personal.remover_departamento(id_departamento)
+
+            # Lado del departamento, si esta registrado (tolera diferencias previas)
+            departamento = None
+            data_departamento = self.indice_departamentos.obtener(id_departamento)
+            if data_departamento is not None:
+                departamento = Departamento.from_dict(data_departamento)
+                if agregar and not departamento.tiene_personal(id_personal):
+                    departamento.agregar_personal(id_personal)
+                elif not agregar and departamento.tiene_personal(id_personal):
+                    departamento.remover_personal(id_personal)
+
+            # Ambos lados en una transaccion: una escritura por archivo
+            transaccion = Transaccion("asignar_departamento" if agregar else "remover_departamento")
+            transaccion.actualizar(self.persistencia_personal, id_personal, {"departamentos": personal.departamentos}, "id_personal")
+            if departamento is not None:
+                transaccion.actualizar(self.persistencia, id_departamento,
+                                       {"personal_asignado": departamento.personal_asignado}, "id_departamento")
+            transaccion.confirmar()
+            transaccion.terminar()
+
+            return {
+                "exito": True,
+                "mensaje": f"Personal {id_personal} {'asignado al' if agregar else 'removido del'} departamento {id_departamento}",
+                "datos": {
+                    "personal": personal.to_dict(),
+                    "departamento": departamento.to_dict() if departamento else None
+                }
+            }
+
+        except (ValidationException, EstadoInvalidoException) as e:
+            return {"exito": False, "mensaje": f"Error: {str(e)}", "datos": None}
+        except Exception as e:
+            return {"exito": False, "mensaje": f"Error al guardar en base de datos: {str(e)}", "datos": None}
@@ -1,8 +1,192 @@
 """
 Responsable de la generacion y gestion de facturas
 """
-from typing import List
+from datetime import date
+from typing import List, Dict, Any
+from src.utils.persistencia import Persistencia
+from src.utils.indices import IndicePrimario
+from src.models.paciente import Paciente
+from src.config.constantes import COSTOS_CONSULTA
+
 class FacturacionController:
-    
+    """
+    Clase "controlador" encargada de las facturas
+
+    Cada consulta completada genera una factura Pendiente en data/facturas.json
+    con el costo de la consulta y de los medicamentos recetados, menos el
+    descuento del seguro del paciente. Anular una factura la deja Cancelada.
+    """
+
+    # ========== INICIALIZA ==========
+    def __init__(self) -> None:
+        """
+        Inicializa el controlador de Facturacion configurando las rutas de los archivos
+        de persistencia
+
+        Atributos:
+            persistencia (Persistencia): Repositorio de datos de las facturas
+            persistencia_pacientes (Persistencia): Repositorio de datos para el descuento del seguro
+            persistencia_medicamentos (Persistencia): Repositorio de datos para el precio de las recetas
+            indice_facturas (IndicePrimario): Facturas por ID y por consulta
+            indice_pacientes (IndicePrimario): Pacientes por ID (compartido con PacienteController)
+            indice_medicamentos (IndicePrimario): Medicamentos por ID
+        """
+        self.persistencia = Persistencia("data/facturas.json")
+        self.persistencia_pacientes = Persistencia("data/pacientes.json")
+        self.persistencia_medicamentos = Persistencia("data/medicamentos.json")
+
+        self.indice_facturas = IndicePrimario.compartido(
+            self.persistencia,
+            campo_id="id_factura",
+            campos_secundarios=("id_consulta",)
+        )
+        self.indice_pacientes = IndicePrimario.compartido(self.persistencia_pacientes, campo_id="id_paciente")
+        self.indice_medicamentos = IndicePrimario.compartido(self.persistencia_medicamentos, campo_id="id_medicamento")
+
+    # ========== GENERACION ==========
     def generar_factura_automatica(self, id_consulta: int, id_paciente: int, especialidad: str, recetas: List[dict] | None = None) -> dict:
-        return {"exito": bool, "mensaje": str, "id_factura": int}
\ No newline at end of file
+        """
+        Genera la factura de una consulta completada
+
+        Args:
+            id_consulta (int): Consulta facturada
+            id_paciente (int): Paciente al que se factura
+            especialidad (str): Especialidad de la consulta (define el costo)
+            recetas (List[dict] | None): Recetas con id_medicamento y cantidad
+
+        Returns:
+            dict: {"exito": bool, "mensaje": str, "id_factura": int | None}
+        """
+        resultado = self.generar_facturas_lote([{
+            "id_consulta": id_consulta,
+            "id_paciente": id_paciente,
+            "especialidad": especialidad,
+            "recetas": recetas
+        }])
+
+        ids = resultado["ids_factura"]
+        return {"exito": resultado["exito"], "mensaje": resultado["mensaje"], "id_factura": ids[0] if ids else None}
+
+    def generar_facturas_lote(self, consultas: List[dict]) -> dict:
+        """
+        Genera las facturas de varias consultas con una sola escritura
+
+        Si una consulta ya tiene una factura vigente (no Cancelada) se reutiliza,
+        asi reintentar el lote no factura dos veces. Si alguna factura no se
+        puede armar no se guarda ninguna.
+
+        Args:
+            consultas (List[dict]): Datos de cada consulta (id_consulta, id_paciente, especialidad, recetas)
+
+        Returns:
+            dict: {"exito": bool, "mensaje": str, "ids_factura": List[int]}
+        """
+        try:
+            version = self.persistencia.version()
+            datos = self.persistencia.leer_todos()
+            siguiente = max((registro.get("id_factura", 0) for registro in datos), default=0) + 1
+
+            ids_factura = []
+            nuevas = []
+            for consulta in consultas:
+                existente = self._factura_vigente(consulta["id_consulta"])
+                if existente is not None:
+                    ids_factura.append(existente["id_factura"])
+                    continue
+
+                factura = self._armar_factura(siguiente, consulta)
+                nuevas.append(factura)
+                ids_factura.append(siguiente)
+                siguiente += 1
+
+            if nuevas:
+                self.persistencia.guardar_lote(datos + nuevas, [(None, factura) for factura in nuevas], version)
+
+            return {"exito": True, "mensaje": f"{len(ids_factura)} factura(s) generada(s)", "ids_factura": ids_factura}
+
+        except Exception as e:
+            return {"exito": False, "mensaje": f"Error al generar facturas: {str(e)}", "ids_factura": []}
+
+    def anular_facturas(self, consultas: List[dict]) -> dict:
+        """
+        Anula (deja Cancelada) la factura Pendiente de cada consulta
+
+        Una factura ya Pagada no se anula: se informa para revisarla a mano.
+
+        Args:
+            consultas (List[dict]): Datos de cada consulta (al menos id_consulta)
+
+        Returns:
+            dict: {"exito": bool, "mensaje": str}
+        """
+        try:
+            cambios = {}
+            pagadas = []
+            for consulta in consultas:
+                factura = self._factura_vigente(consulta["id_consulta"])
+                if factura is None:
+                    continue
+                if factura["estado"] == "Pagada":
+                    pagadas.append(factura["id_factura"])
+                    continue
+                cambios[factura["id_factura"]] = {"estado": "Cancelada"}
+
+            self.persistencia.actualizar_varios(cambios, "id_factura")
+
+        except Exception as e:
+            return {"exito": False, "mensaje": f"Error al anular facturas: {str(e)}"}
+
+        if pagadas:
+            return {"exito": False, "mensaje": f"Facturas ya pagadas, no se anularon: {pagadas}"}
+
+        return {"exito": True, "mensaje": f"{len(cambios)} factura(s) anulada(s)"}
+
+    # ========== METODOS PRIVADOS ==========
+    def _factura_vigente(self, id_consulta: int) -> Dict[str, Any] | None:
+        """Factura no Cancelada de una consulta (o None)"""
+        for factura in self.indice_facturas.obtener_varios(self.indice_facturas.ids_por("id_consulta", id_consulta)):
+            if factura.get("estado") != "Cancelada":
+                return factura
+        return None
+
+    def _armar_factura(self, id_factura: int, consulta: dict) -> Dict[str, Any]:
+        """
+        Arma el registro de la factura de una consulta
+
+        Las especialidades sin costo propio en COSTOS_CONSULTA usan el de Medicina General.
+
+        Raises:
+            ValueError: Paciente o medicamento no registrado
+        """
+        datos_paciente = self.indice_pacientes.obtener(consulta["id_paciente"])
+        if datos_paciente is None:
+            raise ValueError(f"No se encuentra registrado un paciente con el ID {consulta['id_paciente']}")
+
+        costo_consulta = COSTOS_CONSULTA.get(consulta["especialidad"], COSTOS_CONSULTA["Medicina General"])
+        detalle = [{"concepto": f"Consulta {consulta['especialidad']}", "cantidad": 1,
+                    "precio_unitario": costo_consulta, "importe": costo_consulta}]
+
+        for receta in consulta.get("recetas") or []:
+            medicamento = self.indice_medicamentos.obtener(receta["id_medicamento"])
+            if medicamento is None:
+                raise ValueError(f"No se encuentra registrado un medicamento con el ID {receta['id_medicamento']}")
+
+            precio = float(medicamento.get("precio_unitario") or 0)
+            detalle.append({"concepto": medicamento.get("nombre", f"Medicamento {receta['id_medicamento']}"),
+                            "cantidad": receta["cantidad"], "precio_unitario": precio,
+                            "importe": round(precio * receta["cantidad"], 2)})
+
+        subtotal = round(sum(linea["importe"] for linea in detalle), 2)
+        paciente = Paciente.from_dict(datos_paciente)
+
+        return {
+            "id_factura": id_factura,
+            "id_consulta": consulta["id_consulta"],
+            "id_paciente": consulta["id_paciente"],
+            "fecha_emision": date.today().isoformat(),
+            "detalle": detalle,
+            "subtotal": subtotal,
+            "porcentaje_descuento": paciente.porcentaje_descuento,
+            "total": round(paciente.calcular_descuento(subtotal), 2),
+            "estado": "Pendiente"
+        }
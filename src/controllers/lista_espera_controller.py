@@ -0,0 +1,311 @@
+"""
+Responsable de la lista de espera de citas medicas
+
+"""
+from datetime import date, time, datetime
+from src.utils.persistencia import Persistencia
+from src.utils.indices import ColaPorVentana, IndiceOrdenado
+from src.utils.excepciones import ValidationException, EstadoInvalidoException
+from src.models.solicitud_espera import SolicitudEspera
+
+class ListaEsperaController:
+    """
+    Clase "controlador" encargada de la lista de espera de citas
+
+    Los pacientes en espera se guardan en data/lista_espera.json y se ordenan
+    en colas de prioridad por especialidad/doctor y dia. Cuando se libera un
+    hueco se le ofrece al mejor candidato sin recorrer toda la lista. Las
+    ofertas sin respuesta vencen y la solicitud vuelve a la cola.
+    """
+
+    # ========== INICIALIZA ==========
+    def __init__(self) -> None:
+        """
+        Inicializa el controlador de Lista de espera configurando las rutas de los archivos
+        de persistencia
+
+        Atributos:
+            persistencia (Persistencia): Repositorio de datos de las solicitudes de espera
+            persistencia_personal (Persistencia): Repositorio de datos para validar doctores
+            persistencia_paciente (Persistencia): Repositorio de datos para validar pacientes
+            cola (ColaPorVentana): Colas de prioridad de las solicitudes pendientes
+            ofertas (IndiceOrdenado): Solicitudes ofrecidas ordenadas por vencimiento de la oferta
+        """
+        self.persistencia = Persistencia("data/lista_espera.json")
+        self.persistencia_personal = Persistencia("data/personal.json")
+        self.persistencia_paciente = Persistencia("data/pacientes.json")
+
+        # Colas compartidas por (especialidad, id_doctor) y dia
+        self.cola = ColaPorVentana.compartido(
+            self.persistencia,
+            campos_clave=("especialidad", "id_doctor"),
+            campo_desde="fecha_desde",
+            campo_hasta="fecha_hasta",
+            campos_prioridad=("prioridad", "fecha_registro"),
+            campo_id="id_solicitud",
+            filtro={"estado": "Pendiente"}
+        )
+
+        # Ofertas vigentes por vencimiento
+        self.ofertas = IndiceOrdenado.compartido(
+            self.persistencia,
+            campos_orden=("vence_oferta",),
+            campo_id="id_solicitud",
+            filtro={"estado": "Ofrecida"}
+        )
+
+    # ========== OPERACIONES CRUD ==========
+    def registrar_solicitud(
+        self,
+        id_paciente: int,
+        especialidad: str,
+        fecha_desde: date,
+        fecha_hasta: date,
+        prioridad: int = 2,
+        id_doctor: int | None = None
+    ) -> dict:
+        """
+        Registra un paciente en la lista de espera
+
+        Args:
+            Datos necesarios para crear la instancia SolicitudEspera
+
+        Returns:
+            dict: {"exito": bool, "mensaje": str, "id": int | None}
+        """
+
+        # Verificar existencia del paciente
+        try:
+            if self.persistencia_paciente.buscar_por_id(id_paciente) is None:
+                return {"exito": False, "mensaje": f"No se encuentra registrado un paciente con el ID {id_paciente}", "id": None}
+
+            # Verificar doctor (si se pidio uno en especifico)
+            if id_doctor is not None:
+                doctor = self.persistencia_personal.buscar_por_id(id_doctor)
+
+                if doctor is None or doctor.get("rol") != "Doctor":
+                    return {"exito": False, "mensaje": f"No se encuentra registrado un doctor con el ID {id_doctor}", "id": None}
+
+                if doctor.get("estado") != "Activo":
+                    return {"exito": False, "mensaje": "El doctor seleccionado no se encuentra activo en el hospital", "id": None}
+
+                if doctor.get("especialidad") != especialidad.strip().title():
+                    return {"exito": False, "mensaje": f"El doctor seleccionado no es de la especialidad {especialidad}", "id": None}
+        except Exception as e:
+            return {"exito": False, "mensaje": f"{str(e)}", "id": None}
+
+        # Crear y guardar la solicitud
+        try:
+            id_solicitud = self.persistencia.generar_id_autoincremental("id_solicitud")
+
+            solicitud = SolicitudEspera(
+                id_solicitud=id_solicitud,
+                id_paciente=id_paciente,
+                especialidad=especialidad,
+                fecha_desde=fecha_desde,
+                fecha_hasta=fecha_hasta,
+                prioridad=prioridad,
+                id_doctor=id_doctor
+            )
+
+            self.persistencia.agregar(solicitud.to_dict())
+
+            return {"exito": True, "mensaje": f"Paciente agregado a la lista de espera. ID de solicitud: {id_solicitud}", "id": id_solicitud}
+
+        except ValidationException as e:
+            return {"exito": False, "mensaje": f"Datos inválidos: {str(e)}", "id": None}
+        except Exception as e:
+            return {"exito": False, "mensaje": f"Error interno del sistema: {str(e)}", "id": None}
+
+    def buscar_por_id(self, id_solicitud: int) -> dict:
+        """
+        Busca una solicitud de espera por su ID
+
+        Returns:
+            dict: {"exito": bool, "mensaje": str, "datos": SolicitudEspera | None}
+        """
+        if not isinstance(id_solicitud, int) or id_solicitud <= 0:
+            return {"exito": False, "mensaje": "Formato de ID de solicitud invalido. Debe ser un numero entero positivo", "datos": None}
+
+        try:
+            self.vencer_ofertas()
+            data = self.persistencia.buscar_por_id(id_solicitud, "id_solicitud")
+
+            if data is None:
+                return {"exito": False, "mensaje": f"No se encontro una solicitud de espera con el ID {id_solicitud}", "datos": None}
+
+            return {"exito": True, "mensaje": "Solicitud encontrada", "datos": SolicitudEspera.from_dict(data)}
+
+        except Exception as e:
+            return {"exito": False, "mensaje": f"Error al recuperar la solicitud: {str(e)}", "datos": None}
+
+    def cancelar_solicitud(self, id_solicitud: int) -> dict:
+        """
+        Retira una solicitud de la lista de espera
+
+        Returns:
+            dict: {"exito": bool, "mensaje": str, "id": int | None}
+        """
+        resultado = self.buscar_por_id(id_solicitud)
+        if not resultado["exito"]:
+            return {"exito": False, "mensaje": resultado["mensaje"], "id": None}
+
+        solicitud = resultado["datos"]
+        try:
+            solicitud.cancelar()
+            self.persistencia.actualizar(id_solicitud, solicitud.to_dict(), "id_solicitud")
+        except EstadoInvalidoException as e:
+            return {"exito": False, "mensaje": f"{str(e)}", "id": None}
+        except Exception as e:
+            return {"exito": False, "mensaje": f"{str(e)}", "id": None}
+
+        return {"exito": True, "mensaje": "Solicitud retirada de la lista de espera", "id": id_solicitud}
+
+    # ========== OFERTAS DE HUECOS ==========
+    def ofrecer_hueco(self, id_doctor: int, especialidad: str, fecha: date, hora: time, excluir: set | None = None) -> dict:
+        """
+        Ofrece un hueco liberado al mejor paciente en espera
+
+        Se revisa la cola del doctor y la de "cualquier doctor" de la especialidad
+        para ese dia; el primero de ambas es el elegido.
+
+        Args:
+            id_doctor (int): Doctor del hueco liberado
+            especialidad (str): Especialidad del hueco
+            fecha (date): Dia del hueco
+            hora (time): Hora del hueco
+            excluir (set | None): IDs de solicitudes que no deben recibir la oferta
+
+        Returns:
+            dict: {"exito": bool, "mensaje": str, "id": int | None}
+        """
+        try:
+            self.vencer_ofertas()
+        except Exception as e:
+            return {"exito": False, "mensaje": f"Error al ofrecer el hueco: {str(e)}", "id": None}
+
+        return self._ofrecer(id_doctor, especialidad, fecha, hora, excluir)
+
+    def _ofrecer(self, id_doctor: int, especialidad: str, fecha: date, hora: time, excluir: set | None = None) -> dict:
+        """Ofrece el hueco al mejor candidato de la cola (sin revisar vencimientos)"""
+        try:
+            claves = [(especialidad, id_doctor), (especialidad, None)]
+            id_solicitud = self.cola.mejor(claves, fecha, excluir)
+
+            if id_solicitud is None:
+                return {"exito": False, "mensaje": "No hay pacientes en espera para este hueco", "id": None}
+
+            # La cola ya tiene el registro: no hace falta releer el archivo
+            solicitud = SolicitudEspera.from_dict(self.cola.obtener(id_solicitud))
+            solicitud.ofrecer(id_doctor, fecha, hora)
+            self.persistencia.actualizar(id_solicitud, solicitud.to_dict(), "id_solicitud")
+
+            return {
+                "exito": True,
+                "mensaje": f"Hueco ofrecido al paciente {solicitud.id_paciente} (solicitud {id_solicitud})",
+                "id": id_solicitud
+            }
+
+        except Exception as e:
+            return {"exito": False, "mensaje": f"Error al ofrecer el hueco: {str(e)}", "id": None}
+
+    def rechazar_oferta(self, id_solicitud: int) -> dict:
+        """
+        El paciente no toma el hueco: vuelve a la cola y el hueco pasa al siguiente
+
+        Returns:
+            dict: {"exito": bool, "mensaje": str, "id": int | None}
+        """
+        resultado = self.buscar_por_id(id_solicitud)
+        if not resultado["exito"]:
+            return {"exito": False, "mensaje": resultado["mensaje"], "id": None}
+
+        solicitud = resultado["datos"]
+        oferta = solicitud.oferta
+
+        try:
+            solicitud.rechazar_oferta()
+            self.persistencia.actualizar(id_solicitud, solicitud.to_dict(), "id_solicitud")
+        except EstadoInvalidoException as e:
+            return {"exito": False, "mensaje": f"{str(e)}", "id": None}
+
+        # Ofrecer el mismo hueco al siguiente en la cola
+        return self.ofrecer_hueco(
+            oferta["id_doctor"],
+            solicitud.especialidad,
+            date.fromisoformat(oferta["fecha"]),
+            time.fromisoformat(oferta["hora"]),
+            excluir={id_solicitud}
+        )
+
+    def vencer_ofertas(self, ahora: datetime | None = None) -> int:
+        """
+        Devuelve a la cola las solicitudes cuya oferta vencio sin respuesta
+
+        Cada hueco vencido que aun no paso se ofrece al siguiente en la cola.
+        Solo se revisan las ofertas vencidas (indice por vencimiento).
+
+        Args:
+            ahora (datetime | None): Momento de referencia (None = ahora)
+
+        Returns:
+            int: Cantidad de ofertas vencidas
+        """
+        ahora = ahora or datetime.now()
+        vencidas = self.ofertas.anteriores((ahora.isoformat(timespec="seconds"),))
+
+        for data in vencidas:
+            solicitud = SolicitudEspera.from_dict(data)
+            oferta = solicitud.oferta
+
+            try:
+                solicitud.rechazar_oferta()
+                self.persistencia.actualizar(solicitud.id_solicitud, solicitud.to_dict(), "id_solicitud")
+            except EstadoInvalidoException:
+                continue
+
+            # Ofrecer el hueco al siguiente si todavia esta a tiempo
+            fecha = date.fromisoformat(oferta["fecha"])
+            hora = time.fromisoformat(oferta["hora"])
+            if datetime.combine(fecha, hora) > ahora:
+                self._ofrecer(oferta["id_doctor"], solicitud.especialidad, fecha, hora, excluir={solicitud.id_solicitud})
+
+        return len(vencidas)
+
+    def marcar_asignada(self, id_solicitud: int, id_cita: int) -> dict:
+        """
+        Cierra una solicitud cuya oferta termino en una cita agendada
+
+        Returns:
+            dict: {"exito": bool, "mensaje": str, "id": int | None}
+        """
+        resultado = self.buscar_por_id(id_solicitud)
+        if not resultado["exito"]:
+            return {"exito": False, "mensaje": resultado["mensaje"], "id": None}
+
+        solicitud = resultado["datos"]
+        try:
+            solicitud.asignar(id_cita)
+            self.persistencia.actualizar(id_solicitud, solicitud.to_dict(), "id_solicitud")
+        except (ValidationException, EstadoInvalidoException) as e:
+            return {"exito": False, "mensaje": f"{str(e)}", "id": None}
+
+        return {"exito": True, "mensaje": "Solicitud de espera asignada", "id": id_solicitud}
+
+    def devolver_a_cola(self, id_solicitud: int) -> None:
+        """Devuelve a la cola una solicitud cuya oferta ya no se pudo concretar"""
+        resultado = self.buscar_por_id(id_solicitud)
+        if not resultado["exito"]:
+            return
+
+        solicitud = resultado["datos"]
+        try:
+            solicitud.rechazar_oferta()
+            self.persistencia.actualizar(id_solicitud, solicitud.to_dict(), "id_solicitud")
+        except EstadoInvalidoException:
+            return
+
+    def cantidad_en_espera(self) -> int:
+        """Cantidad de solicitudes pendientes"""
+        self.vencer_ofertas()
+        return self.cola.cantidad()
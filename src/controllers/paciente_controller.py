@@ -1,11 +1,21 @@
 """Controlador responsable de la gestion de pacientes"""
 
+import csv
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Tuple
 from src.utils.persistencia import Persistencia
+from src.utils.helpers import Helpers
+from src.utils.paginacion import Paginacion
+from src.utils.exportacion import Exportador
+from src.config.constantes import FORMATOS_EXPORTACION
 from datetime import date
-from src.utils.excepciones import ValidationException
+from src.utils.excepciones import ValidationException, DNIDuplicadoException
 from src.models.paciente import Paciente
 from src.utils.validaciones import Validaciones
 from src.models.consulta import Consulta
+from src.utils.indices import IndicePrimario, IndiceUnico, IndiceNombres, IndiceAgrupado
+from src.utils.proyecciones import ResumenPacientes
 class PacienteController:
     """
     Clase "controlador" encargada de la gestion de los pacientes
@@ -22,9 +32,53 @@ class PacienteController:
         Atributos:
             persistencia (Persistencia): Repositorio de datos para el registro de los pacientes
             persistencia_consultas (Persistencia): Repositorio de datos para las consultas de los pacientes
+            persistencia_citas (Persistencia): Repositorio de datos de las citas de los pacientes
+            persistencia_facturas (Persistencia): Repositorio de datos de las facturas de los pacientes
+            indice_pacientes (IndicePrimario): Pacientes por ID
+            indice_dni (IndiceUnico): ID de paciente por DNI (impide DNIs repetidos al escribir)
+            indice_nombres (IndiceNombres): Busqueda aproximada de pacientes por nombre
+            resumenes (ResumenPacientes): Datos calculados de cada paciente (edad, visitas, citas, facturas)
+            indice_consultas (IndicePrimario): Consultas por ID y por id_paciente
+            citas_paciente (IndiceAgrupado): Todas las citas de cada paciente por fecha y hora
+            indice_facturas (IndicePrimario): Facturas por ID y por consulta (compartido con FacturacionController)
         """
         self.persistencia = Persistencia("data/pacientes.json")
         self.persistencia_consultas = Persistencia("data/consultas.json")
+        
+        # Indices compartidos para traer el historial sin recorrer todas las consultas
+        self.indice_pacientes = IndicePrimario.compartido(self.persistencia, campo_id="id_paciente")
+        self.indice_dni = IndiceUnico.compartido(
+            self.persistencia,
+            campo="dni",
+            campo_id="id_paciente",
+            excepcion=DNIDuplicadoException
+        )
+        self.indice_nombres = IndiceNombres.compartido(self.persistencia, campo="nombre", campo_id="id_paciente")
+        self.persistencia_citas = Persistencia("data/citas.json")
+        self.persistencia_facturas = Persistencia("data/facturas.json")
+        self.resumenes = ResumenPacientes.compartido(
+            self.persistencia,
+            self.persistencia_citas,
+            self.persistencia_consultas,
+            self.persistencia_facturas
+        )
+        self.indice_consultas = IndicePrimario.compartido(
+            self.persistencia_consultas,
+            campo_id="id_consulta",
+            campos_secundarios=("id_paciente",)
+        )
+        self.citas_paciente = IndiceAgrupado.compartido(
+            self.persistencia_citas,
+            campo_grupo="id_paciente",
+            campo_subgrupo="fecha",
+            campo_orden="hora",
+            campo_id="id_cita"
+        )
+        self.indice_facturas = IndicePrimario.compartido(
+            self.persistencia_facturas,
+            campo_id="id_factura",
+            campos_secundarios=("id_consulta",)
+        )
     
     # ========== OPERACIONES CRUD ==========
     def registrar_paciente(
@@ -73,6 +127,10 @@ class PacienteController:
             # Devolver exito
             return {"exito": True, "mensaje": "Paciente registrado exitosamente", "id": id_paciente}
         
+        # Otro registro tomo el DNI entre la verificacion y la escritura
+        except DNIDuplicadoException:
+            return {"exito": False, "mensaje": "El DNI ya existe", "id": None}
+        
         # Atrapa errores al crear la instancia
         except ValidationException as e:
             return {"exito": False, "mensaje": f"Datos inválidos: {str(e)}", "id": None}
@@ -98,12 +156,12 @@ class PacienteController:
 
         # Buscar Paciente
         try:   
-            datos = self.persistencia.leer_todos()
+            id_paciente = self.indice_dni.id_de(dni)
+            pac = self.indice_pacientes.obtener(id_paciente) if id_paciente is not None else None
             
-            for pac in datos:
-                if pac.get("dni") == dni:
-                    obj_encontrado = Paciente.from_dict(pac)
-                    return {"exito": True, "mensaje": "Paciente encontrado", "datos": obj_encontrado}
+            if pac:
+                obj_encontrado = Paciente.from_dict(pac)
+                return {"exito": True, "mensaje": "Paciente encontrado", "datos": obj_encontrado}
             
             return {"exito": False, "mensaje": "Paciente no encontrado", "datos": None}
             
@@ -150,6 +208,79 @@ class PacienteController:
                     "datos": None
                 }
 
+    def buscar_por_nombre(self, texto: str, limite: int = 10) -> dict:
+        """
+        Busca pacientes por nombre completo, parcial o con errores de tipeo
+        
+        Args:
+            texto (str): Nombre o parte del nombre (no importan tildes ni mayusculas)
+            limite (int): Cantidad maxima de pacientes a devolver
+        
+        Returns:
+            dict: {"exito": bool, "mensaje": str, "datos": List[Paciente] | None}
+                  Pacientes ordenados del mas al menos parecido
+        """
+        
+        # Validar texto
+        if not texto or not isinstance(texto, str) or not texto.strip():
+            return {"exito": False, "mensaje": "Debe ingresar un nombre a buscar", "datos": None}
+        
+        if not isinstance(limite, int) or limite <= 0:
+            return {"exito": False, "mensaje": "El limite debe ser un numero entero positivo", "datos": None}
+        
+        # Buscar candidatos en el indice y traer sus registros
+        try:
+            candidatos = self.indice_nombres.buscar(texto, limite)
+            registros = self.indice_pacientes.obtener_varios([id_paciente for id_paciente, _ in candidatos])
+            
+            if not registros:
+                return {"exito": False, "mensaje": f"No se encontraron pacientes parecidos a '{texto.strip()}'", "datos": None}
+            
+            pacientes = [Paciente.from_dict(registro) for registro in registros]
+            return {"exito": True, "mensaje": f"Se encontraron {len(pacientes)} pacientes", "datos": pacientes}
+        
+        except Exception as e:
+            return {"exito": False, "mensaje": f"Error: {str(e)}", "datos": None}
+
+    def obtener_resumen(self, id_paciente: int | None = None, dni: str | None = None) -> dict:
+        """
+        Devuelve el resumen de un paciente para mostrarlo (por ID o por DNI)
+        
+        Incluye edad, descuento, cantidad de visitas, ultima visita, citas
+        pendientes y facturas pendientes sin recorrer los demas archivos.
+        
+        Args:
+            id_paciente (int | None): ID del paciente
+            dni (str | None): DNI del paciente (si no se da el ID)
+        
+        Returns:
+            dict: {"exito": bool, "mensaje": str, "datos": dict | None}
+        """
+        
+        # Resolver el ID por DNI si hace falta
+        if id_paciente is None:
+            if not Validaciones.validar_dni(dni):
+                return {"exito": False, "mensaje": "DNI invalido", "datos": None}
+            id_paciente = self.indice_dni.id_de(dni)
+            
+            if id_paciente is None:
+                return {"exito": False, "mensaje": "Paciente no encontrado", "datos": None}
+        
+        elif not isinstance(id_paciente, int) or id_paciente <= 0:
+            return {"exito": False, "mensaje": "ID invalido. Debe ser un numero entero positivo", "datos": None}
+        
+        # Consultar la proyeccion
+        try:
+            resumen = self.resumenes.obtener(id_paciente)
+            
+            if resumen is None:
+                return {"exito": False, "mensaje": f"No se encontro ningun paciente con el ID {id_paciente}", "datos": None}
+            
+            return {"exito": True, "mensaje": "Paciente encontrado", "datos": resumen}
+        
+        except Exception as e:
+            return {"exito": False, "mensaje": f"Error: {str(e)}", "datos": None}
+
     def modificar_paciente(self, id_paciente: int, campo_modificar: dict) -> dict:
         """
         Modifica datos de un Paciente registrado
@@ -234,13 +365,16 @@ class PacienteController:
 
         return {"exito": False, "mensaje": "No se pudo realizar la actualización", "datos": None}    
 
-    def obtener_historial(self, id_paciente: int) -> dict:
+    def obtener_historial(self, id_paciente: int, pagina: int | None = None, por_pagina: int = 10) -> dict:
         """
         Busca el historial de un paciente
-        Accediendo al archivo de Persistencia de consultas y filtrando por ID
+        Trae directamente por ID las consultas de su historial (Paciente.historial_consultas)
+        ordenadas por fecha; si el paciente no tiene la lista, las busca por id_paciente
         
         Args:
             id_paciente (int): ID del paciente
+            pagina (int | None): Pagina a devolver (desde 1). None devuelve todo el historial
+            por_pagina (int): Cantidad de consultas por pagina
         
         Returns:
             dict: {"exito": bool, "mensaje": str, "datos": list | None}
@@ -249,33 +383,62 @@ class PacienteController:
         # Validar ID
         if not isinstance(id_paciente, int) or id_paciente <= 0:
             return {"exito": False, "mensaje": "Formato de ID invalido", "datos": None}
+        
+        # Validar paginacion
+        if pagina is not None:
+            if not isinstance(pagina, int) or pagina <= 0:
+                return {"exito": False, "mensaje": "Pagina invalida. Debe ser un numero entero positivo", "datos": None}
+            
+            if not isinstance(por_pagina, int) or por_pagina <= 0:
+                return {"exito": False, "mensaje": "Cantidad por pagina invalida. Debe ser un numero entero positivo", "datos": None}
     
-        # Obtener consultas
+        # Obtener consultas del paciente
         try:
-            consultas = self.persistencia_consultas.leer_todos()    
+            paciente = self.indice_pacientes.obtener(id_paciente)
+            if paciente is None:
+                return {"exito": False, "mensaje": f"No se encontro un paciente con el ID {id_paciente}", "datos": None}
+            
+            ids_consultas = paciente.get("historial_consultas") or self.indice_consultas.ids_por("id_paciente", id_paciente)
+            consultas = self.indice_consultas.obtener_varios(ids_consultas)
         except Exception as e:
             return {"exito": False, "mensaje": f"{str(e)}", "datos": None}
-
+    
         if not consultas:
-            return {"exito": False, "mensaje": "No se han registrados consultas en el sistema", "datos": None}
+            return {"exito": False, "mensaje": "No se encontro un historial para el paciente", "datos": None}
+        
+        # Ordenar por fecha (ISO: el orden de texto es el cronologico)
+        consultas.sort(key=lambda consulta: consulta.get("fecha_hora", ""))
+        total = len(consultas)
+        
+        # Recortar la pagina pedida
+        if pagina is not None:
+            total_paginas = (total + por_pagina - 1) // por_pagina
+            if pagina > total_paginas:
+                return {"exito": False, "mensaje": f"Pagina fuera de rango. El historial tiene {total_paginas} paginas", "datos": None}
+            
+            inicio = (pagina - 1) * por_pagina
+            consultas = consultas[inicio:inicio + por_pagina]
     
-        # Filtrar por ID
+        # Convertir a instancias
         consultas_encontradas = []
         
         for consulta in consultas:
-            if consulta.get("id_paciente") == id_paciente:
-                try:
-                    consulta_agregar = Consulta.from_dict(consulta)
-                    consultas_encontradas.append(consulta_agregar)
-                except (Exception, KeyError) as e:
-                    print(f"Consulta corrupta ignorada: {e}")
-                    continue
+            try:
+                consulta_agregar = Consulta.from_dict(consulta)
+                consultas_encontradas.append(consulta_agregar)
+            except (Exception, KeyError) as e:
+                print(f"Consulta corrupta ignorada: {e}")
+                continue
     
         if not consultas_encontradas:
             return {"exito": False, "mensaje": "No se encontro un historial para el paciente", "datos": None}
+        
+        mensaje = f"Historial encontrado, numero de consultas ({total})"
+        if pagina is not None:
+            mensaje += f". Pagina {pagina} de {total_paginas}"
 
         return {"exito": True, 
-                "mensaje": f"Historial encontrado, numero de consultas ({len(consultas_encontradas)})", 
+                "mensaje": mensaje, 
                 "datos": consultas_encontradas}
     
     def listar_pacientes(self) -> dict:
@@ -310,7 +473,298 @@ class PacienteController:
                 "datos": None
             }
 
+    def listar_pacientes_paginado(self, tamano_pagina: int = 20, cursor: str | None = None) -> dict:
+        """
+        Devuelve una pagina de pacientes ordenados por ID
+        
+        La pagina se toma del indice de pacientes ordenado por ID (busqueda
+        binaria del cursor) y solo sus pacientes se convierten en objetos Paciente.
+        
+        Args:
+            tamano_pagina (int): Pacientes por pagina
+            cursor (str | None): Cursor devuelto por la pagina anterior (None = primera pagina)
+        
+        Returns:
+            dict: {"exito": bool, "mensaje": str, "datos": List[Paciente] | None, "cursor": str | None}
+                  cursor = pagina siguiente (None si es la ultima)
+        """
+        try:
+            registros, siguiente = Paginacion.pagina_indice(self.indice_pacientes, tamano_pagina, cursor)
+            
+            pacientes = [Paciente.from_dict(registro) for registro in registros]
+            
+            return {
+                "exito": True,
+                "mensaje": f"Se encontraron {len(pacientes)} pacientes en esta pagina",
+                "datos": pacientes,
+                "cursor": siguiente
+            }
+        
+        except ValidationException as e:
+            return {"exito": False, "mensaje": f"{str(e)}", "datos": None, "cursor": None}
+        except Exception as e:
+            return {"exito": False, "mensaje": f"Error: {str(e)}", "datos": None, "cursor": None}
+
+    # ========== EXPORTACION ==========
+    def exportar_historial(self, id_paciente: int, ruta: str, formato: str = "ndjson") -> dict:
+        """
+        Exporta todo lo de un paciente a un archivo (derivaciones, pedidos legales)
+        
+        Incluye sus datos, cada cita con su historial de cambios, cada consulta
+        con sus recetas y sus facturas. Las citas y consultas salen de los
+        indices por paciente y las facturas del indice por consulta: el costo
+        depende de los registros del paciente, no del tamano de los archivos.
+        
+        Args:
+            id_paciente (int): ID del paciente
+            ruta (str): Archivo de salida
+            formato (str): "ndjson" o "csv" (por secciones)
+        
+        Returns:
+            dict: {"exito": bool, "mensaje": str, "datos": dict | None}
+                  datos = {"registros": int, "ruta": str}
+        """
+        
+        # Validaciones
+        if not isinstance(id_paciente, int) or id_paciente <= 0:
+            return {"exito": False, "mensaje": "ID invalido. Debe ser un numero entero positivo", "datos": None}
+        
+        if formato not in FORMATOS_EXPORTACION:
+            return {"exito": False, "mensaje": f"Formato invalido. Debe ser {' o '.join(FORMATOS_EXPORTACION)}", "datos": None}
+        
+        try:
+            paciente = self.indice_pacientes.obtener(id_paciente)
+            if paciente is None:
+                return {"exito": False, "mensaje": f"No se encontro ningun paciente con el ID {id_paciente}", "datos": None}
+            
+            with open(ruta, "w", encoding="utf-8", newline="") as archivo:
+                exportador = Exportador(archivo, formato)
+                exportador.escribir("paciente", paciente)
+                
+                # Citas por fecha y hora
+                for _, citas in sorted(self.citas_paciente.obtener(id_paciente).items()):
+                    for cita in citas:
+                        exportador.escribir("cita", cita)
+                
+                # Consultas y las facturas de cada una
+                ids_consultas = sorted(self.indice_consultas.ids_por("id_paciente", id_paciente))
+                for consulta in self.indice_consultas.obtener_varios(ids_consultas):
+                    exportador.escribir("consulta", consulta)
+                
+                for id_consulta in ids_consultas:
+                    ids_facturas = sorted(self.indice_facturas.ids_por("id_consulta", id_consulta))
+                    for factura in self.indice_facturas.obtener_varios(ids_facturas):
+                        exportador.escribir("factura", factura)
+            
+            return {
+                "exito": True,
+                "mensaje": f"Historial del paciente {id_paciente} exportado ({exportador.cantidad} registros)",
+                "datos": {"registros": exportador.cantidad, "ruta": ruta}
+            }
+        
+        except Exception as e:
+            return {"exito": False, "mensaje": f"Error al exportar: {str(e)}", "datos": None}
+    
+    def exportar_historiales(self, ids_pacientes: List[int] | None, ruta: str, formato: str = "ndjson") -> dict:
+        """
+        Exporta el historial completo de varios pacientes en un solo archivo
+        
+        Cada archivo de datos se recorre una sola vez, por partes, escribiendo los
+        registros de los pacientes pedidos a medida que aparecen (primero todos
+        los pacientes, luego sus citas, consultas y facturas). Cada registro
+        lleva su id_paciente.
+        
+        Args:
+            ids_pacientes (List[int] | None): Pacientes a exportar (None = todos)
+            ruta (str): Archivo de salida
+            formato (str): "ndjson" o "csv" (por secciones)
+        
+        Returns:
+            dict: {"exito": bool, "mensaje": str, "datos": dict | None}
+                  datos = {"pacientes": int, "registros": int, "no_encontrados": List[int], "ruta": str}
+        """
+        
+        # Validaciones
+        if formato not in FORMATOS_EXPORTACION:
+            return {"exito": False, "mensaje": f"Formato invalido. Debe ser {' o '.join(FORMATOS_EXPORTACION)}", "datos": None}
+        
+        if ids_pacientes is not None:
+            if not ids_pacientes or not all(isinstance(i, int) and i > 0 for i in ids_pacientes):
+                return {"exito": False, "mensaje": "Los IDs deben ser numeros enteros positivos", "datos": None}
+            buscados = set(ids_pacientes)
+        
+        def incluido(registro: dict) -> bool:
+            return ids_pacientes is None or registro.get("id_paciente") in buscados
+        
+        try:
+            encontrados = set()
+            with open(ruta, "w", encoding="utf-8", newline="") as archivo:
+                exportador = Exportador(archivo, formato)
+                
+                for registro in self.persistencia.iterar():
+                    if incluido(registro):
+                        encontrados.add(registro.get("id_paciente"))
+                        exportador.escribir("paciente", registro)
+                
+                # Solo se exportan registros de pacientes que existen
+                for tipo, persistencia in (("cita", self.persistencia_citas), ("consulta", self.persistencia_consultas), ("factura", self.persistencia_facturas)):
+                    for registro in persistencia.iterar():
+                        if registro.get("id_paciente") in encontrados:
+                            exportador.escribir(tipo, registro)
+            
+            no_encontrados = sorted(buscados - encontrados) if ids_pacientes is not None else []
+            
+            return {
+                "exito": bool(encontrados),
+                "mensaje": f"Pacientes exportados: {len(encontrados)} ({exportador.cantidad} registros)"
+                           + (f" | No encontrados: {', '.join(map(str, no_encontrados))}" if no_encontrados else ""),
+                "datos": {
+                    "pacientes": len(encontrados),
+                    "registros": exportador.cantidad,
+                    "no_encontrados": no_encontrados,
+                    "ruta": ruta
+                }
+            }
+        
+        except Exception as e:
+            return {"exito": False, "mensaje": f"Error al exportar: {str(e)}", "datos": None}
+
+    # ========== IMPORTACION MASIVA ==========
+    def importar_pacientes(
+        self,
+        ruta_csv: str,
+        ruta_rechazos: str | None = None,
+        procesos: int | None = None,
+        tamano_bloque: int = 1000
+    ) -> dict:
+        """
+        Registra los pacientes de un archivo CSV con una sola escritura
+        
+        El archivo se lee por bloques y cada bloque se valida en paralelo con el
+        modelo Paciente. Luego se descartan los DNIs repetidos (contra el sistema
+        y dentro del mismo archivo), se asignan IDs consecutivos a partir del
+        ultimo registrado y se guardan todos los aceptados de una vez. Las filas
+        rechazadas se escriben con su motivo en un CSV de rechazos.
+        
+        Columnas: dni, nombre, fecha_nacimiento, telefono, tipo_seguro, fecha_registro
+        (fechas DD/MM/AAAA o AAAA-MM-DD; fecha_registro vacia = hoy)
+        
+        Args:
+            ruta_csv (str): Archivo CSV a importar
+            ruta_rechazos (str | None): CSV de rechazos (por defecto <archivo>_rechazos.csv)
+            procesos (int | None): Procesos de validacion (por defecto los nucleos del equipo, 1 = sin paralelo)
+            tamano_bloque (int): Filas que valida cada proceso por vez
+        
+        Returns:
+            dict: {"exito": bool, "mensaje": str, "datos": dict | None}
+                  datos = {"importados": int, "rechazados": int, "ids": List[int], "ruta_rechazos": str}
+        """
+        
+        # Validaciones
+        if not os.path.exists(ruta_csv):
+            return {"exito": False, "mensaje": f"No existe el archivo {ruta_csv}", "datos": None}
+        
+        if not isinstance(tamano_bloque, int) or tamano_bloque <= 0:
+            return {"exito": False, "mensaje": "El tamano de bloque debe ser un numero entero positivo", "datos": None}
+        
+        if ruta_rechazos is None:
+            ruta_rechazos = f"{os.path.splitext(ruta_csv)[0]}_rechazos.csv"
+        
+        try:
+            with open(ruta_csv, "r", encoding="utf-8-sig", newline="") as entrada, \
+                 open(ruta_rechazos, "w", encoding="utf-8", newline="") as salida:
+                rechazos = csv.writer(salida)
+                rechazos.writerow(["fila", "dni", "nombre", "motivo"])
+                
+                # Validar las filas por bloques (en paralelo salvo que se pida un solo proceso)
+                validos = []
+                cantidad_rechazados = 0
+                for numero, registro, error, fila in self._validar_csv(csv.DictReader(entrada), procesos, tamano_bloque):
+                    if error is not None:
+                        rechazos.writerow([numero, fila.get("dni", ""), fila.get("nombre", ""), error])
+                        cantidad_rechazados += 1
+                    else:
+                        validos.append((numero, registro))
+                
+                # Leer el archivo una sola vez: DNIs registrados y bloque de IDs libres
+                version_antes = self.persistencia.version()
+                datos = self.persistencia.leer_todos()
+                dnis = {registro.get("dni") for registro in datos}
+                siguiente_id = max((registro.get("id_paciente", 0) for registro in datos), default=0) + 1
+                
+                nuevos = []
+                for numero, registro in validos:
+                    if registro["dni"] in dnis:
+                        rechazos.writerow([numero, registro["dni"], registro["nombre"], "El DNI ya existe"])
+                        cantidad_rechazados += 1
+                        continue
+                    
+                    dnis.add(registro["dni"])
+                    registro["id_paciente"] = siguiente_id
+                    siguiente_id += 1
+                    nuevos.append(registro)
+            
+            # Una sola escritura para todos los pacientes aceptados
+            if nuevos:
+                self.persistencia.guardar_lote(datos + nuevos, [(None, registro) for registro in nuevos], version_antes)
+            
+            return {
+                "exito": bool(nuevos),
+                "mensaje": f"Pacientes importados: {len(nuevos)} | Filas rechazadas: {cantidad_rechazados}",
+                "datos": {
+                    "importados": len(nuevos),
+                    "rechazados": cantidad_rechazados,
+                    "ids": [registro["id_paciente"] for registro in nuevos],
+                    "ruta_rechazos": ruta_rechazos
+                }
+            }
+        
+        except DNIDuplicadoException as e:
+            return {"exito": False, "mensaje": f"Importacion cancelada, el archivo de pacientes cambio durante la importacion: {str(e)}", "datos": None}
+        except Exception as e:
+            return {"exito": False, "mensaje": f"Error al importar pacientes: {str(e)}", "datos": None}
+    
     # ========== METODOS PRIVADOS ==========
+    @staticmethod
+    def _validar_csv(lector: csv.DictReader, procesos: int | None, tamano_bloque: int):
+        """
+        Valida las filas del CSV por bloques, manteniendo el orden del archivo
+        
+        Solo se mantienen en memoria unos pocos bloques pendientes a la vez.
+        
+        Yields:
+            Tuple: (numero de fila, registro | None, error | None, fila original)
+        """
+        def bloques():
+            bloque = []
+            # La fila 1 es el encabezado
+            for numero, fila in enumerate(lector, start=2):
+                bloque.append((numero, fila))
+                if len(bloque) == tamano_bloque:
+                    yield bloque
+                    bloque = []
+            if bloque:
+                yield bloque
+        
+        # Sin paralelo
+        if procesos == 1:
+            for bloque in bloques():
+                yield from _validar_filas_paciente(bloque)
+            return
+        
+        procesos = procesos or os.cpu_count() or 1
+        with ProcessPoolExecutor(max_workers=procesos) as ejecutor:
+            pendientes = []
+            for bloque in bloques():
+                pendientes.append(ejecutor.submit(_validar_filas_paciente, bloque))
+                
+                # Limitar los bloques en vuelo para no cargar todo el archivo
+                if len(pendientes) >= procesos * 2:
+                    yield from pendientes.pop(0).result()
+            
+            for pendiente in pendientes:
+                yield from pendiente.result()
+    
     def _dni_existe(self, dni: str) -> bool:
         """
         Evalua si un DNI esta registrado en el sistema
@@ -321,14 +775,52 @@ class PacienteController:
         Returns:
             bool: True si esta registrado | False si no lo esta
         """
-        # Traer registros
-        registros = self.persistencia.leer_todos()
-        
-        # Devuelve True si al menos uno cumple la condicion
-        return any(personal.get("dni") == dni for personal in registros)
+        return self.indice_dni.existe(dni)
     
     def _generar_id(self) -> int:
         """
         Genera un ID de Paciente unico auto-incremental
         """
-        return self.persistencia.generar_id_autoincremental()
\ No newline at end of file
+        return self.persistencia.generar_id_autoincremental()
+
+
+def _validar_filas_paciente(filas: List[Tuple[int, Dict[str, str]]]) -> List[Tuple[int, Dict | None, str | None, Dict[str, str]]]:
+    """
+    Valida filas de un CSV de pacientes (se ejecuta en los procesos de importacion)
+    
+    El ID se asigna despues, por eso se construye el Paciente con un ID provisional.
+    
+    Args:
+        filas (List[Tuple]): (numero de fila, fila del CSV)
+    
+    Returns:
+        List[Tuple]: (numero de fila, registro | None, error | None, fila original)
+    """
+    def fecha(texto: str) -> date:
+        texto = (texto or "").strip()
+        try:
+            return Helpers.parsear_fecha(texto)
+        except ValueError:
+            pass
+        try:
+            return date.fromisoformat(texto)
+        except ValueError:
+            raise ValueError(f"Fecha invalida: '{texto}'. Use DD/MM/AAAA")
+    
+    resultados = []
+    for numero, fila in filas:
+        try:
+            paciente = Paciente(
+                dni=(fila.get("dni") or "").strip(),
+                nombre=(fila.get("nombre") or "").strip(),
+                fecha_nacimiento=fecha(fila.get("fecha_nacimiento")),
+                telefono=(fila.get("telefono") or "").strip(),
+                id_paciente=1,
+                tipo_seguro=(fila.get("tipo_seguro") or "").strip(),
+                fecha_registro=fecha(fila["fecha_registro"]) if (fila.get("fecha_registro") or "").strip() else date.today()
+            )
+            resultados.append((numero, paciente.to_dict(), None, fila))
+        except Exception as e:
+            resultados.append((numero, None, str(e), fila))
+    
+    return resultados
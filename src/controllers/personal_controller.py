@@ -2,15 +2,28 @@
 Controlador responsable de la gestion del personal medico y administrativo
 
 """
-from datetime import date
-from typing import List
+import csv
+import json
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, time, timedelta
+from typing import Dict, Iterable, Iterator, List, Tuple
 from src.utils.persistencia import Persistencia
-from src.utils.excepciones import ValidationException, EstadoInvalidoException
+from src.utils.excepciones import ValidationException, EstadoInvalidoException, DNIDuplicadoException
+from src.utils.indices import CacheModelos, IndiceUnico, IndiceMultivalor, IndiceCompuesto, IndiceOrdenado, IndiceIntervalos
 from src.utils.validaciones import Validaciones
 from src.models.personal import Personal
 from src.models.contrato import Contrato
+from src.models.excepcion_horario import ExcepcionHorario
 from src.utils.helpers import Helpers
-from src.config.constantes import ESPECIALIDADES, TURNOS, JORNADAS
+from src.utils.paginacion import Paginacion
+from src.utils.nomina import Planilla
+from src.utils.proyecciones import ContadoresPersonal, DisponibilidadPersonal
+from src.utils.turnos import RolTurnos
+from src.utils.transaccion import Transaccion
+from src.controllers.departamento_controller import DepartamentoController
+from src.config.constantes import ESPECIALIDADES, TURNOS, JORNADAS, DEPARTAMENTOS, SALARIOS_BASE, ROLES_PERSONAL, ESTADOS_PERSONAL
 
 class PersonalController:
     """
@@ -28,10 +41,67 @@ class PersonalController:
         Atributos:
             persistencia (Persistencia): Repositorio de datos para los registros de personal.
             persistencia_contratos (Persistencia): Repositorio de datos para el historial de contratos.
+            persistencia_excepciones (Persistencia): Repositorio de datos para las ausencias y horarios extra.
+            indice_personal (CacheModelos): Personal por ID (registros e instancias Personal)
+            indice_dni (IndiceUnico): ID de personal por DNI (impide DNIs repetidos al escribir)
+            indice_departamentos (IndiceMultivalor): IDs del personal activo por departamento
+            indice_roles (IndiceCompuesto): IDs del personal por (rol, estado, especialidad)
+            indice_vencimientos (IndiceOrdenado): Contratos temporales activos por fecha fin
+            indice_vigencias (IndiceIntervalos): Contratos por periodo de vigencia (general, por personal y por tipo)
+            contadores (ContadoresPersonal): Contadores de los reportes de RRHH
+            disponibilidad (DisponibilidadPersonal): Horario de atencion de cada empleado (compartido con CitaController)
+            departamentos (DepartamentoController): Pertenencia a departamentos (ambos archivos)
         """
         
         self.persistencia = Persistencia("data/personal.json")
         self.persistencia_contratos = Persistencia("data/contratos.json")
+        self.persistencia_excepciones = Persistencia("data/excepciones_horario.json")
+        
+        # Indices compartidos para buscar por DNI sin recorrer el archivo
+        self.indice_personal = CacheModelos.compartido(
+            self.persistencia,
+            campo_id="id_personal",
+            fabrica=Personal.from_dict
+        )
+        self.indice_dni = IndiceUnico.compartido(
+            self.persistencia,
+            campo="dni",
+            campo_id="id_personal",
+            excepcion=DNIDuplicadoException
+        )
+        self.indice_departamentos = IndiceMultivalor.compartido(
+            self.persistencia,
+            campo_lista="departamentos",
+            campo_id="id_personal",
+            filtro={"estado": "Activo"}
+        )
+        self.indice_roles = IndiceCompuesto.compartido(
+            self.persistencia,
+            campos=("rol", "estado", "especialidad"),
+            campo_id="id_personal"
+        )
+        self.indice_vencimientos = IndiceOrdenado.compartido(
+            self.persistencia_contratos,
+            campos_orden=("fecha_fin",),
+            campo_id="id_contrato",
+            filtro={"tipo": "Temporal", "estado": "Activo"}
+        )
+        self.indice_vigencias = IndiceIntervalos.compartido(
+            self.persistencia_contratos,
+            campo_desde="fecha_inicio",
+            campo_hasta="fecha_fin",
+            campo_id="id_contrato",
+            campos_grupo=("id_personal", "tipo")
+        )
+        self.contadores = ContadoresPersonal.compartido(
+            self.persistencia,
+            ruta_cache="data/contadores_personal.json"
+        )
+        self.disponibilidad = DisponibilidadPersonal.compartido(
+            self.persistencia,
+            self.persistencia_excepciones
+        )
+        self.departamentos = DepartamentoController()
 
     # ===== OPERACIONES CRUD =====
     def registrar_personal(
@@ -65,7 +135,7 @@ class PersonalController:
         try:
             # Verificar unicidad del DNI
             if self._dni_existe(dni):
-                return {"exito": False, "mensaje": "El DNI ya existe"}
+                return {"exito": False, "mensaje": "El DNI ya existe", "id": None}
         
             # Generar ID unico
             id_personal = self._generar_id()
@@ -92,9 +162,13 @@ class PersonalController:
             # Crear contrato automaticamente
             contrato_personal = self._crear_contrato_inicial(id_personal, tipo, fecha_contratacion, fecha_fin, salario_base)
             
-            # Guardar en persistencia JSON
-            self.persistencia.agregar(personal.to_dict())
-            self.persistencia_contratos.agregar(contrato_personal.to_dict())
+            # Personal, contrato y departamentos en una transaccion (una escritura por archivo)
+            transaccion = Transaccion("registrar_personal")
+            transaccion.agregar(self.persistencia, personal.to_dict(), "id_personal")
+            transaccion.agregar(self.persistencia_contratos, contrato_personal.to_dict(), "id_contrato")
+            self.departamentos.preparar_membresia(transaccion, id_personal, agregar=personal.departamentos)
+            transaccion.confirmar()
+            transaccion.terminar()
             
             return {
                 "exito": True,
@@ -102,6 +176,10 @@ class PersonalController:
                 "id": id_personal
             }
 
+        # Otro registro tomo el DNI entre la verificacion y la escritura (confirmar() revierte lo escrito)
+        except DNIDuplicadoException:
+            return {"exito": False, "mensaje": "El DNI ya existe", "id": None}
+
         # Atrapa cualquier error al crear la instancia
         except ValidationException as e:
             return {"exito": False, "mensaje": f"Datos inválidos: {str(e)}", "id": None}
@@ -126,17 +204,17 @@ class PersonalController:
         
         # Busqueda
         try:
-            empleados_data = self.persistencia.leer_todos() 
+            id_personal = self.indice_dni.id_de(dni)
+            data = self.indice_personal.obtener(id_personal) if id_personal is not None else None
             
-            for data in empleados_data:
-                if data.get("dni") == dni:
-                    personal_obj = Personal.from_dict(data)
-                    
-                    return {
-                        "exito": True, 
-                        "mensaje": "Personal encontrado.", 
-                        "datos": personal_obj
-                    }
+            if data:
+                personal_obj = Personal.from_dict(data)
+                
+                return {
+                    "exito": True, 
+                    "mensaje": "Personal encontrado.", 
+                    "datos": personal_obj
+                }
                     
             return {"exito": False, "mensaje": "Personal no encontrado.", "datos": None}
             
@@ -155,15 +233,12 @@ class PersonalController:
             return {"exito": False, "mensaje": "ID de personal inválido.", "datos": None}
 
         try:
-            # Buscar datos en Persistencia
-            data = self.persistencia.buscar_por_id(id_personal)
+            # Instancia compartida (solo lectura)
+            empleado = self.indice_personal.instancia(id_personal)
             
-            if not data:
+            if empleado is None:
                 return {"exito": False, "mensaje": f"No existe personal con el ID {id_personal}.", "datos": None}
 
-            # Conversion
-            empleado = Personal.from_dict(data)
-
             # Validar que sea doctor
             if empleado.rol != "Doctor":
                 return {
@@ -226,26 +301,21 @@ class PersonalController:
         valor = campo_modificar[clave]
         nuevo_campo = {}
         
-        if clave == "Agregar departamento":
-            try:
-                personal.asignar_departamento(valor)
-                lista_nueva = personal.departamentos.copy()
-                nuevo_campo = {"departamentos": lista_nueva}
-                
-            except ValidationException as e:
-                return {"exito": False, "mensaje": f"Error: {str(e)}", "datos": None}
-            except EstadoInvalidoException as e:
-                return {"exito": False, "mensaje": f"Error: {str(e)}", "datos": None}
-
-        elif clave == "Eliminar departamento":
-            try:
-                personal.remover_departamento(valor)
-                lista_nueva = personal.departamentos.copy()
-                nuevo_campo = {"departamentos": lista_nueva}
-            except ValidationException as e:
-                return {"exito": False, "mensaje": f"Error: {str(e)}", "datos": None}
-            except EstadoInvalidoException as e:
-                return {"exito": False, "mensaje": f"Error: {str(e)}", "datos": None}
+        # Los departamentos se actualizan tambien en data/departamentos.json (misma transaccion)
+        if clave in ("Agregar departamento", "Eliminar departamento"):
+            if clave == "Agregar departamento":
+                resultado = self.departamentos.asignar_personal(valor, id_personal)
+            else:
+                resultado = self.departamentos.remover_personal(valor, id_personal)
+            
+            if not resultado["exito"]:
+                return {"exito": False, "mensaje": resultado["mensaje"], "datos": None}
+            
+            return {
+                "exito": True,
+                "mensaje": "Datos actualizados exitosamente",
+                "datos": Personal.from_dict(resultado["datos"]["personal"])
+            }
 
         elif clave == "Especialidad":
             valor = valor.strip().capitalize()
@@ -381,11 +451,16 @@ class PersonalController:
             motivo_nuevo = personal_obj.motivo_baja
             
             campos_actualizar = {"estado": estado_nuevo, "fecha_baja": fecha_baja_nueva, "motivo_baja": motivo_nuevo}
-            actualizar_datos = self.persistencia.actualizar(id_personal, campos_actualizar)
             
-            if not actualizar_datos:
+            # Baja y salida de sus departamentos en una transaccion
+            transaccion = Transaccion("inactivar_personal")
+            if not transaccion.actualizar(self.persistencia, id_personal, campos_actualizar, "id_personal"):
                 return {"exito": False, "mensaje": f"No se pudo inactivar el personal {id_personal}", "id": None}
             
+            self.departamentos.preparar_membresia(transaccion, id_personal, quitar=personal_obj.departamentos)
+            transaccion.confirmar()
+            transaccion.terminar()
+            
             return {"exito": True, "mensaje": f"Se inactivo el personal con ID '{id_personal}' de forma exitosa", "id": id_personal}
         except ValidationException as e:
             return {"exito": False, "mensaje": f"Error: {str(e)}", "id": None}
@@ -423,6 +498,48 @@ class PersonalController:
         
         return {"exito": True, "mensaje": f"Se encontraron {len(registros_instancias)} empleados activos", "datos": registros_instancias}
 
+    def listar_activos_paginado(self, tamano_pagina: int = 20, cursor: str | None = None) -> dict:
+        """
+        Devuelve una pagina del personal activo ordenado por ID
+        
+        La pagina se toma del indice del personal ordenado por ID (busqueda
+        binaria del cursor) y solo sus empleados se convierten en objetos Personal.
+        
+        Args:
+            tamano_pagina (int): Empleados por pagina
+            cursor (str | None): Cursor devuelto por la pagina anterior (None = primera pagina)
+        
+        Returns:
+            dict: {"exito": bool, "mensaje": str, "datos": List[Personal], "cursor": str | None}
+                  cursor = pagina siguiente (None si es la ultima)
+        """
+        try:
+            registros, siguiente = Paginacion.pagina_indice(
+                self.indice_personal,
+                tamano_pagina,
+                cursor,
+                condicion=lambda registro: registro.get("estado") == "Activo"
+            )
+        except ValidationException as e:
+            return {"exito": False, "mensaje": f"{str(e)}", "datos": [], "cursor": None}
+        except Exception as e:
+            return {"exito": False, "mensaje": f"Error al consultar personal: {str(e)}", "datos": [], "cursor": None}
+        
+        # Se convierte cada registro de la pagina en una instancia Personal
+        registros_instancias = []
+        for registro in registros:
+            try:
+                registros_instancias.append(Personal.from_dict(registro))
+            except (ValueError, KeyError):
+                continue
+        
+        return {
+            "exito": True,
+            "mensaje": f"Se encontraron {len(registros_instancias)} empleados activos en esta pagina",
+            "datos": registros_instancias,
+            "cursor": siguiente
+        }
+
     def listar_por_departamento(self, id_departamento: int) -> dict:
         """
         Retorna una lista de instancias Personal que pertenezcan al departamento ingresado
@@ -435,20 +552,17 @@ class PersonalController:
         if not isinstance(id_departamento, int) or id_departamento <= 0:
             return {"exito": False, "mensaje": "Formato de ID invalido", "datos": []}
 
-        # Buscar registros
+        # Buscar registros (solo los miembros activos del departamento)
         try:
-            registros = self.persistencia.leer_todos()
+            registros = self.indice_personal.obtener_varios(self.indice_departamentos.ids(id_departamento))
             personal_encontrado = []
 
             for data in registros:
-                departamentos_del_empleado = data.get("departamentos", [])
-                
-                if id_departamento in departamentos_del_empleado and data.get("estado") == "Activo":
-                    try:
-                        personal_obj = Personal.from_dict(data)
-                        personal_encontrado.append(personal_obj)
-                    except Exception as e:
-                        continue 
+                try:
+                    personal_obj = Personal.from_dict(data)
+                    personal_encontrado.append(personal_obj)
+                except Exception as e:
+                    continue 
 
             if not personal_encontrado:
                 return {
@@ -465,6 +579,92 @@ class PersonalController:
         except Exception as e:
             return {"exito": False, "mensaje": f"Error al acceder a los datos: {str(e)}", "datos": []}
 
+    def contar_por_departamento(self) -> dict:
+        """
+        Cantidad de personal activo en cada departamento (sin crear instancias Personal)
+        
+        Un empleado en varios departamentos cuenta en cada uno.
+        
+        Returns:
+            dict: {"exito": bool, "mensaje": str, "datos": Dict[int, int]}
+                  datos = {id_departamento: cantidad} de todos los departamentos
+        """
+        try:
+            conteos = self.contadores.por_departamento()
+            datos = {id_departamento: conteos.get(id_departamento, 0) for id_departamento in DEPARTAMENTOS}
+            
+            return {"exito": True, "mensaje": f"Personal activo en {sum(1 for c in datos.values() if c)} departamentos", "datos": datos}
+        
+        except Exception as e:
+            return {"exito": False, "mensaje": f"Error al acceder a los datos: {str(e)}", "datos": {}}
+
+    def contar_por_estado_y_rol(self) -> dict:
+        """
+        Cantidad de personal activo e inactivo de cada rol (sin recorrer el archivo)
+        
+        Returns:
+            dict: {"exito": bool, "mensaje": str, "datos": Dict[str, Dict[str, int]]}
+                  datos = {rol: {"Activo": n, "Inactivo": n}} de todos los roles
+        """
+        try:
+            conteos = self.contadores.por_rol()
+            datos = {
+                rol: {estado: conteos.get(rol, {}).get(estado, 0) for estado in ESTADOS_PERSONAL}
+                for rol in ROLES_PERSONAL
+            }
+            
+            total = sum(sum(estados.values()) for estados in datos.values())
+            return {"exito": True, "mensaje": f"Personal registrado: {total}", "datos": datos}
+        
+        except Exception as e:
+            return {"exito": False, "mensaje": f"Error al acceder a los datos: {str(e)}", "datos": {}}
+
+    def contar_por_jornada_y_turno(self) -> dict:
+        """
+        Cantidad de personal activo por jornada y turno (sin recorrer el archivo)
+        
+        Returns:
+            dict: {"exito": bool, "mensaje": str, "datos": list[dict]}
+                  datos = [{"jornada", "turno", "cantidad"}] (turno None fuera de "Por turnos")
+        """
+        try:
+            conteos = self.contadores.por_jornada_turno()
+            datos = [{"jornada": jornada, "turno": None, "cantidad": conteos.get((jornada, None), 0)}
+                     for jornada in JORNADAS if jornada != "Por turnos"]
+            datos += [{"jornada": "Por turnos", "turno": turno, "cantidad": conteos.get(("Por turnos", turno), 0)}
+                      for turno in TURNOS]
+            
+            return {"exito": True, "mensaje": f"Personal activo: {sum(conteos.values())}", "datos": datos}
+        
+        except Exception as e:
+            return {"exito": False, "mensaje": f"Error al acceder a los datos: {str(e)}", "datos": []}
+
+    def verificar_contadores(self, reparar: bool = False) -> dict:
+        """
+        Recalcula los contadores de RRHH desde el archivo y los compara con los mantenidos
+        
+        Args:
+            reparar (bool): Si hay diferencias, reemplazar los contadores por los recalculados
+        
+        Returns:
+            dict: {"exito": bool, "mensaje": str, "datos": list[tuple]}
+                  datos = [(contador, clave, valor actual, valor correcto)]
+        """
+        try:
+            diferencias = self.contadores.diferencias()
+            
+            if diferencias and reparar:
+                self.contadores.reconstruir()
+            
+            mensaje = f"Diferencias encontradas: {len(diferencias)}"
+            if diferencias and reparar:
+                mensaje += " | Contadores reconstruidos"
+            
+            return {"exito": True, "mensaje": mensaje, "datos": diferencias}
+        
+        except Exception as e:
+            return {"exito": False, "mensaje": f"Error al verificar los contadores: {str(e)}", "datos": []}
+
     def obtener_doctores_por_especialidad(self, especialidad: str) -> dict:
         """
         Busca personal que sea Doctor, esté Activo y pertenezca a una especialidad.
@@ -478,22 +678,11 @@ class PersonalController:
         especialidad_buscada = especialidad.strip().title()
 
         try:
-            todos_los_registros = self.persistencia.leer_todos()
-            doctores_encontrados = []
-
-            for data in todos_los_registros:
-                # Aplicar Triple Filtro: Rol + Estado + Especialidad
-                es_doctor = data.get("rol") == "Doctor"
-                esta_activo = data.get("estado") == "Activo"
-                es_especialidad = data.get("especialidad") == especialidad_buscada
-
-                if es_doctor and esta_activo and es_especialidad:
-                    try:
-                        # Convertimos a instancia de objeto Personal
-                        doctor_obj = Personal.from_dict(data)
-                        doctores_encontrados.append(doctor_obj)
-                    except Exception:
-                        continue
+            # Triple filtro resuelto por el indice: Rol + Estado + Especialidad
+            ids_doctores = self.indice_roles.ids("Doctor", "Activo", especialidad_buscada)
+            
+            # Instancias Personal compartidas (solo lectura)
+            doctores_encontrados = self.indice_personal.instancias(ids_doctores)
 
             # Manejo de resultados vacíos
             if not doctores_encontrados:
@@ -517,8 +706,494 @@ class PersonalController:
                 "datos": []
             }
 
+    # ===== REGISTRO MASIVO =====
+    def importar_personal(
+        self,
+        ruta: str,
+        ruta_rechazos: str | None = None,
+        procesos: int | None = None,
+        tamano_bloque: int = 500
+    ) -> dict:
+        """
+        Registra en bloque al personal de un archivo CSV o JSON junto con sus contratos
+        
+        Cada fila se valida en paralelo con los modelos Personal y Contrato. Luego
+        se descartan los DNIs repetidos (contra el sistema y dentro del mismo
+        archivo), se asignan IDs consecutivos y se guardan todos los aceptados en
+        una transaccion: una escritura para el personal, otra para los contratos y
+        otra para los departamentos.
+        Las filas rechazadas se escriben con su motivo en un CSV de rechazos.
+        
+        Campos: dni, nombre, fecha_nacimiento, telefono, rol, especialidad,
+        departamentos, jornada, turno, salario_base, fecha_contratacion,
+        tipo_contrato, fecha_fin
+        (CSV: departamentos separados por ";", fechas DD/MM/AAAA o AAAA-MM-DD,
+        salario_base vacio = salario del rol; JSON: lista de objetos con esos campos)
+        
+        Args:
+            ruta (str): Archivo .csv o .json a importar
+            ruta_rechazos (str | None): CSV de rechazos (por defecto <archivo>_rechazos.csv)
+            procesos (int | None): Procesos de validacion (por defecto los nucleos del equipo, 1 = sin paralelo)
+            tamano_bloque (int): Filas que valida cada proceso por vez
+        
+        Returns:
+            dict: {"exito": bool, "mensaje": str, "datos": dict | None}
+                  datos = {"importados": int, "rechazados": int, "ids": List[int], "ruta_rechazos": str}
+        """
+        
+        # Validaciones
+        if not os.path.exists(ruta):
+            return {"exito": False, "mensaje": f"No existe el archivo {ruta}", "datos": None}
+        
+        extension = os.path.splitext(ruta)[1].lower()
+        if extension not in (".csv", ".json"):
+            return {"exito": False, "mensaje": "Formato de archivo invalido. Debe ser .csv o .json", "datos": None}
+        
+        if not isinstance(tamano_bloque, int) or tamano_bloque <= 0:
+            return {"exito": False, "mensaje": "El tamano de bloque debe ser un numero entero positivo", "datos": None}
+        
+        if ruta_rechazos is None:
+            ruta_rechazos = f"{os.path.splitext(ruta)[0]}_rechazos.csv"
+        
+        transaccion = Transaccion("importar_personal")
+        
+        try:
+            with open(ruta, "r", encoding="utf-8-sig", newline="") as entrada, \
+                 open(ruta_rechazos, "w", encoding="utf-8", newline="") as salida:
+                rechazos = csv.writer(salida)
+                rechazos.writerow(["fila", "dni", "nombre", "motivo"])
+                
+                # Filas numeradas: en CSV la fila 1 es el encabezado, en JSON es la posicion en la lista
+                if extension == ".csv":
+                    filas = enumerate(csv.DictReader(entrada), start=2)
+                else:
+                    lista = json.load(entrada)
+                    if not isinstance(lista, list):
+                        return {"exito": False, "mensaje": "El archivo JSON debe contener una lista de registros", "datos": None}
+                    filas = enumerate(lista, start=1)
+                
+                # Validar las filas por bloques (en paralelo salvo que se pida un solo proceso)
+                validos = []
+                cantidad_rechazados = 0
+                for numero, registros, error, fila in self._validar_filas(filas, procesos, tamano_bloque):
+                    if error is not None:
+                        rechazos.writerow([numero, fila.get("dni", ""), fila.get("nombre", ""), error])
+                        cantidad_rechazados += 1
+                    else:
+                        validos.append((numero, registros))
+                
+                # Leer cada archivo una sola vez: DNIs registrados y bloques de IDs libres
+                dnis = {registro.get("dni") for registro in transaccion.leer(self.persistencia, "id_personal")}
+                siguiente_id = transaccion.generar_id(self.persistencia, "id_personal")
+                siguiente_id_contrato = transaccion.generar_id(self.persistencia_contratos, "id_contrato")
+                
+                ids = []
+                for numero, (personal, contrato) in validos:
+                    if personal["dni"] in dnis:
+                        rechazos.writerow([numero, personal["dni"], personal["nombre"], "El DNI ya existe"])
+                        cantidad_rechazados += 1
+                        continue
+                    
+                    dnis.add(personal["dni"])
+                    personal["id_personal"] = contrato["id_personal"] = siguiente_id
+                    contrato["id_contrato"] = siguiente_id_contrato
+                    siguiente_id += 1
+                    siguiente_id_contrato += 1
+                    
+                    transaccion.agregar(self.persistencia, personal, "id_personal")
+                    transaccion.agregar(self.persistencia_contratos, contrato, "id_contrato")
+                    self.departamentos.preparar_membresia(transaccion, personal["id_personal"], agregar=personal["departamentos"])
+                    ids.append(personal["id_personal"])
+            
+            # Una escritura por archivo para todo el lote (si falla, confirmar() restaura lo escrito)
+            if ids:
+                transaccion.confirmar()
+                transaccion.terminar()
+            
+            return {
+                "exito": bool(ids),
+                "mensaje": f"Personal importado: {len(ids)} | Filas rechazadas: {cantidad_rechazados}",
+                "datos": {
+                    "importados": len(ids),
+                    "rechazados": cantidad_rechazados,
+                    "ids": ids,
+                    "ruta_rechazos": ruta_rechazos
+                }
+            }
+        
+        except DNIDuplicadoException as e:
+            return {"exito": False, "mensaje": f"Importacion cancelada, el archivo de personal cambio durante la importacion: {str(e)}", "datos": None}
+        except Exception as e:
+            return {"exito": False, "mensaje": f"Error al importar personal: {str(e)}", "datos": None}
+
+    # ===== CONTRATOS =====
+    def contratos_por_vencer(self, dias: int = 60) -> dict:
+        """
+        Lista los contratos temporales activos que vencen en los proximos dias
+        
+        Solo se recorren los contratos del rango (indice por fecha fin), con el
+        mismo criterio que Contrato.esta_por_vencer: desde hoy hasta hoy + dias.
+        
+        Args:
+            dias (int): Dias de alerta antes de la fecha fin
+        
+        Returns:
+            dict: {"exito": bool, "mensaje": str, "datos": list[dict]}
+                  Cada contrato incluye "nombre" del empleado y "dias_restantes"
+        """
+        
+        # Validar dias
+        if not isinstance(dias, int) or dias < 0:
+            return {"exito": False, "mensaje": "Formato de dias invalido. Debe ser un numero entero positivo", "datos": []}
+        
+        hoy = date.today()
+        
+        try:
+            contratos = self.indice_vencimientos.entre((hoy.isoformat(),), ((hoy + timedelta(days=dias)).isoformat(),))
+            
+            # Completar con el nombre del empleado y los dias que le quedan
+            for contrato in contratos:
+                empleado = self.indice_personal.obtener(contrato["id_personal"])
+                contrato["nombre"] = empleado["nombre"] if empleado else None
+                contrato["dias_restantes"] = (date.fromisoformat(contrato["fecha_fin"]) - hoy).days
+            
+            if not contratos:
+                return {"exito": True, "mensaje": f"No hay contratos que venzan en los proximos {dias} dias", "datos": []}
+            
+            return {"exito": True, "mensaje": f"{len(contratos)} contratos vencen en los proximos {dias} dias", "datos": contratos}
+        
+        except Exception as e:
+            return {"exito": False, "mensaje": f"Error al acceder a los datos: {str(e)}", "datos": []}
+
+    def vencer_contratos(self) -> dict:
+        """
+        Marca como 'Vencido' los contratos temporales activos cuya fecha fin ya llego
+        
+        Solo se recorren los contratos vencidos (indice por fecha fin) y se
+        guardan todos en una sola escritura.
+        
+        Returns:
+            dict: {"exito": bool, "mensaje": str, "datos": list[int]}
+        """
+        
+        # Contratos con fecha fin hasta hoy (inclusive), igual que Contrato.actualizar_estado
+        manana = date.today() + timedelta(days=1)
+        
+        try:
+            vencidos = self.indice_vencimientos.anteriores((manana.isoformat(),))
+        except Exception as e:
+            return {"exito": False, "mensaje": f"Error al buscar contratos vencidos: {str(e)}", "datos": []}
+        
+        if not vencidos:
+            return {"exito": True, "mensaje": "No hay contratos vencidos por cerrar", "datos": []}
+        
+        # Transicion en memoria
+        cambios = {}
+        for data in vencidos:
+            try:
+                obj_contrato = Contrato.from_dict(data)
+                obj_contrato.actualizar_estado()
+                if obj_contrato.estado == "Vencido":
+                    cambios[obj_contrato.id_contrato] = {"estado": obj_contrato.estado}
+            except ValueError as e:
+                print(f"Contrato {data.get('id_contrato')} ignorado: {e}")
+                continue
+        
+        # Una sola escritura para todo el lote
+        try:
+            actualizados = self.persistencia_contratos.actualizar_varios(cambios, "id_contrato")
+        except Exception as e:
+            return {"exito": False, "mensaje": f"Error al guardar los contratos vencidos: {str(e)}", "datos": []}
+        
+        return {"exito": True, "mensaje": f"{actualizados} contratos marcados como 'Vencido'", "datos": list(cambios)}
+
+    def contrato_en_fecha(self, id_personal: int, fecha: date) -> dict:
+        """
+        Contrato (y salario) que tenia un empleado en una fecha
+        
+        Si dos contratos se tocan ese dia (uno termina y otro empieza) se
+        devuelve el que empezo ultimo.
+        
+        Args:
+            id_personal (int): ID del personal
+            fecha (date): Fecha a consultar
+        
+        Returns:
+            dict: {"exito": bool, "mensaje": str, "datos": dict | None}
+        """
+        if not isinstance(fecha, date):
+            return {"exito": False, "mensaje": "Formato de fecha invalido. Debe ser un tipo de dato (fecha)", "datos": None}
+        
+        try:
+            contratos = self.indice_vigencias.vigentes(fecha, campo="id_personal", valor=id_personal)
+        except Exception as e:
+            return {"exito": False, "mensaje": f"Error al acceder a los datos: {str(e)}", "datos": None}
+        
+        if not contratos:
+            return {"exito": False, "mensaje": f"El personal {id_personal} no tenia contrato el {Helpers.formatear_fecha(fecha)}", "datos": None}
+        
+        return {"exito": True, "mensaje": "Contrato encontrado", "datos": contratos[-1]}
+
+    def contratos_en_periodo(self, desde: date, hasta: date, tipo: str | None = None) -> dict:
+        """
+        Contratos vigentes en algun dia de un periodo (ej: un trimestre)
+        
+        Args:
+            desde (date): Inicio del periodo
+            hasta (date): Fin del periodo (inclusive)
+            tipo (str | None): Solo contratos de este tipo (Temporal, Indefinido, Por honorarios)
+        
+        Returns:
+            dict: {"exito": bool, "mensaje": str, "datos": list[dict]}
+                  Cada contrato incluye "nombre" del empleado
+        """
+        if not isinstance(desde, date) or not isinstance(hasta, date):
+            return {"exito": False, "mensaje": "Formato de fecha invalido. Debe ser un tipo de dato (fecha)", "datos": []}
+        
+        if hasta < desde:
+            return {"exito": False, "mensaje": "La fecha fin del periodo no puede ser anterior a la de inicio", "datos": []}
+        
+        try:
+            if tipo is None:
+                contratos = self.indice_vigencias.solapados(desde, hasta)
+            else:
+                contratos = self.indice_vigencias.solapados(desde, hasta, campo="tipo", valor=tipo)
+            
+            for contrato in contratos:
+                empleado = self.indice_personal.obtener(contrato["id_personal"])
+                contrato["nombre"] = empleado["nombre"] if empleado else None
+            
+            empleados = len({contrato["id_personal"] for contrato in contratos})
+            return {"exito": True, "mensaje": f"{len(contratos)} contratos de {empleados} empleados en el periodo", "datos": contratos}
+        
+        except Exception as e:
+            return {"exito": False, "mensaje": f"Error al acceder a los datos: {str(e)}", "datos": []}
+
+    # ===== PLANILLA =====
+    def calcular_planilla(self, anio: int, mes: int) -> dict:
+        """
+        Calcula la planilla de un mes para todo el personal
+        
+        Incluye a quienes trabajaron al menos un dia del mes (los ingresos y
+        bajas a mitad de mes se prorratean). Ver src/utils/nomina.py.
+        
+        Args:
+            anio (int): Año de la planilla
+            mes (int): Mes de la planilla (1 - 12)
+        
+        Returns:
+            dict: {"exito": bool, "mensaje": str, "datos": dict}
+                  datos = {"periodo", "libro", "por_departamento", "por_rol", "total"}
+        """
+        try:
+            planilla = Planilla(anio, mes, self.persistencia.iterar(), self.persistencia_contratos.iterar())
+        except ValidationException as e:
+            return {"exito": False, "mensaje": str(e), "datos": {}}
+        except Exception as e:
+            return {"exito": False, "mensaje": f"Error al calcular la planilla: {str(e)}", "datos": {}}
+        
+        datos = {
+            "periodo": f"{anio}-{mes:02d}",
+            "libro": planilla.libro(),
+            "por_departamento": planilla.totales_por_departamento(),
+            "por_rol": planilla.totales_por_rol(),
+            "total": planilla.total()
+        }
+        
+        return {"exito": True, "mensaje": f"Planilla {datos['periodo']}: {len(datos['libro'])} empleados", "datos": datos}
+
+    # ===== ROL DE TURNOS =====
+    def generar_rol_turnos(
+        self,
+        anio: int,
+        mes: int,
+        cobertura: Dict[str, int],
+        departamentos: List[int] | None = None
+    ) -> dict:
+        """
+        Genera el rol de turnos de un mes respetando jornadas, turnos y descansos
+        
+        Ver las reglas en src/utils/turnos.py.
+        
+        Args:
+            anio (int): Año del rol
+            mes (int): Mes del rol (1 - 12)
+            cobertura (Dict[str, int]): Personas por turno y departamento cada dia (ej: {"Manana": 2, "Noche": 1})
+            departamentos (List[int] | None): Departamentos a cubrir (None = todos los que tienen personal activo)
+        
+        Returns:
+            dict: {"exito": bool, "mensaje": str, "datos": dict}
+                  datos = {"periodo", "asignaciones", "faltantes", "resumen"}
+        """
+        if departamentos is not None and any(id_departamento not in DEPARTAMENTOS for id_departamento in departamentos):
+            return {"exito": False, "mensaje": "Departamento invalido", "datos": {}}
+        
+        try:
+            rol = RolTurnos(anio, mes, self.persistencia.iterar(), cobertura, departamentos)
+        except ValidationException as e:
+            return {"exito": False, "mensaje": str(e), "datos": {}}
+        except Exception as e:
+            return {"exito": False, "mensaje": f"Error al generar el rol de turnos: {str(e)}", "datos": {}}
+        
+        datos = {
+            "periodo": f"{anio}-{mes:02d}",
+            "asignaciones": rol.asignaciones(),
+            "faltantes": rol.faltantes(),
+            "resumen": rol.resumen()
+        }
+        
+        mensaje = f"Rol {datos['periodo']}: {len(datos['asignaciones'])} turnos asignados"
+        if datos["faltantes"]:
+            mensaje += f" | {sum(hueco['faltan'] for hueco in datos['faltantes'])} lugares sin cubrir"
+        
+        return {"exito": True, "mensaje": mensaje, "datos": datos}
+
+    # ===== HORARIOS =====
+    def registrar_excepcion_horario(
+        self,
+        id_personal: int,
+        fecha: date,
+        tipo: str,
+        hora_inicio: time | None = None,
+        hora_fin: time | None = None,
+        motivo: str = ""
+    ) -> dict:
+        """
+        Registra una ausencia (licencia, permiso) o un horario extra de un empleado en una fecha
+        
+        La agenda de citas lo toma en cuenta de inmediato (DisponibilidadPersonal).
+        Las citas ya agendadas en ese horario no se cancelan.
+        
+        Args:
+            id_personal (int): ID del personal
+            fecha (date): Dia al que aplica
+            tipo (str): Ausencia u Horario extra
+            hora_inicio (time | None): Inicio del rango (None = todo el dia, solo Ausencia)
+            hora_fin (time | None): Fin del rango (None = todo el dia, solo Ausencia)
+            motivo (str): Motivo de la excepcion
+        
+        Returns:
+            dict: {"exito": bool, "mensaje": str, "id": int | None}
+        """
+        
+        # Validar ID
+        if not isinstance(id_personal, int) or id_personal <= 0:
+            return {"exito": False, "mensaje": "Formato de ID invalido", "id": None}
+        
+        # Verificar que el personal exista y este activo
+        empleado = self.indice_personal.obtener(id_personal)
+        if empleado is None:
+            return {"exito": False, "mensaje": f"No se encontro un personal con el ID: {id_personal}", "id": None}
+        
+        if empleado["estado"] != "Activo":
+            return {"exito": False, "mensaje": f"El personal {id_personal} no se encuentra activo", "id": None}
+        
+        # Crear instancia y guardar
+        try:
+            id_excepcion = self.persistencia_excepciones.generar_id_autoincremental("id_excepcion")
+            excepcion = ExcepcionHorario(id_excepcion, id_personal, fecha, tipo, hora_inicio, hora_fin, motivo)
+            
+            if not self.persistencia_excepciones.agregar(excepcion.to_dict()):
+                return {"exito": False, "mensaje": "No se pudo registrar la excepcion de horario", "id": None}
+            
+            rango = "todo el dia" if excepcion.es_dia_completo() else f"{excepcion.hora_inicio.strftime('%H:%M')} - {excepcion.hora_fin.strftime('%H:%M')}"
+            return {"exito": True, "mensaje": f"Excepcion de horario registrada ({excepcion.tipo}) para {empleado['nombre']} el {Helpers.formatear_fecha(fecha)} ({rango})", "id": id_excepcion}
+        except ValidationException as e:
+            return {"exito": False, "mensaje": f"Error: {str(e)}", "id": None}
+        except Exception as e:
+            return {"exito": False, "mensaje": f"{str(e)}", "id": None}
+
+    def eliminar_excepcion_horario(self, id_excepcion: int) -> dict:
+        """
+        Elimina una ausencia u horario extra (el empleado vuelve a su horario normal ese dia)
+        
+        Args:
+            id_excepcion (int): ID de la excepcion
+        
+        Returns:
+            dict: {"exito": bool, "mensaje": str, "id": int | None}
+        """
+        if not isinstance(id_excepcion, int) or id_excepcion <= 0:
+            return {"exito": False, "mensaje": "Formato de ID invalido", "id": None}
+        
+        try:
+            if not self.persistencia_excepciones.eliminar(id_excepcion, "id_excepcion"):
+                return {"exito": False, "mensaje": f"No se encontro una excepcion de horario con el ID: {id_excepcion}", "id": None}
+        except Exception as e:
+            return {"exito": False, "mensaje": f"{str(e)}", "id": None}
+        
+        return {"exito": True, "mensaje": f"Excepcion de horario {id_excepcion} eliminada", "id": id_excepcion}
+
+    def listar_excepciones_horario(self, id_personal: int, desde: date | None = None) -> dict:
+        """
+        Lista las ausencias y horarios extra de un empleado
+        
+        Args:
+            id_personal (int): ID del personal
+            desde (date | None): Solo las de esta fecha en adelante (None = todas)
+        
+        Returns:
+            dict: {"exito": bool, "mensaje": str, "datos": list[dict]}
+        """
+        if not isinstance(id_personal, int) or id_personal <= 0:
+            return {"exito": False, "mensaje": "Formato de ID invalido", "datos": []}
+        
+        try:
+            excepciones = self.persistencia_excepciones.buscar({"id_personal": id_personal})
+        except Exception as e:
+            return {"exito": False, "mensaje": f"Error al acceder a los datos: {str(e)}", "datos": []}
+        
+        if desde is not None:
+            excepciones = [excepcion for excepcion in excepciones if excepcion["fecha"] >= desde.isoformat()]
+        
+        excepciones.sort(key=lambda excepcion: (excepcion["fecha"], excepcion.get("hora_inicio") or ""))
+        
+        if not excepciones:
+            return {"exito": False, "mensaje": f"El personal {id_personal} no tiene excepciones de horario", "datos": []}
+        
+        return {"exito": True, "mensaje": f"{len(excepciones)} excepciones de horario", "datos": excepciones}
+
     # ===== METODOS PRIVADOS =====
 
+    @staticmethod
+    def _validar_filas(filas: Iterable[Tuple[int, Dict]], procesos: int | None, tamano_bloque: int) -> Iterator[Tuple]:
+        """
+        Valida las filas de una importacion por bloques, manteniendo el orden del archivo
+        
+        Solo se mantienen en memoria unos pocos bloques pendientes a la vez.
+        
+        Yields:
+            Tuple: (numero de fila, (personal, contrato) | None, error | None, fila original)
+        """
+        def bloques():
+            bloque = []
+            for numero, fila in filas:
+                bloque.append((numero, fila))
+                if len(bloque) == tamano_bloque:
+                    yield bloque
+                    bloque = []
+            if bloque:
+                yield bloque
+        
+        # Sin paralelo
+        if procesos == 1:
+            for bloque in bloques():
+                yield from _validar_filas_personal(bloque)
+            return
+        
+        procesos = procesos or os.cpu_count() or 1
+        with ProcessPoolExecutor(max_workers=procesos) as ejecutor:
+            pendientes = []
+            for bloque in bloques():
+                pendientes.append(ejecutor.submit(_validar_filas_personal, bloque))
+                
+                # Limitar los bloques en vuelo para no cargar todo el archivo
+                if len(pendientes) >= procesos * 2:
+                    yield from pendientes.pop(0).result()
+            
+            for pendiente in pendientes:
+                yield from pendiente.result()
+
     def _dni_existe(self, dni: str) -> bool:
         """
         Evalua si un DNI esta registrado en el sistema
@@ -529,11 +1204,7 @@ class PersonalController:
         Returns:
             bool: True si esta registrado | False si no lo esta
         """
-        # Traer registros
-        registros = self.persistencia.leer_todos()
-        
-        # Devuelve True si al menos uno cumple la condicion
-        return any(personal.get("dni") == dni for personal in registros)    
+        return self.indice_dni.existe(dni)
 
     def _generar_id(self) -> int:
         """
@@ -563,4 +1234,93 @@ class PersonalController:
             estado="Activo"
         )
         
-        return contrato
\ No newline at end of file
+        return contrato
+
+
+def _validar_filas_personal(filas: List[Tuple[int, Dict]]) -> List[Tuple[int, Tuple[Dict, Dict] | None, str | None, Dict]]:
+    """
+    Valida filas de una importacion de personal (se ejecuta en los procesos de importacion)
+    
+    Los IDs se asignan despues, por eso se construyen Personal y Contrato con IDs provisionales.
+    Las filas de CSV traen todo como texto; las de JSON pueden traer listas y numeros.
+    
+    Args:
+        filas (List[Tuple]): (numero de fila, fila del CSV u objeto del JSON)
+    
+    Returns:
+        List[Tuple]: (numero de fila, (personal, contrato) | None, error | None, fila original)
+    """
+    def texto(valor) -> str | None:
+        valor = "" if valor is None else str(valor).strip()
+        return valor or None
+    
+    def fecha(valor) -> date | None:
+        valor = texto(valor)
+        if valor is None:
+            return None
+        try:
+            return Helpers.parsear_fecha(valor)
+        except ValueError:
+            pass
+        try:
+            return date.fromisoformat(valor)
+        except ValueError:
+            raise ValueError(f"Fecha invalida: '{valor}'. Use DD/MM/AAAA")
+    
+    def departamentos(valor) -> List[int]:
+        if isinstance(valor, list):
+            ids = valor
+        else:
+            try:
+                ids = [int(parte) for parte in re.split(r"[;|\s]+", texto(valor) or "") if parte]
+            except ValueError:
+                raise ValueError(f"Departamentos invalidos: '{valor}'. Use IDs separados por ';'")
+        
+        # Igual que Personal.asignar_departamento: un departamento no se asigna dos veces
+        repetidos = sorted({d for d in ids if ids.count(d) > 1}, key=str)
+        if repetidos:
+            raise ValueError(f"Departamentos repetidos: {', '.join(map(str, repetidos))}")
+        return ids
+    
+    resultados = []
+    for numero, fila in filas:
+        try:
+            if not isinstance(fila, dict):
+                raise ValueError("El registro debe ser un objeto con los datos del personal")
+            
+            rol = texto(fila.get("rol")) or ""
+            salario = texto(fila.get("salario_base"))
+            salario_base = float(salario) if salario is not None else SALARIOS_BASE.get(rol.capitalize(), 0.0)
+            fecha_contratacion = fecha(fila.get("fecha_contratacion"))
+            
+            personal = Personal(
+                dni=texto(fila.get("dni")) or "",
+                nombre=texto(fila.get("nombre")) or "",
+                fecha_nacimiento=fecha(fila.get("fecha_nacimiento")),
+                telefono=texto(fila.get("telefono")) or "",
+                id_personal=1,
+                rol=rol,
+                especialidad=texto(fila.get("especialidad")),
+                departamentos=departamentos(fila.get("departamentos")),
+                jornada=texto(fila.get("jornada")) or "",
+                turno=texto(fila.get("turno")),
+                salario_base=salario_base,
+                estado="Activo",
+                fecha_contratacion=fecha_contratacion,
+                fecha_baja=None,
+                motivo_baja=None
+            )
+            contrato = Contrato(
+                id_contrato=1,
+                id_personal=1,
+                tipo=texto(fila.get("tipo_contrato")) or "",
+                fecha_inicio=fecha_contratacion,
+                fecha_fin=fecha(fila.get("fecha_fin")),
+                salario_base=salario_base,
+                estado="Activo"
+            )
+            resultados.append((numero, (personal.to_dict(), contrato.to_dict()), None, fila))
+        except Exception as e:
+            resultados.append((numero, None, str(e), fila if isinstance(fila, dict) else {}))
+    
+    return resultados
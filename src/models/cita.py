@@ -113,6 +113,10 @@ class Cita:
     def hora(self) -> time:
         return self._hora
 
+    @property
+    def especialidad(self) -> str:
+        return self._especialidad
+
     @property
     def motivo(self) -> str:
         return self._motivo
@@ -216,6 +220,36 @@ class Cita:
         # Completar
         self._estado = "Completada"
     
+    def marcar_no_asistio(self, momento: datetime | None = None) -> None:
+        """
+        Marca como 'No asistio' una cita Agendada cuya fecha y hora ya pasaron
+        
+        Args:
+            momento (datetime | None): Momento de referencia (por defecto ahora)
+        
+        Raises:
+            EstadoInvalidoException: Estado diferente de Agendada o la cita aun no pasa
+        """
+        momento = momento or datetime.now()
+        
+        # Validaciones
+        if self.estado != "Agendada":
+            raise EstadoInvalidoException(f"No se puede marcar la inasistencia. El estado actual de la cita es '{self.estado}'")
+        
+        if datetime.combine(self.fecha, self.hora) >= momento:
+            raise EstadoInvalidoException("No se puede marcar la inasistencia de una cita que aun no pasa")
+        
+        # Registrar el cambio (sin empleado: lo hace el sistema)
+        cambio = {
+            "fecha_operacion": momento.isoformat(),
+            "id_empleado": None,
+            "registro_antiguo": {"estado": self.estado},
+            "registro_nuevo": {"estado": "No asistio"}
+        }
+        
+        self._estado = "No asistio"
+        self._historial_cambios.append(cambio)
+    
     def puede_ser_reprogramada(self) -> bool:
         """
         Verifica si una cita se puede reprogramar
@@ -246,7 +280,7 @@ class Cita:
             "motivo": self._motivo,
             "estado": self._estado,
             "fecha_creacion": self._fecha_creacion.isoformat(),
-            "historial_cambios": self._historial_cambios if self._historial_cambios else []
+            "historial_cambios": list(self._historial_cambios)
         }
     
     @classmethod
@@ -279,7 +313,7 @@ class Cita:
             
             cita._estado = data["estado"]
             cita._fecha_creacion = datetime.fromisoformat(data["fecha_creacion"])
-            cita._historial_cambios = data["historial_cambios"]
+            cita._historial_cambios = list(data["historial_cambios"])
             
             return cita
             
@@ -2,12 +2,12 @@
 Representa un departamento del hospital
 
 """
-from typing import List, Dict, Any
-from utils.excepciones import ValidationException, EstadoInvalidoException
-from utils.validaciones import Validaciones
+from typing import Iterable, List, Dict, Any
+from src.utils.excepciones import ValidationException, EstadoInvalidoException
+from src.utils.validaciones import Validaciones
 
 class Departamento:
-    def __init__(self, id_departamento: int, nombre: str, descripcion: str | None, id_jefe: int, personal_asignado: List[int]):
+    def __init__(self, id_departamento: int, nombre: str, descripcion: str | None, id_jefe: int, personal_asignado: Iterable[int]):
         """
         Construtor de Departamento
         
@@ -16,7 +16,7 @@ class Departamento:
             nombre (str): Nombre del departamento
             descripcion (str | None): (Opcional) Descripcion del departamento
             id_jefe (int): ID del personal asignado como jefe de departamento
-            personal_asignado (List[int]): Lista con los IDs del personal asignado al departamento
+            personal_asignado (Iterable[int]): IDs del personal asignado al departamento (lista o conjunto)
             
         Raises:
             ValidationException: Formato o estado de datos incorrectos
@@ -42,7 +42,7 @@ class Departamento:
             raise ValidationException(f"Error de formato del ID del jefe de departamento {id_jefe}. Debe ser un numero entero positivo")
         
         # Personal asignado
-        if not isinstance(personal_asignado, list) or len(personal_asignado) == 0:
+        if not isinstance(personal_asignado, (list, set, frozenset)) or len(personal_asignado) == 0:
             raise ValidationException(f"Error de formato de personal asignado. Debe ser una lista con (al menos) un personal asignado.")
         
         if not all(isinstance(personal, int) and personal > 0 for personal in personal_asignado):
@@ -58,7 +58,8 @@ class Departamento:
         self._nombre = nombre.strip().capitalize()
         self._descripcion = descripcion.strip().capitalize() if descripcion else None
         self._id_jefe = id_jefe
-        self._personal_asignado = personal_asignado.copy()
+        # Conjunto: consultar si un personal pertenece al departamento no recorre la lista
+        self._personal_asignado = set(personal_asignado)
 
 
     # ========== Getters ==========
@@ -81,7 +82,7 @@ class Departamento:
     
     @property
     def personal_asignado(self) -> List[int]:
-        return self._personal_asignado.copy()
+        return sorted(self._personal_asignado)
     
     # ========== Metodos ==========
     
@@ -141,7 +142,7 @@ class Departamento:
             raise EstadoInvalidoException(f"Error: El personal con ID {id_personal} ya se encuentra registrado en el departamento {self._nombre}")
         
         # ========== Agregar ==========
-        self._personal_asignado.append(id_personal)
+        self._personal_asignado.add(id_personal)
 
     def remover_personal(self, id_personal: int) -> None:
         """
@@ -186,6 +187,11 @@ class Departamento:
         
         return len(self._personal_asignado)
 
+    def tiene_personal(self, id_personal: int) -> bool:
+        """Indica si el personal esta asignado al departamento"""
+        
+        return id_personal in self._personal_asignado
+
     def to_dict(self) -> Dict[str, Any]:
         """
         Convierte un objeto Departamento a un diccionario para serializacion JSON
@@ -199,7 +205,7 @@ class Departamento:
             "nombre": self._nombre,
             "descripcion": self._descripcion,
             "id_jefe": self._id_jefe,
-            "personal_asignado": self._personal_asignado.copy()
+            "personal_asignado": sorted(self._personal_asignado)
         }
     
     @classmethod
@@ -0,0 +1,171 @@
+"""
+Representa un cambio en el horario de un miembro del personal para una fecha
+(ausencia, licencia o permiso, o bien horas extra de atencion)
+
+"""
+from datetime import date, time
+from src.utils.excepciones import ValidationException
+from src.config.constantes import TIPOS_EXCEPCION_HORARIO, HORA_APERTURA, HORA_CIERRE, MINUTOS_POR_BLOQUE
+from typing import Dict, Any
+
+class ExcepcionHorario:
+
+    def __init__(
+            self,
+            id_excepcion: int,
+            id_personal: int,
+            fecha: date,
+            tipo: str,
+            hora_inicio: time | None = None,
+            hora_fin: time | None = None,
+            motivo: str = ""
+    ):
+
+        """
+        Constructor de la clase ExcepcionHorario
+
+        Args:
+            id_excepcion (int): ID unico de la excepcion, auto-incremental
+            id_personal (int): ID del personal al que aplica (FK)
+            fecha (date): Dia al que aplica
+            tipo (str): Ausencia (quita horas) u Horario extra (agrega horas)
+            hora_inicio (time | None): Inicio del rango (None = todo el dia, solo Ausencia)
+            hora_fin (time | None): Fin del rango, no incluido (None = todo el dia, solo Ausencia)
+            motivo (str): Motivo de la excepcion (ej: Licencia, Capacitacion)
+
+        Raises:
+            ValidationException: Formato o estado de los datos incorrectos
+        """
+
+        # ========== Validaciones antes de asignacion ==========
+
+        # IDs
+        if not isinstance(id_excepcion, int) or id_excepcion <= 0:
+            raise ValidationException("Formato de ID de excepcion invalido. Debe ser un numero entero positivo")
+
+        if not isinstance(id_personal, int) or id_personal <= 0:
+            raise ValidationException("Formato de ID de personal invalido. Debe ser un numero entero positivo")
+
+        # Fecha
+        if not isinstance(fecha, date):
+            raise ValidationException("Formato de fecha invalido. Debe ser un tipo de dato (fecha)")
+
+        # Tipo
+        if not isinstance(tipo, str) or tipo.strip().capitalize() not in TIPOS_EXCEPCION_HORARIO:
+            raise ValidationException("Tipo de excepcion invalido. Debe ser: Ausencia u Horario extra")
+
+        tipo = tipo.strip().capitalize()
+
+        # Rango de horas (ambas o ninguna)
+        if (hora_inicio is None) != (hora_fin is None):
+            raise ValidationException("Debe indicar la hora de inicio y la hora de fin, o ninguna para todo el dia")
+
+        if hora_inicio is None:
+            if tipo == "Horario extra":
+                raise ValidationException("El horario extra debe indicar la hora de inicio y la hora de fin")
+        else:
+            if not isinstance(hora_inicio, time) or not isinstance(hora_fin, time):
+                raise ValidationException("Formato de hora invalido. Debe ser de tipo hora/time")
+
+            if hora_fin <= hora_inicio:
+                raise ValidationException("La hora de fin debe ser mayor a la hora de inicio")
+
+            if hora_inicio < time(HORA_APERTURA, 0) or hora_fin > time(HORA_CIERRE, 0):
+                raise ValidationException(f"El rango debe estar entre las {HORA_APERTURA}:00 y las {HORA_CIERRE}:00")
+
+            if hora_inicio.minute % MINUTOS_POR_BLOQUE or hora_fin.minute % MINUTOS_POR_BLOQUE:
+                raise ValidationException(f"Las horas deben ser multiplos de {MINUTOS_POR_BLOQUE} minutos")
+
+        # Motivo
+        if not isinstance(motivo, str):
+            raise ValidationException("Formato de motivo invalido. Debe ser texto")
+
+        # ========== Asignacion ==========
+
+        self._id_excepcion = id_excepcion
+        self._id_personal = id_personal
+        self._fecha = fecha
+        self._tipo = tipo
+        self._hora_inicio = hora_inicio
+        self._hora_fin = hora_fin
+        self._motivo = motivo.strip()
+
+    # ========== Getters ==========
+    @property
+    def id_excepcion(self) -> int:
+        return self._id_excepcion
+
+    @property
+    def id_personal(self) -> int:
+        return self._id_personal
+
+    @property
+    def fecha(self) -> date:
+        return self._fecha
+
+    @property
+    def tipo(self) -> str:
+        return self._tipo
+
+    @property
+    def hora_inicio(self) -> time | None:
+        return self._hora_inicio
+
+    @property
+    def hora_fin(self) -> time | None:
+        return self._hora_fin
+
+    @property
+    def motivo(self) -> str:
+        return self._motivo
+
+    # ========== Metodos ==========
+    def es_dia_completo(self) -> bool:
+        """Indica si la excepcion cubre todo el dia"""
+        return self._hora_inicio is None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Convierte el objeto excepcion en un diccionario para serializacion JSON
+
+        Returns:
+            dict: Representacion del objeto en un diccionario
+        """
+        return {
+            "id_excepcion": self._id_excepcion,
+            "id_personal": self._id_personal,
+            "fecha": self._fecha.isoformat(),
+            "tipo": self._tipo,
+            "hora_inicio": self._hora_inicio.isoformat() if self._hora_inicio else None,
+            "hora_fin": self._hora_fin.isoformat() if self._hora_fin else None,
+            "motivo": self._motivo
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'ExcepcionHorario':
+        """
+        Crea un objeto ExcepcionHorario desde un archivo JSON (deserializacion)
+
+        Args:
+            data (dict): Diccionario con los datos de la excepcion
+
+        Returns:
+            ExcepcionHorario: Objeto ExcepcionHorario reconstruido
+
+        Raises:
+            ValueError: Si faltan datos requeridos o son invalidos
+        """
+        try:
+            return cls(
+                id_excepcion=data["id_excepcion"],
+                id_personal=data["id_personal"],
+                fecha=date.fromisoformat(data["fecha"]),
+                tipo=data["tipo"],
+                hora_inicio=time.fromisoformat(data["hora_inicio"]) if data.get("hora_inicio") else None,
+                hora_fin=time.fromisoformat(data["hora_fin"]) if data.get("hora_fin") else None,
+                motivo=data.get("motivo", "")
+            )
+        except KeyError as e:
+            raise ValueError(f"Falta el campo requerido: {e}")
+        except Exception as e:
+            raise ValueError(f"Error al deserializar ExcepcionHorario: {e}")
@@ -0,0 +1,288 @@
+"""
+Representa la solicitud de un paciente en la lista de espera de citas
+"""
+from datetime import date, time, datetime, timedelta
+from src.utils.excepciones import ValidationException, EstadoInvalidoException
+from src.config.constantes import ESPECIALIDADES, PRIORIDADES_ESPERA, MAX_DIAS_VENTANA_ESPERA, HORAS_RESPUESTA_OFERTA
+from typing import Dict, Any
+
+class SolicitudEspera:
+    def __init__(
+        self,
+        id_solicitud: int,
+        id_paciente: int, # FK a Paciente
+        especialidad: str,
+        fecha_desde: date,
+        fecha_hasta: date,
+        prioridad: int = 2,
+        id_doctor: int | None = None, # FK a Doctor (opcional)
+        validar_fecha_futura: bool = True
+        ) -> None:
+
+        """
+        Constructor de la clase SolicitudEspera
+
+        Args:
+            id_solicitud (int): ID unico de la solicitud, auto-incremental
+            id_paciente (int): ID del paciente en espera
+            especialidad (str): Especialidad requerida
+            fecha_desde (date): Primer dia que el paciente acepta
+            fecha_hasta (date): Ultimo dia que el paciente acepta
+            prioridad (int): 1 (Alta), 2 (Media) o 3 (Baja)
+            id_doctor (int | None): Doctor especifico (None acepta cualquiera de la especialidad)
+
+        Raises:
+            ValidationException: Formato o estado de los datos incorrectos
+        """
+
+        # ========== VALIDACIONES ==========
+
+        # IDs
+        if not isinstance(id_solicitud, int) or id_solicitud <= 0:
+            raise ValidationException("Formato de ID de solicitud invalido. Debe ser un numero entero positivo")
+
+        if not isinstance(id_paciente, int) or id_paciente <= 0:
+            raise ValidationException("Formato de ID de paciente invalido. Debe ser un numero entero positivo")
+
+        if id_doctor is not None:
+            if not isinstance(id_doctor, int) or id_doctor <= 0:
+                raise ValidationException("Formato de ID de doctor invalido. Debe ser un numero entero positivo")
+
+        # Especialidad
+        if not especialidad or not isinstance(especialidad, str):
+            raise ValidationException("Formato de especialidad invalida. Debe ser texto y no puede estar vacio")
+
+        especialidad = especialidad.strip().title()
+        if especialidad not in ESPECIALIDADES:
+            raise ValidationException("Especialidad invalida. Debe ser Medicina General, Pediatria o Cardiologia")
+
+        # Ventana de fechas
+        if not isinstance(fecha_desde, date) or not isinstance(fecha_hasta, date):
+            raise ValidationException("Formato de fechas invalido. Deben ser de tipo fecha/date")
+
+        if fecha_hasta < fecha_desde:
+            raise ValidationException("La fecha final no puede ser anterior a la fecha inicial")
+
+        if validar_fecha_futura and fecha_hasta < date.today():
+            raise ValidationException("La ventana de fechas no puede estar en el pasado")
+
+        if (fecha_hasta - fecha_desde).days >= MAX_DIAS_VENTANA_ESPERA:
+            raise ValidationException(f"La ventana de fechas no puede superar {MAX_DIAS_VENTANA_ESPERA} dias")
+
+        # Prioridad
+        if not isinstance(prioridad, int) or prioridad not in PRIORIDADES_ESPERA:
+            raise ValidationException("Prioridad invalida. Debe ser 1 (Alta), 2 (Media) o 3 (Baja)")
+
+        # ========== ASIGNACION ==========
+        self._id_solicitud = id_solicitud
+        self._id_paciente = id_paciente
+        self._id_doctor = id_doctor
+        self._especialidad = especialidad
+        self._fecha_desde = fecha_desde
+        self._fecha_hasta = fecha_hasta
+        self._prioridad = prioridad
+        self._estado = "Pendiente"
+        self._fecha_registro = datetime.now()
+        self._oferta = None
+        self._id_cita = None
+
+    # ========== GETTERS ==========
+    @property
+    def id_solicitud(self) -> int:
+        return self._id_solicitud
+
+    @property
+    def id_paciente(self) -> int:
+        return self._id_paciente
+
+    @property
+    def id_doctor(self) -> int | None:
+        return self._id_doctor
+
+    @property
+    def especialidad(self) -> str:
+        return self._especialidad
+
+    @property
+    def fecha_desde(self) -> date:
+        return self._fecha_desde
+
+    @property
+    def fecha_hasta(self) -> date:
+        return self._fecha_hasta
+
+    @property
+    def prioridad(self) -> int:
+        return self._prioridad
+
+    @property
+    def estado(self) -> str:
+        return self._estado
+
+    @property
+    def oferta(self) -> Dict[str, Any] | None:
+        return self._oferta.copy() if self._oferta else None
+
+    @property
+    def id_cita(self) -> int | None:
+        return self._id_cita
+
+    # ========== METODOS ==========
+    def acepta(self, id_doctor: int, fecha: date) -> bool:
+        """
+        Verifica si un hueco (doctor y fecha) le sirve al paciente
+
+        Returns:
+            bool: True si el doctor y la fecha estan dentro de lo solicitado
+        """
+        if self._id_doctor is not None and self._id_doctor != id_doctor:
+            return False
+
+        return self._fecha_desde <= fecha <= self._fecha_hasta
+
+    def ofrecer(self, id_doctor: int, fecha: date, hora: time) -> None:
+        """
+        Ofrece un hueco liberado al paciente
+
+        La oferta vence a las HORAS_RESPUESTA_OFERTA horas o a la hora del
+        hueco, lo que ocurra primero.
+
+        Raises:
+            EstadoInvalidoException: La solicitud no esta Pendiente o el hueco no le sirve
+        """
+        if self._estado != "Pendiente":
+            raise EstadoInvalidoException(f"No se puede ofrecer un hueco. El estado actual de la solicitud es '{self._estado}'")
+
+        if not self.acepta(id_doctor, fecha):
+            raise EstadoInvalidoException("El hueco no coincide con el doctor o las fechas de la solicitud")
+
+        ahora = datetime.now()
+        vence = min(ahora + timedelta(hours=HORAS_RESPUESTA_OFERTA), datetime.combine(fecha, hora))
+
+        self._oferta = {
+            "id_doctor": id_doctor,
+            "fecha": fecha.isoformat(),
+            "hora": hora.isoformat(),
+            "fecha_oferta": ahora.isoformat(),
+            "vence": vence.isoformat(timespec="seconds")
+        }
+        self._estado = "Ofrecida"
+
+    def oferta_vencida(self, ahora: datetime | None = None) -> bool:
+        """
+        Indica si la oferta vigente ya paso su plazo de respuesta
+
+        Args:
+            ahora (datetime | None): Momento de referencia (None = ahora)
+
+        Returns:
+            bool: True si la solicitud esta Ofrecida y la oferta ya vencio
+        """
+        if self._estado != "Ofrecida" or not self._oferta or not self._oferta.get("vence"):
+            return False
+
+        ahora = ahora or datetime.now()
+        return datetime.fromisoformat(self._oferta["vence"]) <= ahora
+
+    def rechazar_oferta(self) -> None:
+        """
+        Devuelve la solicitud a la cola (el paciente no tomo el hueco)
+
+        Raises:
+            EstadoInvalidoException: La solicitud no tiene una oferta vigente
+        """
+        if self._estado != "Ofrecida":
+            raise EstadoInvalidoException(f"La solicitud no tiene una oferta vigente. Estado: '{self._estado}'")
+
+        self._oferta = None
+        self._estado = "Pendiente"
+
+    def asignar(self, id_cita: int) -> None:
+        """
+        Marca la solicitud como resuelta con la cita agendada
+
+        Raises:
+            ValidationException: Formato de ID invalido
+            EstadoInvalidoException: La solicitud no tiene una oferta vigente
+        """
+        if not isinstance(id_cita, int) or id_cita <= 0:
+            raise ValidationException("Formato de ID de cita invalido. Debe ser un numero entero positivo")
+
+        if self._estado != "Ofrecida":
+            raise EstadoInvalidoException(f"La solicitud no tiene una oferta vigente. Estado: '{self._estado}'")
+
+        self._id_cita = id_cita
+        self._estado = "Asignada"
+
+    def cancelar(self) -> None:
+        """
+        Retira al paciente de la lista de espera
+
+        Raises:
+            EstadoInvalidoException: La solicitud ya fue asignada o cancelada
+        """
+        if self._estado in ("Asignada", "Cancelada"):
+            raise EstadoInvalidoException(f"No se puede cancelar la solicitud. El estado actual es '{self._estado}'")
+
+        self._oferta = None
+        self._estado = "Cancelada"
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Convierte un objeto SolicitudEspera en un diccionario para serializacion JSON
+
+        Returns:
+            Dict[str, Any]: Diccionario que representa al objeto
+        """
+        return {
+            "id_solicitud": self._id_solicitud,
+            "id_paciente": self._id_paciente,
+            "id_doctor": self._id_doctor,
+            "especialidad": self._especialidad,
+            "fecha_desde": self._fecha_desde.isoformat(),
+            "fecha_hasta": self._fecha_hasta.isoformat(),
+            "prioridad": self._prioridad,
+            "estado": self._estado,
+            "fecha_registro": self._fecha_registro.isoformat(),
+            "oferta": self._oferta.copy() if self._oferta else None,
+            "vence_oferta": self._oferta.get("vence") if self._oferta else None,
+            "id_cita": self._id_cita
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'SolicitudEspera':
+        """
+        Crea un objeto SolicitudEspera desde un diccionario (deserializacion)
+
+        Args:
+            data (Dict[str, Any]): Diccionario con los datos del objeto
+
+        Returns:
+            SolicitudEspera: Objeto reconstruido
+
+        Raises:
+            ValueError: Si faltan datos o son invalidos
+        """
+        try:
+            solicitud = cls(
+                id_solicitud=data["id_solicitud"],
+                id_paciente=data["id_paciente"],
+                especialidad=data["especialidad"],
+                fecha_desde=date.fromisoformat(data["fecha_desde"]),
+                fecha_hasta=date.fromisoformat(data["fecha_hasta"]),
+                prioridad=data["prioridad"],
+                id_doctor=data.get("id_doctor"),
+                validar_fecha_futura=False
+            )
+
+            solicitud._estado = data["estado"]
+            solicitud._fecha_registro = datetime.fromisoformat(data["fecha_registro"])
+            solicitud._oferta = data.get("oferta")
+            solicitud._id_cita = data.get("id_cita")
+
+            return solicitud
+
+        except KeyError as e:
+            raise ValueError(f"Falta el campo requerido: {e}")
+        except Exception as e:
+            raise ValueError(f"Error al deserializar SolicitudEspera: {e}")
@@ -0,0 +1,77 @@
+"""
+Escritura de exportaciones en NDJSON o CSV por secciones
+
+Los registros se escriben apenas llegan, sin juntarlos en memoria.
+
+NDJSON: una linea JSON por registro -> {"tipo": "cita", "datos": {...}}
+CSV: una seccion por tipo de registro
+
+    ## citas
+    id_cita,id_paciente,...,otros
+    1,3,...,
+    (linea vacia)
+    ## consultas
+    ...
+
+En CSV las listas y diccionarios (historial_cambios, recetas) se escriben como
+JSON dentro de la celda. Las columnas de una seccion salen del primer registro;
+si un registro posterior trae campos nuevos van en la columna "otros".
+"""
+import csv
+import json
+from typing import Any, Dict, List, TextIO
+from src.config.constantes import FORMATOS_EXPORTACION
+
+class Exportador:
+
+    def __init__(self, archivo: TextIO, formato: str) -> None:
+        """
+        Args:
+            archivo (TextIO): Archivo abierto en modo texto (newline="")
+            formato (str): "ndjson" o "csv"
+
+        Raises:
+            ValueError: Si el formato no es soportado
+        """
+        if formato not in FORMATOS_EXPORTACION:
+            raise ValueError(f"Formato de exportacion invalido. Debe ser {' o '.join(FORMATOS_EXPORTACION)}")
+
+        self.archivo = archivo
+        self.formato = formato
+        self._escritor = csv.writer(archivo) if formato == "csv" else None
+        self._seccion: str | None = None
+        self._columnas: List[str] | None = None
+        self.cantidad = 0
+
+    def escribir(self, tipo: str, registro: Dict[str, Any]) -> None:
+        """
+        Escribe un registro de un tipo (paciente, cita, consulta, factura)
+
+        En CSV, si el tipo cambia se abre una nueva seccion.
+        """
+        self.cantidad += 1
+
+        if self.formato == "ndjson":
+            self.archivo.write(json.dumps({"tipo": tipo, "datos": registro}, ensure_ascii=False) + "\n")
+            return
+
+        # Nueva seccion: titulo y encabezado segun el primer registro
+        if tipo != self._seccion:
+            if self._seccion is not None:
+                self._escritor.writerow([])
+            self._seccion = tipo
+            self._columnas = list(registro.keys())
+            self._escritor.writerow([f"## {tipo}"])
+            self._escritor.writerow(self._columnas + ["otros"])
+
+        otros = {k: v for k, v in registro.items() if k not in self._columnas}
+        fila = [self._celda(registro.get(columna)) for columna in self._columnas]
+        fila.append(json.dumps(otros, ensure_ascii=False) if otros else "")
+        self._escritor.writerow(fila)
+
+    @staticmethod
+    def _celda(valor: Any) -> Any:
+        """Convierte listas y diccionarios en JSON para una celda CSV"""
+        if isinstance(valor, (list, dict)):
+            return json.dumps(valor, ensure_ascii=False)
+        return "" if valor is None else valor
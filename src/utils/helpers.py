@@ -4,6 +4,7 @@ Funciones auxiliares generales
 """
 
 import os
+import unicodedata
 from datetime import datetime, date
 from typing import List, Dict
 
@@ -161,4 +162,20 @@ class Helpers:
         
         """
         
-        return (fecha2 - fecha1).days
\ No newline at end of file
+        return (fecha2 - fecha1).days
+    
+    @staticmethod
+    def normalizar_texto(texto: str) -> str:
+        """
+        Lleva un texto a minusculas, sin tildes y con espacios simples
+        
+        Args:
+            texto: Texto a normalizar (ej: "  José  Núñez")
+            
+        Returns:
+            str: Texto normalizado (ej: "jose nunez")
+        
+        """
+        descompuesto = unicodedata.normalize("NFKD", texto or "")
+        sin_tildes = "".join(c for c in descompuesto if not unicodedata.combining(c))
+        return " ".join(sin_tildes.lower().split())
@@ -0,0 +1,1673 @@
+"""
+Indices en memoria sobre los archivos JSON
+
+Evitan leer y recorrer un archivo completo en cada consulta. Cada indice se
+construye una sola vez y luego se mantiene al dia con las notificaciones que
+envia Persistencia en cada escritura. Si el archivo cambio por otro medio
+(otra instancia del programa, edicion manual) el indice lo detecta por la
+version y se reconstruye en la siguiente consulta.
+
+"""
+import atexit
+import json
+import math
+import os
+import re
+from bisect import bisect_left, bisect_right, insort
+from datetime import date, time, timedelta
+from heapq import heapify, heappush, heappop, merge, nlargest
+from typing import List, Dict, Any, Optional, Tuple, Callable
+from src.utils.persistencia import Persistencia
+from src.utils.excepciones import ValidationException
+from src.utils.helpers import Helpers
+from src.config.constantes import HORA_APERTURA, MINUTOS_POR_BLOQUE, BLOQUES_POR_DIA
+
+class IndiceBase:
+    """
+    Clase base de los indices
+
+    Las subclases implementan como agregar, quitar y limpiar sus estructuras.
+    La base se encarga de construir, detectar versiones viejas y aplicar los
+    cambios notificados por Persistencia.
+
+    Ejemplo:
+        >>> agenda = IndiceAgrupado.compartido(persistencia, campo_grupo="fecha", ...)
+        >>> agenda.obtener("2026-01-20")
+    """
+
+    # Instancias compartidas por (clase, archivos, opciones)
+    _compartidos: Dict[tuple, 'IndiceBase'] = {}
+
+    # Valores que debe tener un registro para entrar al indice (vacio = todos)
+    filtro: Dict[str, Any] = {}
+
+    def __init__(self, *persistencias: Persistencia) -> None:
+        """
+        Inicializa el indice y lo registra en los archivos de los que depende
+
+        Args:
+            persistencias (Persistencia): Archivos que alimentan el indice
+        """
+        self._fuentes = list(persistencias)
+        self._versiones: Dict[str, tuple] = {}
+
+        for persistencia in self._fuentes:
+            persistencia.registrar_indice(self)
+
+    @classmethod
+    def compartido(cls, *persistencias: Persistencia, **opciones: Any) -> 'IndiceBase':
+        """
+        Devuelve la instancia compartida del indice para esos archivos y opciones
+
+        Todos los controladores que trabajan sobre el mismo archivo usan el
+        mismo indice, asi se construye una sola vez por proceso.
+
+        Returns:
+            IndiceBase: Indice compartido
+        """
+        clave = (
+            cls,
+            tuple(p.ruta for p in persistencias),
+            tuple(sorted((k, IndiceBase._congelar(v)) for k, v in opciones.items()))
+        )
+
+        if clave not in IndiceBase._compartidos:
+            IndiceBase._compartidos[clave] = cls(*persistencias, **opciones)
+
+        return IndiceBase._compartidos[clave]
+
+    # ========== MANTENIMIENTO ==========
+    def asegurar(self) -> None:
+        """Reconstruye el indice si algun archivo cambio sin notificarlo"""
+        for persistencia in self._fuentes:
+            if self._versiones.get(persistencia.ruta) != persistencia.version():
+                self.reconstruir()
+                return
+
+    def reconstruir(self) -> None:
+        """Construye el indice desde cero leyendo sus archivos"""
+        self._limpiar()
+
+        for persistencia in self._fuentes:
+            version = persistencia.version()
+            for registro in persistencia.leer_todos():
+                self._agregar(registro, persistencia.ruta)
+            self._versiones[persistencia.ruta] = version
+
+    def notificar(self, ruta: str, cambios: List[Tuple[Optional[Dict], Optional[Dict]]],
+                  version_antes: tuple, version_despues: tuple) -> None:
+        """
+        Aplica los cambios de una escritura (llamado por Persistencia)
+
+        Si el indice no estaba al dia antes de la escritura no se parcha,
+        queda desactualizado y se reconstruye en la siguiente consulta.
+
+        Args:
+            ruta (str): Archivo que fue escrito
+            cambios (List[Tuple]): Pares (registro anterior, registro nuevo)
+            version_antes (tuple): Version del archivo antes de escribir
+            version_despues (tuple): Version del archivo despues de escribir
+        """
+        if self._versiones.get(ruta) != version_antes:
+            return
+
+        for anterior, nuevo in cambios:
+            if anterior is not None:
+                self._quitar(anterior, ruta)
+            if nuevo is not None:
+                self._agregar(nuevo, ruta)
+
+        self._versiones[ruta] = version_despues
+
+    def validar(self, ruta: str, cambios: List[Tuple[Optional[Dict], Optional[Dict]]]) -> None:
+        """
+        Revisa los cambios antes de que se escriban (llamado por Persistencia)
+
+        Por defecto no hace nada; los indices que imponen reglas (ej: IndiceUnico)
+        lanzan una excepcion y la escritura no se realiza.
+
+        Args:
+            ruta (str): Archivo que se va a escribir
+            cambios (List[Tuple]): Pares (registro anterior, registro nuevo)
+        """
+        return None
+
+    # ========== METODOS A IMPLEMENTAR ==========
+    def _limpiar(self) -> None:
+        raise NotImplementedError
+
+    def _agregar(self, registro: Dict, ruta: str) -> None:
+        raise NotImplementedError
+
+    def _quitar(self, registro: Dict, ruta: str) -> None:
+        raise NotImplementedError
+
+    # ========== METODOS PRIVADOS ==========
+    def _cumple_filtro(self, registro: Dict) -> bool:
+        """Verifica si el registro tiene los valores del filtro del indice"""
+        return all(registro.get(campo) == valor for campo, valor in self.filtro.items())
+
+    @staticmethod
+    def _congelar(valor: Any) -> Any:
+        """Convierte listas y diccionarios en tuplas para usarlos como clave"""
+        if isinstance(valor, dict):
+            return tuple(sorted((k, IndiceBase._congelar(v)) for k, v in valor.items()))
+        if isinstance(valor, (list, tuple, set)):
+            return tuple(IndiceBase._congelar(v) for v in valor)
+        return valor
+
+class IndicePrimario(IndiceBase):
+    """
+    Acceso directo a los registros por su ID (y por campos secundarios)
+
+    Guarda una copia de cada registro en un diccionario por ID, asi traer k
+    registros cuesta O(k) sin importar el tamano del archivo. Los campos
+    secundarios guardan solo los IDs de cada valor, sin duplicar registros.
+
+    Los IDs tambien se mantienen ordenados (se arman en la primera consulta
+    por orden), asi una pagina por ID empieza con una busqueda binaria.
+
+    Ejemplo (consultas):
+        campo_id = "id_consulta", campos_secundarios = ("id_paciente",)
+        >>> indice.obtener_varios([4, 9, 12])
+        >>> indice.ids_por("id_paciente", 3)
+        >>> indice.siguientes(despues_de=40, cantidad=20)
+    """
+
+    def __init__(self, persistencia: Persistencia, campo_id: str, campos_secundarios: Tuple[str, ...] = ()) -> None:
+        """
+        Args:
+            persistencia (Persistencia): Archivo a indexar
+            campo_id (str): Campo ID de los registros
+            campos_secundarios (Tuple[str]): Campos por los que tambien se buscan IDs
+        """
+        self.campo_id = campo_id
+        self.campos_secundarios = tuple(campos_secundarios)
+        self._registros: Dict[Any, Dict] = {}
+        self._secundarios: Dict[str, Dict[Any, set]] = {}
+        self._orden: List[Any] | None = None
+        super().__init__(persistencia)
+
+    def obtener(self, id_valor: Any) -> Optional[Dict]:
+        """
+        Devuelve una copia del registro con ese ID
+
+        Returns:
+            Optional[Dict]: Registro o None si no existe
+        """
+        self.asegurar()
+        registro = self._registros.get(id_valor)
+        return dict(registro) if registro is not None else None
+
+    def obtener_varios(self, ids: List[Any]) -> List[Dict]:
+        """
+        Devuelve copias de los registros con esos IDs (se omiten los que no existen)
+
+        Returns:
+            List[Dict]: Registros en el mismo orden de los IDs
+        """
+        self.asegurar()
+        return [dict(self._registros[i]) for i in ids if i in self._registros]
+
+    def ids_por(self, campo: str, valor: Any) -> List[Any]:
+        """
+        Devuelve los IDs de los registros con ese valor en un campo secundario
+
+        Returns:
+            List[Any]: IDs (lista vacia si no hay)
+        """
+        self.asegurar()
+        return list(self._secundarios.get(campo, {}).get(valor, ()))
+
+    def siguientes(self, despues_de: Any, cantidad: int, condicion: Callable[[Dict], bool] | None = None) -> List[Dict]:
+        """
+        Devuelve copias de los primeros registros con ID mayor a despues_de, en orden de ID
+
+        Args:
+            despues_de (Any): Ultimo ID ya visto (None = desde el principio)
+            cantidad (int): Maximo de registros a devolver
+            condicion (Callable | None): Filtro opcional de los registros
+
+        Returns:
+            List[Dict]: Registros ordenados por ID
+        """
+        self.asegurar()
+        if self._orden is None:
+            self._orden = sorted(id_valor for id_valor in self._registros if id_valor is not None)
+
+        inicio = 0 if despues_de is None else bisect_right(self._orden, despues_de)
+        resultado = []
+        for posicion in range(inicio, len(self._orden)):
+            if len(resultado) >= cantidad:
+                break
+            registro = self._registros[self._orden[posicion]]
+            if condicion is None or condicion(registro):
+                resultado.append(dict(registro))
+        return resultado
+
+    def _limpiar(self) -> None:
+        self._registros = {}
+        self._secundarios = {campo: {} for campo in self.campos_secundarios}
+        self._orden = None
+
+    def _agregar(self, registro: Dict, ruta: str) -> None:
+        id_valor = registro.get(self.campo_id)
+        if self._orden is not None and id_valor is not None and id_valor not in self._registros:
+            insort(self._orden, id_valor)
+        self._registros[id_valor] = dict(registro)
+
+        for campo in self.campos_secundarios:
+            self._secundarios[campo].setdefault(registro.get(campo), set()).add(id_valor)
+
+    def _quitar(self, registro: Dict, ruta: str) -> None:
+        id_valor = registro.get(self.campo_id)
+        if self._registros.pop(id_valor, None) is not None and self._orden is not None and id_valor is not None:
+            posicion = bisect_left(self._orden, id_valor)
+            if posicion < len(self._orden) and self._orden[posicion] == id_valor:
+                self._orden.pop(posicion)
+
+        for campo in self.campos_secundarios:
+            ids = self._secundarios[campo].get(registro.get(campo))
+            if ids is not None:
+                ids.discard(id_valor)
+                if not ids:
+                    del self._secundarios[campo][registro.get(campo)]
+
+class CacheModelos(IndicePrimario):
+    """
+    Indice primario que ademas guarda las instancias del modelo ya construidas
+
+    Crear un objeto del modelo (Personal, Paciente...) repite todas sus
+    validaciones; aca se crea una sola vez por registro y se descarta apenas
+    el registro cambia en el archivo.
+
+    IMPORTANTE: las instancias son compartidas, usarlas solo para lectura. Para
+    modificar un registro se debe crear una instancia propia con from_dict.
+
+    Ejemplo (personal):
+        campo_id = "id_personal", fabrica = Personal.from_dict
+        >>> cache.instancia(3)
+        <Personal 3>
+    """
+
+    def __init__(self, persistencia: Persistencia, campo_id: str, fabrica: Callable[[Dict], Any],
+                 campos_secundarios: Tuple[str, ...] = ()) -> None:
+        """
+        Args:
+            persistencia (Persistencia): Archivo a indexar
+            campo_id (str): Campo ID de los registros
+            fabrica (Callable): Crea la instancia desde el registro (ej: Personal.from_dict)
+            campos_secundarios (Tuple[str]): Campos por los que tambien se buscan IDs
+        """
+        self.fabrica = fabrica
+        self._instancias: Dict[Any, Any] = {}
+        super().__init__(persistencia, campo_id, campos_secundarios)
+
+    def instancia(self, id_valor: Any) -> Optional[Any]:
+        """
+        Devuelve la instancia del modelo para ese ID (creandola si hace falta)
+
+        Returns:
+            Optional[Any]: Instancia o None si el registro no existe
+
+        Raises:
+            Exception: La que lance la fabrica si el registro esta corrupto
+        """
+        self.asegurar()
+        if id_valor not in self._instancias:
+            registro = self._registros.get(id_valor)
+            if registro is None:
+                return None
+            self._instancias[id_valor] = self.fabrica(dict(registro))
+        return self._instancias[id_valor]
+
+    def instancias(self, ids: List[Any]) -> List[Any]:
+        """Instancias de esos IDs (se omiten los que no existen o no se pueden crear)"""
+        resultado = []
+        for id_valor in ids:
+            try:
+                objeto = self.instancia(id_valor)
+            except Exception:
+                continue
+            if objeto is not None:
+                resultado.append(objeto)
+        return resultado
+
+    def _limpiar(self) -> None:
+        super()._limpiar()
+        self._instancias = {}
+
+    def _agregar(self, registro: Dict, ruta: str) -> None:
+        super()._agregar(registro, ruta)
+        self._instancias.pop(registro.get(self.campo_id), None)
+
+    def _quitar(self, registro: Dict, ruta: str) -> None:
+        super()._quitar(registro, ruta)
+        self._instancias.pop(registro.get(self.campo_id), None)
+
+class IndiceCompuesto(IndiceBase):
+    """
+    IDs por la combinacion de valores de varios campos
+
+    Ejemplo (doctores activos por especialidad):
+        campos = ("rol", "estado", "especialidad"), campo_id = "id_personal"
+        >>> indice.ids("Doctor", "Activo", "Cardiologia")
+        [4, 11]
+    """
+
+    def __init__(self, persistencia: Persistencia, campos: Tuple[str, ...], campo_id: str) -> None:
+        """
+        Args:
+            persistencia (Persistencia): Archivo a indexar
+            campos (Tuple[str]): Campos que forman la clave (en orden)
+            campo_id (str): Campo ID de los registros
+        """
+        self.campos = tuple(campos)
+        self.campo_id = campo_id
+        self._ids: Dict[tuple, set] = {}
+        super().__init__(persistencia)
+
+    def ids(self, *valores: Any) -> List[Any]:
+        """
+        Devuelve los IDs (ordenados) con esos valores, en el orden de los campos
+
+        Returns:
+            List[Any]: IDs (lista vacia si no hay)
+        """
+        self.asegurar()
+        return sorted(self._ids.get(tuple(valores), ()))
+
+    def _clave(self, registro: Dict) -> tuple:
+        return tuple(registro.get(campo) for campo in self.campos)
+
+    def _limpiar(self) -> None:
+        self._ids = {}
+
+    def _agregar(self, registro: Dict, ruta: str) -> None:
+        self._ids.setdefault(self._clave(registro), set()).add(registro.get(self.campo_id))
+
+    def _quitar(self, registro: Dict, ruta: str) -> None:
+        clave = self._clave(registro)
+        ids = self._ids.get(clave)
+        if ids is not None:
+            ids.discard(registro.get(self.campo_id))
+            if not ids:
+                del self._ids[clave]
+
+class IndiceUnico(IndiceBase):
+    """
+    Valor unico por registro (ej: DNI) con acceso directo a su ID
+
+    Ademas de responder en O(1) quien tiene un valor, rechaza en la misma
+    escritura cualquier registro que repita un valor de otro registro, asi la
+    regla no depende de que el controlador haya revisado antes de guardar.
+
+    Ejemplo (pacientes):
+        campo = "dni", campo_id = "id_paciente"
+        >>> indice.id_de("12345678")
+        3
+    """
+
+    def __init__(self, persistencia: Persistencia, campo: str, campo_id: str,
+                 excepcion: type = ValidationException) -> None:
+        """
+        Args:
+            persistencia (Persistencia): Archivo a indexar
+            campo (str): Campo que no se puede repetir
+            campo_id (str): Campo ID de los registros
+            excepcion (type): Excepcion que se lanza al repetir un valor
+        """
+        self.campo = campo
+        self.campo_id = campo_id
+        self.excepcion = excepcion
+        self._ids: Dict[Any, Any] = {}
+        super().__init__(persistencia)
+
+    def id_de(self, valor: Any) -> Optional[Any]:
+        """
+        Devuelve el ID del registro que tiene ese valor
+
+        Returns:
+            Optional[Any]: ID o None si nadie lo tiene
+        """
+        self.asegurar()
+        return self._ids.get(valor)
+
+    def existe(self, valor: Any) -> bool:
+        """Indica si algun registro tiene ese valor"""
+        return self.id_de(valor) is not None
+
+    def validar(self, ruta: str, cambios: List[Tuple[Optional[Dict], Optional[Dict]]]) -> None:
+        """
+        Rechaza los cambios que dejarian dos registros con el mismo valor
+
+        Raises:
+            excepcion: Si un valor nuevo ya pertenece a otro registro
+        """
+        self.asegurar()
+
+        # Valores liberados u ocupados dentro del mismo lote
+        pendientes: Dict[Any, Any] = {}
+        for anterior, _ in cambios:
+            if anterior is not None and anterior.get(self.campo) is not None:
+                pendientes[anterior.get(self.campo)] = None
+
+        for _, nuevo in cambios:
+            if nuevo is None or nuevo.get(self.campo) is None:
+                continue
+
+            valor = nuevo.get(self.campo)
+            dueno = pendientes[valor] if valor in pendientes else self._ids.get(valor)
+
+            if dueno is not None and dueno != nuevo.get(self.campo_id):
+                raise self.excepcion(f"El {self.campo} {valor} ya esta registrado (ID {dueno})")
+
+            pendientes[valor] = nuevo.get(self.campo_id)
+
+    def _limpiar(self) -> None:
+        self._ids = {}
+
+    def _agregar(self, registro: Dict, ruta: str) -> None:
+        valor = registro.get(self.campo)
+        if valor is not None:
+            self._ids[valor] = registro.get(self.campo_id)
+
+    def _quitar(self, registro: Dict, ruta: str) -> None:
+        valor = registro.get(self.campo)
+        if valor is not None and self._ids.get(valor) == registro.get(self.campo_id):
+            del self._ids[valor]
+
+class IndiceMultivalor(IndiceBase):
+    """
+    Indice invertido sobre un campo lista: cada valor de la lista apunta a los IDs
+
+    Ejemplo (departamentos del personal activo):
+        campo_lista = "departamentos", campo_id = "id_personal", filtro = {"estado": "Activo"}
+        {1: {3, 8}, 6: {3, 5, 9}}
+        >>> indice.ids(6)
+        [3, 5, 9]
+        >>> indice.conteos()
+        {1: 2, 6: 3}
+    """
+
+    def __init__(self, persistencia: Persistencia, campo_lista: str, campo_id: str,
+                 filtro: Dict[str, Any] | None = None) -> None:
+        """
+        Args:
+            persistencia (Persistencia): Archivo a indexar
+            campo_lista (str): Campo con la lista de valores (ej: departamentos)
+            campo_id (str): Campo ID de los registros
+            filtro (Dict | None): Solo se indexan registros con estos valores
+        """
+        self.campo_lista = campo_lista
+        self.campo_id = campo_id
+        self.filtro = dict(filtro) if filtro else {}
+        self._ids: Dict[Any, set] = {}
+        super().__init__(persistencia)
+
+    def ids(self, valor: Any) -> List[Any]:
+        """
+        Devuelve los IDs (ordenados) de los registros que tienen ese valor en la lista
+
+        Returns:
+            List[Any]: IDs (lista vacia si no hay)
+        """
+        self.asegurar()
+        return sorted(self._ids.get(valor, ()))
+
+    def cantidad(self, valor: Any) -> int:
+        """Cantidad de registros que tienen ese valor en la lista"""
+        self.asegurar()
+        return len(self._ids.get(valor, ()))
+
+    def conteos(self) -> Dict[Any, int]:
+        """
+        Cantidad de registros por cada valor
+
+        Returns:
+            Dict[Any, int]: {valor: cantidad} (solo valores con registros)
+        """
+        self.asegurar()
+        return {valor: len(ids) for valor, ids in self._ids.items()}
+
+    def _limpiar(self) -> None:
+        self._ids = {}
+
+    def _agregar(self, registro: Dict, ruta: str) -> None:
+        if not self._cumple_filtro(registro):
+            return
+
+        for valor in registro.get(self.campo_lista) or []:
+            self._ids.setdefault(valor, set()).add(registro.get(self.campo_id))
+
+    def _quitar(self, registro: Dict, ruta: str) -> None:
+        if not self._cumple_filtro(registro):
+            return
+
+        for valor in registro.get(self.campo_lista) or []:
+            ids = self._ids.get(valor)
+            if ids is not None:
+                ids.discard(registro.get(self.campo_id))
+                if not ids:
+                    del self._ids[valor]
+
+class IndiceNombres(IndiceBase):
+    """
+    Busqueda aproximada por nombre (prefijos y errores de tipeo)
+
+    Los nombres se normalizan (minusculas, sin tildes) y se guardan en dos
+    estructuras:
+        - Un trie de palabras: "mar" encuentra "maria" y "martinez"
+        - Un indice de trigramas: "gonzales" encuentra "gonzalez"
+
+    Ejemplo (pacientes):
+        campo = "nombre", campo_id = "id_paciente"
+        >>> indice.buscar("jose ram", limite=5)
+        [(12, 1.8), (40, 1.35)]
+    """
+
+    # Marca de fin de palabra dentro del trie (guarda los IDs de esa palabra)
+    _FIN = ""
+
+    def __init__(self, persistencia: Persistencia, campo: str, campo_id: str) -> None:
+        """
+        Args:
+            persistencia (Persistencia): Archivo a indexar
+            campo (str): Campo de texto a buscar (ej: nombre)
+            campo_id (str): Campo ID de los registros
+        """
+        self.campo = campo
+        self.campo_id = campo_id
+        self._trie: Dict[str, Any] = {}
+        self._trigramas: Dict[str, set] = {}
+        self._textos: Dict[Any, Tuple[str, int]] = {}
+        super().__init__(persistencia)
+
+    def buscar(self, texto: str, limite: int = 10, minimo: float = 0.3) -> List[Tuple[Any, float]]:
+        """
+        Devuelve los IDs mas parecidos al texto, del mejor al peor
+
+        Cada palabra del texto que es prefijo de alguna palabra del nombre suma
+        un punto; a eso se suma la similitud de trigramas (0 a 1).
+
+        Args:
+            texto (str): Nombre completo o parcial
+            limite (int): Cantidad maxima de resultados
+            minimo (float): Similitud minima para aceptar un resultado solo por trigramas
+
+        Returns:
+            List[Tuple[Any, float]]: (ID, puntaje) ordenados por puntaje
+        """
+        self.asegurar()
+        normalizado = Helpers.normalizar_texto(texto)
+        if not normalizado:
+            return []
+
+        # Coincidencias por prefijo de cada palabra
+        prefijos: Dict[Any, int] = {}
+        for palabra in set(normalizado.split()):
+            for id_valor in self._ids_con_prefijo(palabra):
+                prefijos[id_valor] = prefijos.get(id_valor, 0) + 1
+
+        # Trigramas en comun (similitud de Dice)
+        trigramas = self._trigramas_de(normalizado)
+        comunes: Dict[Any, int] = {}
+        for trigrama in trigramas:
+            for id_valor in self._trigramas.get(trigrama, ()):
+                comunes[id_valor] = comunes.get(id_valor, 0) + 1
+
+        puntajes: Dict[Any, float] = {}
+        for id_valor in set(prefijos) | set(comunes):
+            similitud = 2 * comunes.get(id_valor, 0) / (len(trigramas) + self._textos[id_valor][1])
+            if id_valor in prefijos or similitud >= minimo:
+                puntajes[id_valor] = prefijos.get(id_valor, 0) + similitud
+
+        mejores = nlargest(limite, puntajes.items(), key=lambda par: par[1])
+        return [(id_valor, round(puntaje, 3)) for id_valor, puntaje in mejores]
+
+    def _ids_con_prefijo(self, prefijo: str) -> set:
+        """IDs que tienen alguna palabra que empieza con el prefijo"""
+        nodo = self._trie
+        for letra in prefijo:
+            nodo = nodo.get(letra)
+            if nodo is None:
+                return set()
+
+        # Recorrer el subarbol juntando los IDs de cada palabra
+        ids = set()
+        pendientes = [nodo]
+        while pendientes:
+            actual = pendientes.pop()
+            for letra, hijo in actual.items():
+                if letra == self._FIN:
+                    ids.update(hijo)
+                else:
+                    pendientes.append(hijo)
+        return ids
+
+    @staticmethod
+    def _trigramas_de(texto: str) -> set:
+        """Trigramas de cada palabra con relleno en los bordes (ej: 'ana' -> ' an', 'ana', 'na ')"""
+        trigramas = set()
+        for palabra in texto.split():
+            relleno = f" {palabra} "
+            for i in range(len(relleno) - 2):
+                trigramas.add(relleno[i:i + 3])
+        return trigramas
+
+    def _limpiar(self) -> None:
+        self._trie = {}
+        self._trigramas = {}
+        self._textos = {}
+
+    def _agregar(self, registro: Dict, ruta: str) -> None:
+        id_valor = registro.get(self.campo_id)
+        normalizado = Helpers.normalizar_texto(registro.get(self.campo) or "")
+        trigramas = self._trigramas_de(normalizado)
+        self._textos[id_valor] = (normalizado, len(trigramas))
+
+        for palabra in set(normalizado.split()):
+            nodo = self._trie
+            for letra in palabra:
+                nodo = nodo.setdefault(letra, {})
+            nodo.setdefault(self._FIN, set()).add(id_valor)
+
+        for trigrama in trigramas:
+            self._trigramas.setdefault(trigrama, set()).add(id_valor)
+
+    def _quitar(self, registro: Dict, ruta: str) -> None:
+        id_valor = registro.get(self.campo_id)
+        if id_valor not in self._textos:
+            return
+        normalizado, _ = self._textos.pop(id_valor)
+
+        # Quitar el ID de cada palabra y podar las ramas que quedan vacias
+        for palabra in set(normalizado.split()):
+            camino = [self._trie]
+            for letra in palabra:
+                camino.append(camino[-1].get(letra, {}))
+            ids = camino[-1].get(self._FIN)
+            if ids is None:
+                continue
+            ids.discard(id_valor)
+            if not ids:
+                del camino[-1][self._FIN]
+                for i in range(len(palabra) - 1, -1, -1):
+                    if camino[i + 1]:
+                        break
+                    del camino[i][palabra[i]]
+
+        for trigrama in self._trigramas_de(normalizado):
+            ids = self._trigramas.get(trigrama)
+            if ids is not None:
+                ids.discard(id_valor)
+                if not ids:
+                    del self._trigramas[trigrama]
+
+class IndiceTexto(IndiceBase):
+    """
+    Indice invertido de palabras para buscar texto libre con ranking
+
+    Los campos de texto se normalizan (minusculas, sin tildes) y se parten en
+    palabras; cada palabra guarda en que registros aparece y cuantas veces.
+    Los resultados se ordenan primero por cantidad de palabras buscadas que
+    contienen y luego por relevancia (BM25).
+
+    El indice se guarda en un archivo cache junto con la firma del archivo de
+    origen (fecha de modificacion y tamano). Al iniciar, si la firma coincide se
+    carga el cache en lugar de reconstruir; los cambios hechos durante la
+    ejecucion se guardan al cerrar el programa.
+
+    Ejemplo (consultas):
+        campos_texto = ("diagnostico", "tratamiento"), campo_id = "id_consulta"
+        >>> indice.buscar("dolor toracico", filtros={"especialidad": "Cardiologia"})
+        [(31, 2, 7.41), (8, 1, 3.02)]
+    """
+
+    # Palabras demasiado comunes para aportar a una busqueda
+    PALABRAS_VACIAS = {
+        "a", "al", "con", "de", "del", "el", "en", "la", "las", "lo", "los",
+        "o", "para", "por", "se", "sin", "su", "un", "una", "y"
+    }
+
+    # Parametros de BM25
+    K1 = 1.2
+    B = 0.75
+
+    # Cambia si cambia el formato del cache (obliga a reconstruir)
+    VERSION_CACHE = 1
+
+    def __init__(self, persistencia: Persistencia, campos_texto: Tuple[str, ...], campo_id: str,
+                 campos_filtro: Tuple[str, ...] = (), campo_fecha: str | None = None,
+                 ruta_cache: str | None = None) -> None:
+        """
+        Args:
+            persistencia (Persistencia): Archivo a indexar
+            campos_texto (Tuple[str]): Campos cuyo texto se indexa
+            campo_id (str): Campo ID de los registros
+            campos_filtro (Tuple[str]): Campos por los que se puede filtrar con igualdad
+            campo_fecha (str | None): Campo fecha/fecha-hora ISO para filtrar por rango
+            ruta_cache (str | None): Archivo donde se guarda el indice (None = no se guarda)
+        """
+        self.persistencia = persistencia
+        self.campos_texto = tuple(campos_texto)
+        self.campo_id = campo_id
+        self.campos_filtro = tuple(campos_filtro)
+        self.campo_fecha = campo_fecha
+        self.ruta_cache = ruta_cache
+        self._terminos: Dict[str, Dict[Any, int]] = {}
+        self._documentos: Dict[Any, tuple] = {}
+        self._largo_total = 0
+        self._cache_revisado = False
+        self._cambios_sin_guardar = False
+        super().__init__(persistencia)
+
+        if self.ruta_cache:
+            atexit.register(self.guardar_cache)
+
+    # ========== CONSULTAS ==========
+    def buscar(self, texto: str, limite: int = 20, filtros: Dict[str, Any] | None = None,
+               fecha_desde: str | None = None, fecha_hasta: str | None = None) -> List[Tuple[Any, int, float]]:
+        """
+        Devuelve los registros que mejor coinciden con el texto
+
+        Args:
+            texto (str): Palabras a buscar
+            limite (int): Cantidad maxima de resultados
+            filtros (Dict | None): {campo de filtro: valor} que deben cumplir
+            fecha_desde (str | None): Fecha ISO minima (inclusive)
+            fecha_hasta (str | None): Fecha ISO maxima (inclusive)
+
+        Returns:
+            List[Tuple[Any, int, float]]: (ID, palabras encontradas, puntaje) de mejor a peor
+        """
+        self.asegurar()
+        palabras = set(self.palabras_de(texto))
+        if not palabras or not self._documentos:
+            return []
+
+        filtros = filtros or {}
+        posiciones = {campo: i for i, campo in enumerate(self.campos_filtro)}
+        total = len(self._documentos)
+        promedio = self._largo_total / total
+
+        encontradas: Dict[Any, int] = {}
+        puntajes: Dict[Any, float] = {}
+
+        # Empezar por las palabras menos frecuentes (las que mas descartan)
+        for palabra in sorted(palabras, key=lambda p: len(self._terminos.get(p, ()))):
+            apariciones = self._terminos.get(palabra)
+            if not apariciones:
+                continue
+
+            idf = math.log(1 + (total - len(apariciones) + 0.5) / (len(apariciones) + 0.5))
+            for id_valor, frecuencia in apariciones.items():
+                largo, fecha, valores = self._documentos[id_valor]
+
+                if id_valor not in puntajes:
+                    # Filtros (solo la primera vez que aparece el registro)
+                    if any(valores[posiciones[campo]] != valor for campo, valor in filtros.items()):
+                        continue
+                    if fecha_desde and (fecha is None or fecha < fecha_desde):
+                        continue
+                    if fecha_hasta and (fecha is None or fecha > fecha_hasta):
+                        continue
+
+                peso = frecuencia * (self.K1 + 1) / (frecuencia + self.K1 * (1 - self.B + self.B * largo / promedio))
+                puntajes[id_valor] = puntajes.get(id_valor, 0.0) + idf * peso
+                encontradas[id_valor] = encontradas.get(id_valor, 0) + 1
+
+        mejores = nlargest(limite, puntajes, key=lambda i: (encontradas[i], puntajes[i]))
+        return [(id_valor, encontradas[id_valor], round(puntajes[id_valor], 3)) for id_valor in mejores]
+
+    @classmethod
+    def palabras_de(cls, texto: str) -> List[str]:
+        """Parte un texto normalizado en palabras, sin las palabras vacias"""
+        normalizado = Helpers.normalizar_texto(texto or "")
+        return [p for p in re.findall(r"[a-z0-9]+", normalizado) if p not in cls.PALABRAS_VACIAS]
+
+    # ========== CACHE EN DISCO ==========
+    def reconstruir(self) -> None:
+        """Carga el cache si sigue vigente; si no, reconstruye y lo guarda"""
+        if not self._cache_revisado:
+            self._cache_revisado = True
+            if self._cargar_cache():
+                return
+
+        super().reconstruir()
+        self._cambios_sin_guardar = True
+        self.guardar_cache()
+
+    def notificar(self, ruta: str, cambios: List[Tuple[Optional[Dict], Optional[Dict]]],
+                  version_antes: tuple, version_despues: tuple) -> None:
+        super().notificar(ruta, cambios, version_antes, version_despues)
+        self._cambios_sin_guardar = True
+
+    def guardar_cache(self) -> None:
+        """Guarda el indice en disco si tiene cambios y esta al dia con su archivo"""
+        if not self.ruta_cache or not self._cambios_sin_guardar:
+            return
+
+        version = self.persistencia.version()
+        if self._versiones.get(self.persistencia.ruta) != version:
+            return
+
+        contenido = {
+            "version_cache": self.VERSION_CACHE,
+            "archivo": self.persistencia.archivo,
+            "firma": list(version[1:]),
+            "documentos": [[id_valor, *datos] for id_valor, datos in self._documentos.items()],
+            "terminos": {palabra: list(apariciones.items()) for palabra, apariciones in self._terminos.items()}
+        }
+
+        try:
+            temporal = f"{self.ruta_cache}.tmp"
+            with open(temporal, 'w', encoding='utf-8') as f:
+                json.dump(contenido, f, ensure_ascii=False)
+            os.replace(temporal, self.ruta_cache)
+            self._cambios_sin_guardar = False
+        except OSError:
+            # Sin cache solo se pierde tiempo en el siguiente inicio
+            return
+
+    def _cargar_cache(self) -> bool:
+        """Carga el cache si corresponde a la version actual del archivo"""
+        if not self.ruta_cache or not os.path.exists(self.ruta_cache):
+            return False
+
+        version = self.persistencia.version()
+        try:
+            with open(self.ruta_cache, 'r', encoding='utf-8') as f:
+                contenido = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return False
+
+        if contenido.get("version_cache") != self.VERSION_CACHE or contenido.get("firma") != list(version[1:]):
+            return False
+
+        self._limpiar()
+        for id_valor, largo, fecha, valores in contenido["documentos"]:
+            self._documentos[id_valor] = (largo, fecha, tuple(valores))
+            self._largo_total += largo
+        for palabra, apariciones in contenido["terminos"].items():
+            self._terminos[palabra] = {id_valor: frecuencia for id_valor, frecuencia in apariciones}
+
+        self._versiones[self.persistencia.ruta] = version
+        return True
+
+    # ========== MANTENIMIENTO ==========
+    def _limpiar(self) -> None:
+        self._terminos = {}
+        self._documentos = {}
+        self._largo_total = 0
+
+    def _agregar(self, registro: Dict, ruta: str) -> None:
+        id_valor = registro.get(self.campo_id)
+        palabras = []
+        for campo in self.campos_texto:
+            palabras.extend(self.palabras_de(registro.get(campo)))
+
+        fecha = None
+        if self.campo_fecha and registro.get(self.campo_fecha):
+            fecha = registro.get(self.campo_fecha)[:10]
+        valores = tuple(registro.get(campo) for campo in self.campos_filtro)
+        self._documentos[id_valor] = (len(palabras), fecha, valores)
+        self._largo_total += len(palabras)
+
+        for palabra in palabras:
+            apariciones = self._terminos.setdefault(palabra, {})
+            apariciones[id_valor] = apariciones.get(id_valor, 0) + 1
+
+    def _quitar(self, registro: Dict, ruta: str) -> None:
+        id_valor = registro.get(self.campo_id)
+        documento = self._documentos.pop(id_valor, None)
+        if documento is None:
+            return
+        self._largo_total -= documento[0]
+
+        for campo in self.campos_texto:
+            for palabra in self.palabras_de(registro.get(campo)):
+                apariciones = self._terminos.get(palabra)
+                if apariciones is not None and apariciones.pop(id_valor, None) is not None and not apariciones:
+                    del self._terminos[palabra]
+
+class IndiceAgrupado(IndiceBase):
+    """
+    Agrupa registros por un campo y un subcampo, manteniendo cada grupo ordenado
+
+    Ejemplo (agenda diaria):
+        grupo = fecha, subgrupo = id_doctor, orden = hora
+        {"2026-01-20": {3: [cita 08:00, cita 09:30], 5: [cita 10:00]}}
+    """
+
+    def __init__(self, persistencia: Persistencia, campo_grupo: str, campo_subgrupo: str,
+                 campo_orden: str, campo_id: str, filtro: Dict[str, Any] | None = None) -> None:
+        """
+        Args:
+            persistencia (Persistencia): Archivo a indexar
+            campo_grupo (str): Campo del primer nivel (ej: fecha)
+            campo_subgrupo (str): Campo del segundo nivel (ej: id_doctor)
+            campo_orden (str): Campo por el que se ordena cada grupo (ej: hora)
+            campo_id (str): Campo ID de los registros
+            filtro (Dict | None): Solo se indexan registros con estos valores
+        """
+        self.campo_grupo = campo_grupo
+        self.campo_subgrupo = campo_subgrupo
+        self.campo_orden = campo_orden
+        self.campo_id = campo_id
+        self.filtro = dict(filtro) if filtro else {}
+        self._grupos: Dict[Any, Dict[Any, List[tuple]]] = {}
+        super().__init__(persistencia)
+
+    def obtener(self, grupo: Any) -> Dict[Any, List[Dict]]:
+        """
+        Devuelve copias de los registros de un grupo separados por subgrupo y ordenados
+
+        Returns:
+            Dict[Any, List[Dict]]: {subgrupo: [registros ordenados]}
+        """
+        self.asegurar()
+        subgrupos = self._grupos.get(grupo, {})
+        return {clave: [dict(fila[2]) for fila in filas] for clave, filas in subgrupos.items()}
+
+    def obtener_subgrupo(self, grupo: Any, subgrupo: Any) -> List[Dict]:
+        """
+        Devuelve copias de los registros ordenados de un subgrupo
+
+        Returns:
+            List[Dict]: Registros ordenados (lista vacia si no hay)
+        """
+        self.asegurar()
+        filas = self._grupos.get(grupo, {}).get(subgrupo, [])
+        return [dict(fila[2]) for fila in filas]
+
+    def _limpiar(self) -> None:
+        self._grupos = {}
+
+    def _agregar(self, registro: Dict, ruta: str) -> None:
+        if not self._cumple_filtro(registro):
+            return
+
+        grupo = registro.get(self.campo_grupo)
+        subgrupo = registro.get(self.campo_subgrupo)
+        fila = (registro.get(self.campo_orden), registro.get(self.campo_id), dict(registro))
+
+        insort(self._grupos.setdefault(grupo, {}).setdefault(subgrupo, []), fila)
+
+    def _quitar(self, registro: Dict, ruta: str) -> None:
+        if not self._cumple_filtro(registro):
+            return
+
+        grupo = registro.get(self.campo_grupo)
+        subgrupo = registro.get(self.campo_subgrupo)
+        filas = self._grupos.get(grupo, {}).get(subgrupo)
+        if not filas:
+            return
+
+        # Ubicar la fila por (orden, id) con busqueda binaria
+        clave = (registro.get(self.campo_orden), registro.get(self.campo_id))
+        posicion = bisect_left(filas, clave)
+        if posicion < len(filas) and filas[posicion][:2] == clave:
+            filas.pop(posicion)
+
+        # Limpiar niveles vacios
+        if not filas:
+            del self._grupos[grupo][subgrupo]
+            if not self._grupos[grupo]:
+                del self._grupos[grupo]
+
+class IndiceOrdenado(IndiceBase):
+    """
+    Mantiene los registros ordenados por uno o mas campos
+
+    Permite obtener los registros anteriores a un limite con una busqueda
+    binaria: el costo depende de cuantos registros se devuelven, no del
+    tamano del archivo.
+
+    Ejemplo (citas agendadas por fecha y hora):
+        campos_orden = ("fecha", "hora"), filtro = {"estado": "Agendada"}
+        >>> indice.anteriores(("2026-01-20", "00:00:00"))
+    """
+
+    def __init__(self, persistencia: Persistencia, campos_orden: Tuple[str, ...], campo_id: str,
+                 filtro: Dict[str, Any] | None = None) -> None:
+        """
+        Args:
+            persistencia (Persistencia): Archivo a indexar
+            campos_orden (Tuple[str]): Campos por los que se ordena
+            campo_id (str): Campo ID de los registros
+            filtro (Dict | None): Solo se indexan registros con estos valores
+        """
+        self.campos_orden = tuple(campos_orden)
+        self.campo_id = campo_id
+        self.filtro = dict(filtro) if filtro else {}
+        self._filas: List[tuple] = []
+        super().__init__(persistencia)
+
+    def anteriores(self, limite: tuple) -> List[Dict]:
+        """
+        Devuelve los registros cuyo orden es menor al limite
+
+        Args:
+            limite (tuple): Valores de los campos de orden (ej: (fecha, hora))
+
+        Returns:
+            List[Dict]: Registros ordenados de menor a mayor
+        """
+        self.asegurar()
+        fin = bisect_left(self._filas, tuple(limite))
+        return [dict(fila[-1]) for fila in self._filas[:fin]]
+
+    def entre(self, desde: tuple, hasta: tuple) -> List[Dict]:
+        """
+        Devuelve los registros cuyo orden esta entre dos limites (ambos inclusive)
+
+        Los limites pueden tener menos valores que los campos de orden; se
+        comparan solo los primeros (ej: (fecha,) sobre (fecha, hora)).
+
+        Args:
+            desde (tuple): Limite inferior
+            hasta (tuple): Limite superior
+
+        Returns:
+            List[Dict]: Registros ordenados de menor a mayor
+        """
+        self.asegurar()
+        hasta = tuple(hasta)
+        resultado = []
+
+        # Se recorre por posicion: cortar la lista copiaria toda la cola
+        for posicion in range(bisect_left(self._filas, tuple(desde)), len(self._filas)):
+            fila = self._filas[posicion]
+            if fila[:len(hasta)] > hasta:
+                break
+            resultado.append(dict(fila[-1]))
+        return resultado
+
+    def cantidad(self) -> int:
+        """Cantidad de registros indexados"""
+        self.asegurar()
+        return len(self._filas)
+
+    def _clave(self, registro: Dict) -> tuple:
+        return tuple(registro.get(campo) for campo in self.campos_orden) + (registro.get(self.campo_id),)
+
+    def _limpiar(self) -> None:
+        self._filas = []
+
+    def _agregar(self, registro: Dict, ruta: str) -> None:
+        if not self._cumple_filtro(registro):
+            return
+
+        insort(self._filas, self._clave(registro) + (dict(registro),))
+
+    def _quitar(self, registro: Dict, ruta: str) -> None:
+        if not self._cumple_filtro(registro):
+            return
+
+        clave = self._clave(registro)
+        posicion = bisect_left(self._filas, clave)
+        if posicion < len(self._filas) and self._filas[posicion][:-1] == clave:
+            self._filas.pop(posicion)
+
+class IndiceIntervalos(IndiceBase):
+    """
+    Registros con vigencia (fecha desde - fecha hasta) para consultar por fecha o periodo
+
+    Los intervalos se ordenan por fecha desde y se guarda un arbol con la
+    mayor fecha hasta de cada tramo. Una consulta toma los que empiezan antes
+    del fin del periodo (busqueda binaria) y del arbol solo recorre las ramas
+    que llegan al inicio del periodo: O(log n + k) en lugar de leer el archivo.
+
+    Ademas del indice general se puede tener uno por valor de algunos campos
+    (ej: por id_personal o por tipo). Una fecha hasta vacia es un intervalo sin fin.
+
+    El arbol de un grupo se arma en su primera consulta. Despues, una baja solo
+    vacia su hoja y actualiza el camino hasta la raiz (O(log n)), y las altas se
+    guardan aparte y se revisan una por una; el grupo se rearma completo solo
+    cuando las altas y bajas acumuladas superan la raiz cuadrada de sus filas.
+
+    Ejemplo (contratos):
+        campo_desde = "fecha_inicio", campo_hasta = "fecha_fin", campos_grupo = ("id_personal", "tipo")
+        >>> indice.vigentes("2025-03-15", campo="id_personal", valor=7)
+        >>> indice.solapados("2025-07-01", "2025-09-30", campo="tipo", valor="Temporal")
+    """
+
+    # Fecha hasta de los intervalos sin fin (mayor que cualquier fecha ISO)
+    SIN_FIN = "9999-12-31"
+
+    def __init__(self, persistencia: Persistencia, campo_desde: str, campo_hasta: str, campo_id: str,
+                 campos_grupo: Tuple[str, ...] = (), filtro: Dict[str, Any] | None = None) -> None:
+        """
+        Args:
+            persistencia (Persistencia): Archivo a indexar
+            campo_desde (str): Campo con la fecha de inicio (ISO)
+            campo_hasta (str): Campo con la fecha de fin (ISO o None = sin fin)
+            campo_id (str): Campo ID de los registros
+            campos_grupo (Tuple[str]): Campos con indice propio por valor
+            filtro (Dict | None): Solo se indexan registros con estos valores
+        """
+        self.campo_desde = campo_desde
+        self.campo_hasta = campo_hasta
+        self.campo_id = campo_id
+        self.campos_grupo = tuple(campos_grupo)
+        self.filtro = dict(filtro) if filtro else {}
+        self._grupos: Dict[Any, Dict[str, Any]] = {}
+        super().__init__(persistencia)
+
+    def vigentes(self, fecha: date | str, campo: str | None = None, valor: Any = None) -> List[Dict]:
+        """
+        Devuelve los registros vigentes en una fecha (desde <= fecha <= hasta)
+
+        Args:
+            fecha (date | str): Fecha a consultar
+            campo (str | None): Campo de grupo (None = todos los registros)
+            valor (Any): Valor del campo de grupo
+
+        Returns:
+            List[Dict]: Registros ordenados por fecha desde
+        """
+        return self.solapados(fecha, fecha, campo, valor)
+
+    def solapados(self, desde: date | str, hasta: date | str, campo: str | None = None, valor: Any = None) -> List[Dict]:
+        """
+        Devuelve los registros vigentes en algun dia del periodo (ambos limites inclusive)
+
+        Args:
+            desde (date | str): Inicio del periodo
+            hasta (date | str): Fin del periodo
+            campo (str | None): Campo de grupo (None = todos los registros)
+            valor (Any): Valor del campo de grupo
+
+        Returns:
+            List[Dict]: Registros ordenados por fecha desde
+
+        Raises:
+            ValueError: Si el campo no es un campo de grupo del indice
+        """
+        if campo is not None and campo not in self.campos_grupo:
+            raise ValueError(f"El indice no agrupa por el campo {campo}")
+
+        self.asegurar()
+        desde, hasta = self._texto(desde), self._texto(hasta)
+        grupo = self._grupos.get(None if campo is None else (campo, valor))
+        if grupo is None:
+            return []
+
+        if grupo["arbol"] is None:
+            grupo["arbol"] = self._armar_arbol(grupo["filas"])
+        filas, arbol, borradas = grupo["filas"], grupo["arbol"], grupo["borradas"]
+
+        # Solo los que empiezan hasta el fin del periodo
+        limite = bisect_right(filas, (hasta, IndiceIntervalos.SIN_FIN + "~"))
+        tamano = len(arbol) // 2
+        encontradas = []
+
+        # Recorrido en orden; se descartan las ramas que terminan antes del periodo
+        pendientes = [(1, 0, tamano)]
+        while pendientes:
+            nodo, inicio, fin = pendientes.pop()
+            if inicio >= limite or arbol[nodo] < desde:
+                continue
+            if fin - inicio == 1:
+                if inicio not in borradas:
+                    encontradas.append(filas[inicio])
+                continue
+            medio = (inicio + fin) // 2
+            pendientes.append((2 * nodo + 1, medio, fin))
+            pendientes.append((2 * nodo, inicio, medio))
+
+        # Altas que aun no entraron al arbol
+        nuevas = sorted(fila for fila in grupo["nuevas"] if fila[0] <= hasta and fila[1] >= desde)
+
+        return [dict(fila[-1]) for fila in merge(encontradas, nuevas)]
+
+    @staticmethod
+    def _texto(fecha: date | str) -> str:
+        return fecha.isoformat() if isinstance(fecha, date) else str(fecha)
+
+    @staticmethod
+    def _armar_arbol(filas: List[tuple]) -> List[str]:
+        """Arbol de maximos de la fecha hasta, con las filas como hojas"""
+        tamano = 1
+        while tamano < len(filas):
+            tamano *= 2
+
+        arbol = [""] * (2 * tamano)
+        for posicion, fila in enumerate(filas):
+            arbol[tamano + posicion] = fila[1]
+        for nodo in range(tamano - 1, 0, -1):
+            arbol[nodo] = max(arbol[2 * nodo], arbol[2 * nodo + 1])
+        return arbol
+
+    @staticmethod
+    def _vaciar_hoja(arbol: List[str], posicion: int) -> None:
+        """Vacia la hoja de una fila y recalcula los maximos hasta la raiz"""
+        nodo = len(arbol) // 2 + posicion
+        arbol[nodo] = ""
+        nodo //= 2
+        while nodo:
+            arbol[nodo] = max(arbol[2 * nodo], arbol[2 * nodo + 1])
+            nodo //= 2
+
+    @staticmethod
+    def _rearmar_si_hace_falta(grupo: Dict[str, Any]) -> None:
+        """Rearma el arbol cuando las altas y bajas acumuladas ya son demasiadas"""
+        if len(grupo["nuevas"]) + len(grupo["borradas"]) <= math.isqrt(len(grupo["filas"])):
+            return
+
+        vigentes = [fila for posicion, fila in enumerate(grupo["filas"]) if posicion not in grupo["borradas"]]
+        grupo["filas"] = list(merge(vigentes, sorted(grupo["nuevas"])))
+        grupo["arbol"] = IndiceIntervalos._armar_arbol(grupo["filas"])
+        grupo["nuevas"] = []
+        grupo["borradas"] = set()
+
+    def _fila(self, registro: Dict) -> tuple:
+        return (registro.get(self.campo_desde) or "", registro.get(self.campo_hasta) or IndiceIntervalos.SIN_FIN,
+                registro.get(self.campo_id))
+
+    def _claves(self, registro: Dict) -> List[Any]:
+        """Grupos a los que pertenece el registro (None = indice general)"""
+        return [None] + [(campo, registro.get(campo)) for campo in self.campos_grupo]
+
+    def _limpiar(self) -> None:
+        self._grupos = {}
+
+    def _agregar(self, registro: Dict, ruta: str) -> None:
+        if not self._cumple_filtro(registro):
+            return
+
+        fila = self._fila(registro) + (dict(registro),)
+        for clave in self._claves(registro):
+            grupo = self._grupos.setdefault(clave, {"filas": [], "arbol": None, "nuevas": [], "borradas": set()})
+
+            # Sin arbol armado (carga inicial): directo a las filas ordenadas
+            if grupo["arbol"] is None:
+                insort(grupo["filas"], fila)
+                continue
+
+            grupo["nuevas"].append(fila)
+            self._rearmar_si_hace_falta(grupo)
+
+    def _quitar(self, registro: Dict, ruta: str) -> None:
+        if not self._cumple_filtro(registro):
+            return
+
+        fila = self._fila(registro)
+        for clave in self._claves(registro):
+            grupo = self._grupos.get(clave)
+            if grupo is None:
+                continue
+
+            # Primero entre las altas que aun no entraron al arbol
+            nuevas = grupo["nuevas"]
+            posicion = next((i for i, nueva in enumerate(nuevas) if nueva[:-1] == fila), None)
+            if posicion is not None:
+                nuevas.pop(posicion)
+                continue
+
+            filas = grupo["filas"]
+            posicion = bisect_left(filas, fila)
+            while posicion in grupo["borradas"]:
+                posicion += 1
+            if posicion >= len(filas) or filas[posicion][:-1] != fila:
+                continue
+
+            if grupo["arbol"] is None:
+                filas.pop(posicion)
+                continue
+
+            grupo["borradas"].add(posicion)
+            self._vaciar_hoja(grupo["arbol"], posicion)
+            self._rearmar_si_hace_falta(grupo)
+
+class ColaPorVentana(IndiceBase):
+    """
+    Colas de prioridad para registros que aceptan un rango de fechas
+
+    Cada registro se encola en una cola por (clave, dia) para cada dia de su
+    ventana. Asi, ante un hueco en un dia concreto, el mejor candidato es el
+    tope de una o dos colas: O(log n), sin recorrer a todos los que esperan.
+    Los registros que dejan de cumplir el filtro se descartan de forma
+    perezosa al llegar al tope; cuando las entradas vencidas de una cola
+    superan a las vigentes, la cola se reconstruye solo con las vigentes.
+
+    Ejemplo (lista de espera):
+        clave = (especialidad, id_doctor), ventana = fecha_desde..fecha_hasta,
+        prioridad = (prioridad, fecha_registro), filtro = {"estado": "Pendiente"}
+    """
+
+    def __init__(self, persistencia: Persistencia, campos_clave: Tuple[str, ...], campo_desde: str,
+                 campo_hasta: str, campos_prioridad: Tuple[str, ...], campo_id: str,
+                 filtro: Dict[str, Any] | None = None) -> None:
+        """
+        Args:
+            persistencia (Persistencia): Archivo a indexar
+            campos_clave (Tuple[str]): Campos que forman la clave de la cola
+            campo_desde (str): Campo con el primer dia de la ventana (ISO)
+            campo_hasta (str): Campo con el ultimo dia de la ventana (ISO)
+            campos_prioridad (Tuple[str]): Campos que ordenan la cola (menor primero)
+            campo_id (str): Campo ID de los registros
+            filtro (Dict | None): Solo se encolan registros con estos valores
+        """
+        self.campos_clave = tuple(campos_clave)
+        self.campo_desde = campo_desde
+        self.campo_hasta = campo_hasta
+        self.campos_prioridad = tuple(campos_prioridad)
+        self.campo_id = campo_id
+        self.filtro = dict(filtro) if filtro else {}
+        self._colas: Dict[tuple, List[tuple]] = {}
+        self._vigentes: Dict[Any, int] = {}
+        self._registros: Dict[Any, Dict] = {}
+        self._ubicaciones: Dict[Any, List[tuple]] = {}
+        self._vivas: Dict[tuple, int] = {}
+        self._marca = 0
+        super().__init__(persistencia)
+
+    def mejor(self, claves: List[tuple], dia: date, excluir: set | None = None) -> Any:
+        """
+        Devuelve el ID del mejor registro que acepta ese dia en alguna de las claves
+
+        Args:
+            claves (List[tuple]): Claves de cola a revisar
+            dia (date): Dia del hueco
+            excluir (set | None): IDs que no deben considerarse
+
+        Returns:
+            Any: ID del mejor registro o None si no hay candidatos
+        """
+        self.asegurar()
+        excluir = excluir or set()
+        mejor_entrada = None
+
+        for clave in claves:
+            cola = self._colas.get((tuple(clave), dia.isoformat()))
+            if not cola:
+                continue
+
+            # Sacar del tope las entradas vencidas y las excluidas
+            apartadas = []
+            while cola:
+                entrada = cola[0]
+                if self._vigentes.get(entrada[-2]) != entrada[-1]:
+                    heappop(cola)
+                elif entrada[-2] in excluir:
+                    apartadas.append(heappop(cola))
+                else:
+                    break
+
+            if cola and (mejor_entrada is None or cola[0] < mejor_entrada):
+                mejor_entrada = cola[0]
+
+            # Devolver las excluidas a su cola
+            for entrada in apartadas:
+                heappush(cola, entrada)
+
+        return mejor_entrada[-2] if mejor_entrada else None
+
+    def obtener(self, id_registro: Any) -> Optional[Dict]:
+        """
+        Devuelve el registro encolado con ese ID (copia) o None si no esta en espera
+
+        Args:
+            id_registro (Any): ID del registro
+
+        Returns:
+            Optional[Dict]: Registro indexado
+        """
+        self.asegurar()
+        registro = self._registros.get(id_registro)
+        return dict(registro) if registro is not None else None
+
+    def cantidad(self) -> int:
+        """Cantidad de registros en espera"""
+        self.asegurar()
+        return len(self._vigentes)
+
+    def _compactar(self, ubicacion: tuple) -> None:
+        """Reconstruye una cola dejando solo las entradas vigentes"""
+        cola = [entrada for entrada in self._colas.get(ubicacion, [])
+                if self._vigentes.get(entrada[-2]) == entrada[-1]]
+
+        if cola:
+            heapify(cola)
+            self._colas[ubicacion] = cola
+        else:
+            self._colas.pop(ubicacion, None)
+            self._vivas.pop(ubicacion, None)
+
+    def _limpiar(self) -> None:
+        self._colas = {}
+        self._vigentes = {}
+        self._registros = {}
+        self._ubicaciones = {}
+        self._vivas = {}
+
+    def _agregar(self, registro: Dict, ruta: str) -> None:
+        if not self._cumple_filtro(registro):
+            return
+
+        id_registro = registro.get(self.campo_id)
+        self._quitar(registro, ruta)
+        self._marca += 1
+        self._vigentes[id_registro] = self._marca
+        self._registros[id_registro] = dict(registro)
+
+        clave = tuple(registro.get(campo) for campo in self.campos_clave)
+        prioridad = tuple(registro.get(campo) for campo in self.campos_prioridad)
+        entrada = prioridad + (id_registro, self._marca)
+
+        # Encolar en cada dia de la ventana que aun no paso
+        dia = max(date.fromisoformat(registro[self.campo_desde]), date.today())
+        hasta = date.fromisoformat(registro[self.campo_hasta])
+        ubicaciones = []
+        while dia <= hasta:
+            ubicacion = (clave, dia.isoformat())
+            heappush(self._colas.setdefault(ubicacion, []), entrada)
+            self._vivas[ubicacion] = self._vivas.get(ubicacion, 0) + 1
+            ubicaciones.append(ubicacion)
+            dia += timedelta(days=1)
+        self._ubicaciones[id_registro] = ubicaciones
+
+    def _quitar(self, registro: Dict, ruta: str) -> None:
+        # Las entradas quedan en las colas y se descartan al llegar al tope,
+        # salvo que las vencidas ya superen a las vigentes de esa cola
+        id_registro = registro.get(self.campo_id)
+        if self._vigentes.pop(id_registro, None) is None:
+            return
+
+        self._registros.pop(id_registro, None)
+        for ubicacion in self._ubicaciones.pop(id_registro, []):
+            vivas = self._vivas.get(ubicacion, 0) - 1
+            self._vivas[ubicacion] = vivas
+            if len(self._colas.get(ubicacion, [])) - vivas > vivas:
+                self._compactar(ubicacion)
+
+class MapaOcupacion(IndiceBase):
+    """
+    Mapa de bits de ocupacion por recurso y dia
+
+    El horario de atencion (07:00 a 22:00) son 60 bloques de 15 minutos, asi
+    que la ocupacion de un doctor en un dia cabe en un solo entero: el bit i
+    encendido indica que el bloque i esta ocupado. Consultar si un horario
+    esta libre, listar los bloques libres o ver que doctores estan libres a
+    una hora son operaciones de bits, sin recorrer las citas.
+
+    Ejemplo (citas agendadas):
+        recurso = id_doctor, fecha = fecha, hora = hora, filtro = {"estado": "Agendada"}
+        {(3, "2026-01-20"): 0b101}  -> bloques 07:00 y 07:30 ocupados
+    """
+
+    # Mascara con todos los bloques del dia encendidos
+    DIA_COMPLETO = (1 << BLOQUES_POR_DIA) - 1
+
+    def __init__(self, persistencia: Persistencia, campo_recurso: str, campo_fecha: str,
+                 campo_hora: str, filtro: Dict[str, Any] | None = None) -> None:
+        """
+        Args:
+            persistencia (Persistencia): Archivo a indexar
+            campo_recurso (str): Campo del recurso ocupado (ej: id_doctor)
+            campo_fecha (str): Campo con la fecha (ISO)
+            campo_hora (str): Campo con la hora (ISO)
+            filtro (Dict | None): Solo ocupan bloque los registros con estos valores
+        """
+        self.campo_recurso = campo_recurso
+        self.campo_fecha = campo_fecha
+        self.campo_hora = campo_hora
+        self.filtro = dict(filtro) if filtro else {}
+        self._mapas: Dict[tuple, int] = {}
+        self._repetidos: Dict[tuple, int] = {}
+        super().__init__(persistencia)
+
+    # ========== CONVERSION DE BLOQUES ==========
+    @staticmethod
+    def bloque_de(hora: time) -> int:
+        """
+        Devuelve el numero de bloque que contiene una hora
+
+        Returns:
+            int: Bloque (0 = 07:00) o -1 si la hora esta fuera del horario de atencion
+        """
+        minutos = (hora.hour - HORA_APERTURA) * 60 + hora.minute
+        bloque = minutos // MINUTOS_POR_BLOQUE
+        return bloque if 0 <= minutos and bloque < BLOQUES_POR_DIA else -1
+
+    @staticmethod
+    def hora_de(bloque: int) -> time:
+        """Devuelve la hora de inicio de un bloque"""
+        minutos = HORA_APERTURA * 60 + bloque * MINUTOS_POR_BLOQUE
+        return time(minutos // 60, minutos % 60)
+
+    @staticmethod
+    def mascara_entre(desde: time, hasta: time) -> int:
+        """
+        Devuelve la mascara de los bloques que caen en [desde, hasta)
+
+        Un bloque cuenta si empieza antes de "hasta"; el rango se recorta al
+        horario de atencion.
+
+        Returns:
+            int: Mascara de bloques (0 si el rango queda vacio)
+        """
+        inicio = max((desde.hour - HORA_APERTURA) * 60 + desde.minute, 0) // MINUTOS_POR_BLOQUE
+        fin_minutos = (hasta.hour - HORA_APERTURA) * 60 + hasta.minute
+        fin = min(-(-fin_minutos // MINUTOS_POR_BLOQUE), BLOQUES_POR_DIA)
+
+        if fin <= inicio:
+            return 0
+
+        return ((1 << fin) - 1) ^ ((1 << inicio) - 1)
+
+    # ========== CONSULTAS ==========
+    def ocupacion(self, recurso: Any, fecha: date) -> int:
+        """
+        Devuelve el mapa de bits de ocupacion de un recurso en un dia
+
+        Returns:
+            int: Mapa de bits (0 si no tiene nada ocupado)
+        """
+        self.asegurar()
+        return self._mapas.get((recurso, fecha.isoformat()), 0)
+
+    def libre(self, recurso: Any, fecha: date, hora: time) -> bool:
+        """
+        Verifica si el bloque que contiene la hora esta libre
+
+        Returns:
+            bool: True si esta libre | False si esta ocupado o fuera de horario
+        """
+        bloque = self.bloque_de(hora)
+        if bloque < 0:
+            return False
+
+        return not (self.ocupacion(recurso, fecha) >> bloque) & 1
+
+    def bloques_libres(self, recurso: Any, fecha: date, mascara: int = DIA_COMPLETO) -> List[time]:
+        """
+        Lista las horas de inicio de los bloques libres de un recurso en un dia
+
+        Args:
+            recurso (Any): Recurso a consultar
+            fecha (date): Dia a consultar
+            mascara (int): Bloques a considerar (por defecto todo el dia)
+
+        Returns:
+            List[time]: Horas libres ordenadas
+        """
+        libres = ~self.ocupacion(recurso, fecha) & mascara
+        horas = []
+
+        # Recorrer solo los bits encendidos
+        while libres:
+            bit_bajo = libres & -libres
+            horas.append(self.hora_de(bit_bajo.bit_length() - 1))
+            libres ^= bit_bajo
+
+        return horas
+
+    def recursos_libres(self, recursos: List[Any], fecha: date, hora: time) -> List[Any]:
+        """
+        Filtra los recursos que tienen libre el bloque de esa hora
+
+        Returns:
+            List[Any]: Recursos libres, en el mismo orden recibido
+        """
+        bloque = self.bloque_de(hora)
+        if bloque < 0:
+            return []
+
+        self.asegurar()
+        dia = fecha.isoformat()
+        return [r for r in recursos if not (self._mapas.get((r, dia), 0) >> bloque) & 1]
+
+    # ========== MANTENIMIENTO ==========
+    def _limpiar(self) -> None:
+        self._mapas = {}
+        self._repetidos = {}
+
+    def _ubicar(self, registro: Dict) -> Tuple[tuple, int] | None:
+        """Devuelve (clave, bloque) del registro o None si no ocupa bloque"""
+        if not self._cumple_filtro(registro):
+            return None
+
+        try:
+            bloque = self.bloque_de(time.fromisoformat(registro[self.campo_hora]))
+        except (KeyError, TypeError, ValueError):
+            return None
+
+        if bloque < 0:
+            return None
+
+        return (registro.get(self.campo_recurso), registro.get(self.campo_fecha)), bloque
+
+    def _agregar(self, registro: Dict, ruta: str) -> None:
+        ubicacion = self._ubicar(registro)
+        if ubicacion is None:
+            return
+
+        clave, bloque = ubicacion
+        mapa = self._mapas.get(clave, 0)
+
+        # Datos antiguos pueden tener dos registros en el mismo bloque: se cuentan aparte
+        if (mapa >> bloque) & 1:
+            self._repetidos[(clave, bloque)] = self._repetidos.get((clave, bloque), 0) + 1
+        else:
+            self._mapas[clave] = mapa | (1 << bloque)
+
+    def _quitar(self, registro: Dict, ruta: str) -> None:
+        ubicacion = self._ubicar(registro)
+        if ubicacion is None:
+            return
+
+        clave, bloque = ubicacion
+        if self._repetidos.get((clave, bloque)):
+            self._repetidos[(clave, bloque)] -= 1
+            if not self._repetidos[(clave, bloque)]:
+                del self._repetidos[(clave, bloque)]
+            return
+
+        mapa = self._mapas.get(clave, 0) & ~(1 << bloque)
+        if mapa:
+            self._mapas[clave] = mapa
+        else:
+            self._mapas.pop(clave, None)
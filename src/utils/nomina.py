@@ -0,0 +1,185 @@
+"""
+Calculo de la planilla mensual de todo el personal
+
+Los datos se cargan por columnas (una lista o array por campo) y cada regla se
+aplica a la columna completa en una sola pasada, en lugar de crear un objeto
+Personal por empleado y calcular uno por uno.
+
+    basico   = salario_base x factor de jornada x (dias trabajados / dias del mes)
+    recargo  = basico x recargo del turno
+    bono     = bono del rol x prorrateo + basico x antiguedad (años completos, con tope)
+    total    = basico + recargo + bono
+
+El salario base sale del contrato vigente en el mes (el de mayor ID que empezo
+antes de fin de mes); si el empleado no tiene contrato se usa el de su ficha.
+"""
+import calendar
+from array import array
+from collections import defaultdict
+from datetime import date
+from typing import Any, Dict, Iterable, List
+from src.utils.excepciones import ValidationException
+from src.config.constantes import (
+    FACTORES_JORNADA, RECARGOS_TURNO, BONOS_ROL, BONO_ANTIGUEDAD_ANUAL, TOPE_ANOS_ANTIGUEDAD
+)
+
+class Planilla:
+    """
+    Planilla de un mes calculada por columnas
+
+    Ejemplo:
+        >>> planilla = Planilla(2026, 10, persistencia.iterar(), persistencia_contratos.iterar())
+        >>> planilla.total()
+        48250.0
+        >>> planilla.totales_por_rol()
+        {"Doctor": 31000.0, ...}
+    """
+
+    def __init__(self, anio: int, mes: int, personal: Iterable[Dict], contratos: Iterable[Dict]) -> None:
+        """
+        Args:
+            anio (int): Año de la planilla
+            mes (int): Mes de la planilla (1 - 12)
+            personal (Iterable[Dict]): Registros de data/personal.json
+            contratos (Iterable[Dict]): Registros de data/contratos.json
+
+        Raises:
+            ValidationException: Si el periodo no es valido
+        """
+        if not isinstance(anio, int) or not isinstance(mes, int) or not 1 <= mes <= 12 or anio < 1:
+            raise ValidationException("Periodo de planilla invalido. El mes debe estar entre 1 y 12")
+
+        self.anio = anio
+        self.mes = mes
+        self.inicio_mes = date(anio, mes, 1)
+        self.dias_mes = calendar.monthrange(anio, mes)[1]
+        self.fin_mes = date(anio, mes, self.dias_mes)
+
+        self._cargar(personal, self._contratos_vigentes(contratos))
+        self._calcular()
+
+    # ========== RESULTADOS ==========
+    def libro(self) -> List[Dict[str, Any]]:
+        """
+        Detalle de la planilla, una fila por empleado
+
+        Returns:
+            List[Dict]: Filas ordenadas por ID de personal
+        """
+        return [
+            {
+                "id_personal": self.ids[i],
+                "nombre": self.nombres[i],
+                "rol": self.roles[i],
+                "departamentos": list(self.departamentos[i]),
+                "jornada": self.jornadas[i],
+                "turno": self.turnos[i],
+                "dias_trabajados": self.dias[i],
+                "salario_base": self.salarios[i],
+                "basico": round(self.basicos[i], 2),
+                "recargo_turno": round(self.recargos[i], 2),
+                "bono": round(self.bonos[i], 2),
+                "total": round(self.totales[i], 2)
+            }
+            for i in sorted(range(len(self.ids)), key=self.ids.__getitem__)
+        ]
+
+    def total(self) -> float:
+        """Monto total de la planilla"""
+        return round(sum(self.totales), 2)
+
+    def totales_por_rol(self) -> Dict[str, float]:
+        """Monto total de la planilla por rol"""
+        totales = defaultdict(float)
+        for rol, monto in zip(self.roles, self.totales):
+            totales[rol] += monto
+        return {rol: round(monto, 2) for rol, monto in totales.items()}
+
+    def totales_por_departamento(self) -> Dict[int, float]:
+        """
+        Monto total de la planilla por departamento
+
+        Un empleado en varios departamentos reparte su total en partes iguales,
+        asi la suma de los departamentos coincide con el total de la planilla.
+        """
+        totales = defaultdict(float)
+        for departamentos, monto in zip(self.departamentos, self.totales):
+            if not departamentos:
+                continue
+            parte = monto / len(departamentos)
+            for id_departamento in departamentos:
+                totales[id_departamento] += parte
+        return {id_departamento: round(monto, 2) for id_departamento, monto in sorted(totales.items())}
+
+    # ========== CARGA ==========
+    def _contratos_vigentes(self, contratos: Iterable[Dict]) -> Dict[Any, Dict]:
+        """Contrato que rige el mes para cada empleado: el de mayor ID iniciado antes de fin de mes"""
+        limite = self.fin_mes.isoformat()
+        vigentes = {}
+
+        for contrato in contratos:
+            if (contrato.get("fecha_inicio") or "") > limite:
+                continue
+            actual = vigentes.get(contrato.get("id_personal"))
+            if actual is None or contrato.get("id_contrato", 0) > actual.get("id_contrato", 0):
+                vigentes[contrato.get("id_personal")] = contrato
+        return vigentes
+
+    def _cargar(self, personal: Iterable[Dict], contratos: Dict[Any, Dict]) -> None:
+        """Pasa a columnas a los empleados que trabajaron al menos un dia del mes"""
+        self.ids: List[Any] = []
+        self.nombres: List[str] = []
+        self.roles: List[str] = []
+        self.departamentos: List[tuple] = []
+        self.jornadas: List[str] = []
+        self.turnos: List[str | None] = []
+        self.dias = array("i")
+        self.salarios = array("d")
+        self.anos = array("i")
+
+        for registro in personal:
+            contrato = contratos.get(registro.get("id_personal"))
+
+            # Dias trabajados: contratacion, baja y fin del contrato recortados al mes
+            inicio = max(date.fromisoformat(registro["fecha_contratacion"]), self.inicio_mes)
+            fin = self.fin_mes
+            if registro.get("fecha_baja"):
+                fin = min(fin, date.fromisoformat(registro["fecha_baja"]))
+            if contrato and contrato.get("tipo") == "Temporal" and contrato.get("fecha_fin"):
+                fin = min(fin, date.fromisoformat(contrato["fecha_fin"]))
+
+            dias = (fin - inicio).days + 1
+            if dias <= 0:
+                continue
+
+            contratacion = date.fromisoformat(registro["fecha_contratacion"])
+            anos = self.fin_mes.year - contratacion.year - ((self.fin_mes.month, self.fin_mes.day) < (contratacion.month, contratacion.day))
+
+            self.ids.append(registro.get("id_personal"))
+            self.nombres.append(registro.get("nombre"))
+            self.roles.append(registro.get("rol"))
+            self.departamentos.append(tuple(registro.get("departamentos") or ()))
+            self.jornadas.append(registro.get("jornada"))
+            self.turnos.append(registro.get("turno"))
+            self.dias.append(dias)
+            self.salarios.append(float((contrato or registro).get("salario_base") or 0))
+            self.anos.append(max(anos, 0))
+
+    # ========== CALCULO ==========
+    def _calcular(self) -> None:
+        """Aplica cada regla a la columna completa"""
+        dias_mes = self.dias_mes
+
+        prorrateos = array("d", (dias / dias_mes for dias in self.dias))
+        factores = array("d", (FACTORES_JORNADA.get(jornada, 1.0) for jornada in self.jornadas))
+
+        self.basicos = array("d", (s * f * p for s, f, p in zip(self.salarios, factores, prorrateos)))
+
+        self.recargos = array("d", (b * RECARGOS_TURNO.get(turno, 0.0) for b, turno in zip(self.basicos, self.turnos)))
+
+        self.bonos = array("d", (
+            BONOS_ROL.get(rol, 0.0) * p + b * min(anos, TOPE_ANOS_ANTIGUEDAD) * BONO_ANTIGUEDAD_ANUAL
+            for rol, p, b, anos in zip(self.roles, prorrateos, self.basicos, self.anos)
+        ))
+
+        self.totales = array("d", (b + r + o for b, r, o in zip(self.basicos, self.recargos, self.bonos)))
@@ -0,0 +1,137 @@
+"""
+Paginacion por cursor de los listados
+
+En vez de numeros de pagina se usa un cursor con el ultimo ID mostrado: la
+siguiente pagina son los registros con ID mayor. Asi una pagina no depende de
+cuantos registros se agregaron antes y no hace falta cargar el archivo completo.
+
+"""
+import base64
+import heapq
+import json
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+from src.utils.excepciones import ValidationException
+
+class Paginacion:
+
+    @staticmethod
+    def codificar_cursor(ultimo_id: Any) -> str:
+        """
+        Convierte el ultimo ID de una pagina en un cursor opaco
+
+        Args:
+            ultimo_id: ID del ultimo registro mostrado
+
+        Returns:
+            str: Cursor (texto seguro para guardar o enviar)
+        """
+        texto = json.dumps({"despues_de": ultimo_id})
+        return base64.urlsafe_b64encode(texto.encode("utf-8")).decode("ascii")
+
+    @staticmethod
+    def decodificar_cursor(cursor: str | None) -> Any:
+        """
+        Recupera el ultimo ID guardado en un cursor
+
+        Args:
+            cursor: Cursor devuelto por la pagina anterior (None = primera pagina)
+
+        Returns:
+            Any: Ultimo ID mostrado o None
+
+        Raises:
+            ValidationException: Si el cursor no es valido
+        """
+        if cursor is None:
+            return None
+
+        try:
+            texto = base64.urlsafe_b64decode(cursor.encode("ascii")).decode("utf-8")
+            return json.loads(texto)["despues_de"]
+        except Exception:
+            raise ValidationException("Cursor de pagina invalido")
+
+    @staticmethod
+    def pagina(
+        registros: Iterable[Dict],
+        campo_id: str,
+        tamano: int,
+        cursor: str | None = None,
+        condicion: Callable[[Dict], bool] | None = None
+    ) -> Tuple[List[Dict], Optional[str]]:
+        """
+        Toma la siguiente pagina de un recorrido de registros
+
+        Solo se guardan en memoria los registros de la pagina (mas uno para
+        saber si hay otra pagina), sin importar cuantos registros se recorran.
+
+        Args:
+            registros: Registros a paginar (ej: Persistencia.iterar())
+            campo_id: Campo por el que se ordena y se corta la pagina
+            tamano: Registros por pagina
+            cursor: Cursor de la pagina anterior (None = primera pagina)
+            condicion: Filtro opcional de los registros
+
+        Returns:
+            Tuple[List[Dict], Optional[str]]: (registros de la pagina, cursor de la siguiente o None)
+
+        Raises:
+            ValidationException: Tamano o cursor invalidos
+        """
+        if not isinstance(tamano, int) or tamano <= 0:
+            raise ValidationException("El tamano de pagina debe ser un numero entero positivo")
+
+        despues_de = Paginacion.decodificar_cursor(cursor)
+
+        candidatos = (
+            registro for registro in registros
+            if registro.get(campo_id) is not None
+            and (despues_de is None or registro.get(campo_id) > despues_de)
+            and (condicion is None or condicion(registro))
+        )
+
+        # Los tamano + 1 menores IDs despues del cursor
+        seleccion = heapq.nsmallest(tamano + 1, candidatos, key=lambda registro: registro[campo_id])
+
+        if len(seleccion) <= tamano:
+            return seleccion, None
+
+        pagina = seleccion[:tamano]
+        return pagina, Paginacion.codificar_cursor(pagina[-1][campo_id])
+
+    @staticmethod
+    def pagina_indice(
+        indice: Any,
+        tamano: int,
+        cursor: str | None = None,
+        condicion: Callable[[Dict], bool] | None = None
+    ) -> Tuple[List[Dict], Optional[str]]:
+        """
+        Toma la siguiente pagina desde un indice primario ordenado por ID
+
+        La pagina empieza con una busqueda binaria del cursor en el indice: el
+        costo depende del tamano de la pagina, no de cuantas paginas hay antes.
+
+        Args:
+            indice: Indice con siguientes(despues_de, cantidad, condicion) (ej: IndicePrimario)
+            tamano: Registros por pagina
+            cursor: Cursor de la pagina anterior (None = primera pagina)
+            condicion: Filtro opcional de los registros
+
+        Returns:
+            Tuple[List[Dict], Optional[str]]: (registros de la pagina, cursor de la siguiente o None)
+
+        Raises:
+            ValidationException: Tamano o cursor invalidos
+        """
+        if not isinstance(tamano, int) or tamano <= 0:
+            raise ValidationException("El tamano de pagina debe ser un numero entero positivo")
+
+        despues_de = Paginacion.decodificar_cursor(cursor)
+        seleccion = indice.siguientes(despues_de, tamano + 1, condicion)
+
+        if len(seleccion) <= tamano:
+            return seleccion, None
+
+        pagina = seleccion[:tamano]
+        return pagina, Paginacion.codificar_cursor(pagina[-1][indice.campo_id])
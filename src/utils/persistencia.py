@@ -4,13 +4,27 @@ Manejo de operaciones sobre archivos JSON
 """
 import json
 import os
-from typing import List, Dict, Any, Optional
+import re
+import weakref
+from typing import List, Dict, Any, Optional, Tuple, Iterator
 class Persistencia:
     """
     Maneja operaciones CRUD sobre archivos JSON.
     
     Cada instancia trabaja con UN archivo JSON específico.
+    
+    Los indices en memoria (ver src/utils/indices.py) se registran por archivo y
+    son notificados en cada escritura, sin importar que instancia la realice.
     """
+    
+    # Contador de escrituras por archivo (ruta absoluta) compartido por todas las instancias
+    _contadores_escritura: Dict[str, int] = {}
+    
+    # Indices registrados por archivo (ruta absoluta)
+    _indices: Dict[str, "weakref.WeakSet"] = {}
+    
+    # Espacios y comas entre registros (ver iterar)
+    _SEPARADORES = re.compile(r"[\s,]*")
 
     def __init__(self, archivo: str):
         """
@@ -22,6 +36,7 @@ class Persistencia:
         """
         
         self.archivo = archivo
+        self.ruta = os.path.abspath(archivo)
         # Nos aseguramos que el archivo exista
         self._inicializar_archivo()
 
@@ -59,6 +74,69 @@ class Persistencia:
         except Exception as e:
             raise Exception(f"Error al leer {self.archivo}: {str(e)}")
 
+    def iterar(self, tamano_lectura: int = 65536) -> Iterator[Dict]:
+        """
+        Recorre los registros del archivo de uno en uno sin cargarlo completo
+        
+        El archivo se lee por partes y cada registro se decodifica apenas esta
+        completo, asi la memoria usada depende del tamano de un registro y no
+        del archivo.
+        
+        Args:
+            tamano_lectura (int): Caracteres que se leen del disco por vez
+        
+        Yields:
+            Dict: Cada registro en el orden del archivo
+        """
+        decodificador = json.JSONDecoder()
+        
+        try:
+            with open(self.archivo, 'r', encoding='utf-8') as f:
+                buffer = ""
+                posicion = 0
+                dentro_de_lista = False
+                
+                while True:
+                    # Saltar espacios y comas entre registros (leyendo mas si hace falta)
+                    posicion = Persistencia._SEPARADORES.match(buffer, posicion).end()
+                    
+                    if posicion >= len(buffer):
+                        parte = f.read(tamano_lectura)
+                        if not parte:
+                            return
+                        buffer, posicion = parte, 0
+                        continue
+                    
+                    # El archivo debe ser una lista de registros
+                    if not dentro_de_lista:
+                        if buffer[posicion] != "[":
+                            return
+                        dentro_de_lista = True
+                        posicion += 1
+                        continue
+                    
+                    if buffer[posicion] == "]":
+                        return
+                    
+                    # Decodificar el siguiente registro; si esta cortado se lee otra parte
+                    try:
+                        registro, posicion = decodificador.raw_decode(buffer, posicion)
+                    except json.JSONDecodeError:
+                        parte = f.read(tamano_lectura)
+                        if not parte:
+                            return
+                        buffer, posicion = buffer[posicion:] + parte, 0
+                        continue
+                    
+                    yield registro
+                    
+                    # Descartar lo ya procesado
+                    if posicion > tamano_lectura:
+                        buffer, posicion = buffer[posicion:], 0
+        
+        except Exception as e:
+            raise Exception(f"Error al leer {self.archivo}: {str(e)}")
+
     def guardar_todos(self, datos: List[Dict]) -> bool:
         """
         Sobrescribe el archivo con nuevos datos
@@ -70,10 +148,16 @@ class Persistencia:
             bool: True si se guardaron los datos correctamente
 
         """
-        # Sobreescribimos el archivo con los nuevos datos
+        # Sobreescribimos el archivo con los nuevos datos (se escribe a un temporal
+        # y se reemplaza, asi un corte a mitad de escritura no deja el archivo roto)
         try:
-            with open(self.archivo, 'w', encoding='utf-8') as f:
+            temporal = f"{self.archivo}.tmp"
+            with open(temporal, 'w', encoding='utf-8') as f:
                 json.dump(datos, f, ensure_ascii=False, indent=2)
+            os.replace(temporal, self.archivo)
+            
+            # Cada escritura cambia la version del archivo
+            Persistencia._contadores_escritura[self.ruta] = Persistencia._contadores_escritura.get(self.ruta, 0) + 1
             return True
         
         # Se lanza un Exception si algo salio mal
@@ -91,14 +175,21 @@ class Persistencia:
             bool: True si se guardo correctamente
         
         """
+        version_antes = self.version()
+        
         # Capturamos todos los datos del archivo
         datos = self.leer_todos()
         
+        # Los indices revisan sus reglas antes de escribir (ej: DNI unico)
+        self._validar([(None, registro)])
+        
         # Agregamos el registro
         datos.append(registro)
         
-        # Llamamos al metodo de guardar todo y retornamos su resultado
-        return self.guardar_todos(datos)
+        # Guardamos y avisamos a los indices del archivo
+        resultado = self.guardar_todos(datos)
+        self._notificar([(None, registro)], version_antes)
+        return resultado
 
     def buscar_por_id(self, id_valor: int, campo_id: str | None = None) -> Optional[Dict]:
         """
@@ -171,17 +262,64 @@ class Persistencia:
             nombre_archivo = os.path.basename(self.archivo).replace('.json', '')
             campo_id = f"id_{nombre_archivo[:-1]}" if nombre_archivo.endswith('s') else f"id_{nombre_archivo}"
             
+        version_antes = self.version()
         datos = self.leer_todos()
         
         # Buscamos el registro por ID para actualizar los datos
         for registro in datos:
             if registro.get(campo_id) == id_valor:
+                anterior = dict(registro)
+                self._validar([(anterior, {**registro, **campos_actualizar})])
                 registro.update(campos_actualizar)
-                return self.guardar_todos(datos)
+                resultado = self.guardar_todos(datos)
+                self._notificar([(anterior, registro)], version_antes)
+                return resultado
         
         # Si no se encontro se retorna False
         return False
 
+    def actualizar_varios(self, cambios: Dict[Any, Dict], campo_id: str | None = None) -> int:
+        """
+        Actualiza varios registros con una sola lectura y una sola escritura
+        
+        Args:
+            cambios (Dict[Any, Dict]): {ID: campos a actualizar}
+            campo_id (str | None): Nombre del campo del ID
+            
+        Returns:
+            int: Cantidad de registros actualizados
+        """
+        if not cambios:
+            return 0
+        
+        # Si no se especifico el nombre del campo del ID se infiere mendiente el nombre del archivo
+        if campo_id is None:
+            nombre_archivo = os.path.basename(self.archivo).replace('.json', '')
+            campo_id = f"id_{nombre_archivo[:-1]}" if nombre_archivo.endswith('s') else f"id_{nombre_archivo}"
+        
+        version_antes = self.version()
+        datos = self.leer_todos()
+        
+        # Aplicar los cambios en memoria guardando la version anterior de cada registro
+        pares = []
+        for registro in datos:
+            campos = cambios.get(registro.get(campo_id))
+            if campos is not None:
+                anterior = dict(registro)
+                registro.update(campos)
+                pares.append((anterior, registro))
+        
+        if not pares:
+            return 0
+        
+        # Si el lote rompe una regla de algun indice no se escribe nada
+        self._validar(pares)
+        
+        # Una sola escritura y una sola notificacion para todo el lote
+        self.guardar_todos(datos)
+        self._notificar(pares, version_antes)
+        return len(pares)
+
     def eliminar(self, id_valor: int, campo_id: str | None = None) -> bool:
         """
         Elimina un registro (NO usar en Personal/Pacientes)
@@ -202,13 +340,17 @@ class Persistencia:
             nombre_archivo = os.path.basename(self.archivo).replace('.json', '')
             campo_id = f"id_{nombre_archivo[:-1]}" if nombre_archivo.endswith('s') else f"id_{nombre_archivo}"
             
+        version_antes = self.version()
         datos = self.leer_todos()
         
         # Se guardan los registros que no tengan ese ID
         datos_obtenidos = [dato for dato in datos if dato.get(campo_id) != id_valor]
         
         if len(datos_obtenidos) < len(datos):
-            return self.guardar_todos(datos_obtenidos)
+            eliminados = [dato for dato in datos if dato.get(campo_id) == id_valor]
+            resultado = self.guardar_todos(datos_obtenidos)
+            self._notificar([(dato, None) for dato in eliminados], version_antes)
+            return resultado
         return False
 
     def generar_id_autoincremental(self, campo_id: str | None = None) -> int:
@@ -235,3 +377,98 @@ class Persistencia:
         # En contramos el mayor ID y retornamos (mayor + 1)
         maximo_id = max([dato.get(campo_id, 0) for dato in datos])
         return maximo_id + 1
+
+    def campo_id_por_defecto(self) -> str:
+        """
+        Infiere el nombre del campo ID mediante el nombre del archivo
+        
+        Returns:
+            str: Nombre del campo ID (ej: data/citas.json -> id_cita)
+        """
+        nombre_archivo = os.path.basename(self.archivo).replace('.json', '')
+        return f"id_{nombre_archivo[:-1]}" if nombre_archivo.endswith('s') else f"id_{nombre_archivo}"
+
+    def guardar_lote(self, datos: List[Dict], cambios: List[Tuple[Optional[Dict], Optional[Dict]]], version_antes: Tuple[int, int, int]) -> bool:
+        """
+        Guarda datos ya modificados en memoria y avisa a los indices los cambios
+        
+        Lo usan las operaciones que preparan varios cambios antes de escribir
+        (ver src/utils/transaccion.py)
+        
+        Args:
+            datos (List[Dict]): Contenido completo del archivo
+            cambios (List[Tuple]): Pares (registro anterior, registro nuevo)
+            version_antes (Tuple): Version del archivo cuando se leyeron los datos
+        
+        Returns:
+            bool: True si se guardaron los datos correctamente
+        """
+        self._validar(cambios)
+        resultado = self.guardar_todos(datos)
+        self._notificar(cambios, version_antes)
+        return resultado
+
+    # ========== VERSIONES E INDICES ==========
+    def version(self) -> Tuple[int, int, int]:
+        """
+        Devuelve un identificador de la version actual del archivo
+        
+        Cambia con cada escritura hecha por el programa (contador) y tambien si
+        el archivo fue modificado desde afuera (fecha de modificacion y tamano)
+        
+        Returns:
+            Tuple[int, int, int]: (escrituras, fecha de modificacion en ns, tamano en bytes)
+        """
+        escrituras = Persistencia._contadores_escritura.get(self.ruta, 0)
+        
+        try:
+            estado = os.stat(self.archivo)
+        except OSError:
+            return (escrituras, 0, 0)
+        
+        return (escrituras, estado.st_mtime_ns, estado.st_size)
+
+    def registrar_indice(self, indice: Any) -> None:
+        """
+        Registra un indice para que sea notificado en cada escritura del archivo
+        
+        Args:
+            indice (IndiceBase): Indice que depende de este archivo
+        """
+        if self.ruta not in Persistencia._indices:
+            Persistencia._indices[self.ruta] = weakref.WeakSet()
+        
+        Persistencia._indices[self.ruta].add(indice)
+
+    def _validar(self, cambios: List[Tuple[Optional[Dict], Optional[Dict]]]) -> None:
+        """
+        Pide a los indices registrados que revisen los cambios antes de escribir
+        
+        Args:
+            cambios (List[Tuple]): Pares (registro anterior, registro nuevo). None si no existe
+        
+        Raises:
+            HospitalException: La que lance el indice si un cambio rompe su regla
+        """
+        indices = Persistencia._indices.get(self.ruta)
+        if not indices:
+            return
+        
+        for indice in list(indices):
+            indice.validar(self.ruta, cambios)
+
+    def _notificar(self, cambios: List[Tuple[Optional[Dict], Optional[Dict]]], version_antes: Tuple[int, int, int]) -> None:
+        """
+        Avisa a los indices registrados los cambios de una escritura
+        
+        Args:
+            cambios (List[Tuple]): Pares (registro anterior, registro nuevo). None si no existe
+            version_antes (Tuple): Version del archivo antes de la escritura
+        """
+        indices = Persistencia._indices.get(self.ruta)
+        if not indices:
+            return
+        
+        version_despues = self.version()
+        for indice in list(indices):
+            indice.notificar(self.ruta, cambios, version_antes, version_despues)
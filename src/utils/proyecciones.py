@@ -0,0 +1,466 @@
+"""
+Proyecciones en memoria que combinan varios archivos JSON
+
+A diferencia de los indices de src/utils/indices.py, que ordenan los registros
+de un archivo, una proyeccion guarda datos ya calculados a partir de varios
+archivos. Se mantienen al dia con las mismas notificaciones de Persistencia,
+asi mostrarlas cuesta una busqueda en un diccionario.
+
+"""
+import atexit
+import json
+import os
+from bisect import insort, bisect_left
+from datetime import date, time
+from typing import Dict, Any, List, Optional, Tuple
+from src.utils.persistencia import Persistencia
+from src.utils.indices import IndiceBase, MapaOcupacion
+from src.utils.helpers import Helpers
+from src.config.constantes import HORARIOS_TURNO, HORARIOS_JORNADA
+
+class ResumenPacientes(IndiceBase):
+    """
+    Resumen de cada paciente para las pantallas de busqueda
+
+    Por paciente guarda sus datos basicos, las fechas de sus consultas, sus
+    citas Agendadas y sus facturas Pendientes. La edad se calcula al leer
+    (depende del dia actual).
+
+    Ejemplo:
+        >>> resumen = ResumenPacientes.compartido(pacientes, citas, consultas, facturas)
+        >>> resumen.obtener(3)
+        {"id_paciente": 3, "edad": 41, "visitas": 5, "ultima_visita": "2026-02-11", ...}
+    """
+
+    def __init__(self, pacientes: Persistencia, citas: Persistencia,
+                 consultas: Persistencia, facturas: Persistencia) -> None:
+        """
+        Args:
+            pacientes (Persistencia): data/pacientes.json
+            citas (Persistencia): data/citas.json
+            consultas (Persistencia): data/consultas.json
+            facturas (Persistencia): data/facturas.json
+        """
+        self._manejadores = {
+            pacientes.ruta: self._aplicar_paciente,
+            citas.ruta: self._aplicar_cita,
+            consultas.ruta: self._aplicar_consulta,
+            facturas.ruta: self._aplicar_factura
+        }
+        self._resumenes: Dict[Any, Dict[str, Any]] = {}
+        super().__init__(pacientes, citas, consultas, facturas)
+
+    def obtener(self, id_paciente: Any) -> Optional[Dict[str, Any]]:
+        """
+        Devuelve el resumen listo para mostrar de un paciente
+
+        Returns:
+            Optional[Dict]: Resumen o None si el paciente no existe
+        """
+        self.asegurar()
+        resumen = self._resumenes.get(id_paciente)
+        if resumen is None or resumen["datos"] is None:
+            return None
+
+        datos = resumen["datos"]
+        visitas = resumen["visitas"]
+        citas = resumen["citas"]
+
+        return {
+            **datos,
+            "edad": Helpers.calcular_edad(date.fromisoformat(datos["fecha_nacimiento"])),
+            "visitas": len(visitas),
+            "ultima_visita": visitas[-1][:10] if visitas else None,
+            "citas_pendientes": len(citas),
+            "proxima_cita": f"{citas[0][0]} {citas[0][1][:5]}" if citas else None,
+            "facturas_pendientes": len(resumen["facturas"]),
+            "monto_pendiente": round(sum(resumen["facturas"].values()), 2)
+        }
+
+    # ========== MANTENIMIENTO ==========
+    def _limpiar(self) -> None:
+        self._resumenes = {}
+
+    def _agregar(self, registro: Dict, ruta: str) -> None:
+        self._manejadores[ruta](registro, True)
+
+    def _quitar(self, registro: Dict, ruta: str) -> None:
+        self._manejadores[ruta](registro, False)
+
+    def _resumen(self, id_paciente: Any) -> Dict[str, Any]:
+        """Devuelve (o crea) el resumen interno de un paciente"""
+        if id_paciente not in self._resumenes:
+            self._resumenes[id_paciente] = {"datos": None, "visitas": [], "citas": [], "facturas": {}}
+        return self._resumenes[id_paciente]
+
+    def _aplicar_paciente(self, registro: Dict, agregar: bool) -> None:
+        resumen = self._resumen(registro.get("id_paciente"))
+
+        if not agregar:
+            resumen["datos"] = None
+            return
+
+        resumen["datos"] = {
+            "id_paciente": registro.get("id_paciente"),
+            "dni": registro.get("dni"),
+            "nombre": registro.get("nombre"),
+            "fecha_nacimiento": registro.get("fecha_nacimiento"),
+            "telefono": registro.get("telefono"),
+            "tipo_seguro": registro.get("tipo_seguro"),
+            "porcentaje_descuento": registro.get("porcentaje_descuento"),
+            "fecha_registro": registro.get("fecha_registro"),
+            "historial_consultas": list(registro.get("historial_consultas") or [])
+        }
+
+    def _aplicar_cita(self, registro: Dict, agregar: bool) -> None:
+        # Solo cuentan las citas que siguen pendientes
+        if registro.get("estado") != "Agendada":
+            return
+
+        self._aplicar_ordenado(self._resumen(registro.get("id_paciente"))["citas"],
+                               (registro.get("fecha"), registro.get("hora"), registro.get("id_cita")), agregar)
+
+    def _aplicar_consulta(self, registro: Dict, agregar: bool) -> None:
+        self._aplicar_ordenado(self._resumen(registro.get("id_paciente"))["visitas"],
+                               registro.get("fecha_hora") or "", agregar)
+
+    def _aplicar_factura(self, registro: Dict, agregar: bool) -> None:
+        # Solo cuentan las facturas por pagar
+        if registro.get("estado") != "Pendiente":
+            return
+
+        facturas = self._resumen(registro.get("id_paciente"))["facturas"]
+        if agregar:
+            facturas[registro.get("id_factura")] = float(registro.get("total") or 0)
+        else:
+            facturas.pop(registro.get("id_factura"), None)
+
+    @staticmethod
+    def _aplicar_ordenado(lista: list, valor: Any, agregar: bool) -> None:
+        """Inserta el valor en su posicion o quita una aparicion del valor"""
+        if agregar:
+            insort(lista, valor)
+            return
+
+        posicion = bisect_left(lista, valor)
+        if posicion < len(lista) and lista[posicion] == valor:
+            del lista[posicion]
+
+
+class ContadoresPersonal(IndiceBase):
+    """
+    Contadores del personal para los reportes de RRHH
+
+    - estado_rol: personal por (rol, estado)
+    - departamento: personal activo por departamento (un empleado cuenta en cada uno de sus departamentos)
+    - jornada_turno: personal activo por (jornada, turno)
+
+    Cada registro, modificacion o baja ajusta los contadores con la
+    notificacion de Persistencia, asi mostrar un reporte no recorre el archivo.
+    Los contadores se guardan en un archivo cache con la firma del archivo de
+    personal (igual que IndiceTexto): al iniciar, si la firma coincide no se
+    relee data/personal.json.
+
+    Ejemplo:
+        >>> contadores = ContadoresPersonal.compartido(persistencia, ruta_cache="data/contadores_personal.json")
+        >>> contadores.por_rol()
+        {"Doctor": {"Activo": 12, "Inactivo": 2}, ...}
+    """
+
+    # Cambia si cambia el formato del cache (obliga a reconstruir)
+    VERSION_CACHE = 1
+
+    CONTADORES = ("estado_rol", "departamento", "jornada_turno")
+
+    def __init__(self, persistencia: Persistencia, ruta_cache: str | None = None) -> None:
+        """
+        Args:
+            persistencia (Persistencia): data/personal.json
+            ruta_cache (str | None): Archivo donde se guardan los contadores (None = no se guardan)
+        """
+        self.persistencia = persistencia
+        self.ruta_cache = ruta_cache
+        self._contadores: Dict[str, Dict[Any, int]] = {nombre: {} for nombre in self.CONTADORES}
+        self._cache_revisado = False
+        self._cambios_sin_guardar = False
+        super().__init__(persistencia)
+
+        if self.ruta_cache:
+            atexit.register(self.guardar_cache)
+
+    # ========== CONSULTAS ==========
+    def por_rol(self) -> Dict[str, Dict[str, int]]:
+        """Personal por rol y estado: {rol: {"Activo": n, "Inactivo": n}}"""
+        self.asegurar()
+        resultado: Dict[str, Dict[str, int]] = {}
+        for (rol, estado), cantidad in self._contadores["estado_rol"].items():
+            resultado.setdefault(rol, {})[estado] = cantidad
+        return resultado
+
+    def por_departamento(self) -> Dict[Any, int]:
+        """Personal activo por departamento: {id_departamento: n}"""
+        self.asegurar()
+        return dict(self._contadores["departamento"])
+
+    def por_jornada_turno(self) -> Dict[Tuple[str, str | None], int]:
+        """Personal activo por jornada y turno: {(jornada, turno): n}"""
+        self.asegurar()
+        return dict(self._contadores["jornada_turno"])
+
+    def diferencias(self) -> List[Tuple[str, Any, int, int]]:
+        """
+        Compara los contadores actuales con unos calculados desde cero
+
+        Returns:
+            List[Tuple]: (contador, clave, valor actual, valor correcto) de cada diferencia
+        """
+        self.asegurar()
+        correctos = ContadoresPersonal(self.persistencia)
+        correctos.reconstruir()
+
+        resultado = []
+        for nombre in self.CONTADORES:
+            actuales = self._contadores[nombre]
+            esperados = correctos._contadores[nombre]
+            for clave in sorted(actuales.keys() | esperados.keys(), key=str):
+                if actuales.get(clave, 0) != esperados.get(clave, 0):
+                    resultado.append((nombre, clave, actuales.get(clave, 0), esperados.get(clave, 0)))
+        return resultado
+
+    # ========== CACHE ==========
+    def reconstruir(self) -> None:
+        """Carga el cache si sigue vigente; si no, reconstruye y lo guarda"""
+        if not self._cache_revisado:
+            self._cache_revisado = True
+            if self._cargar_cache():
+                return
+
+        super().reconstruir()
+        self._cambios_sin_guardar = True
+        self.guardar_cache()
+
+    def notificar(self, ruta: str, cambios: List[Tuple[Optional[Dict], Optional[Dict]]],
+                  version_antes: tuple, version_despues: tuple) -> None:
+        super().notificar(ruta, cambios, version_antes, version_despues)
+        self._cambios_sin_guardar = True
+
+    def guardar_cache(self) -> None:
+        """Guarda los contadores en disco si tienen cambios y estan al dia con su archivo"""
+        if not self.ruta_cache or not self._cambios_sin_guardar:
+            return
+
+        version = self.persistencia.version()
+        if self._versiones.get(self.persistencia.ruta) != version:
+            return
+
+        contenido = {
+            "version_cache": self.VERSION_CACHE,
+            "archivo": self.persistencia.archivo,
+            "firma": list(version[1:]),
+            "contadores": {
+                nombre: [[list(clave) if isinstance(clave, tuple) else clave, cantidad] for clave, cantidad in contador.items()]
+                for nombre, contador in self._contadores.items()
+            }
+        }
+
+        try:
+            temporal = f"{self.ruta_cache}.tmp"
+            with open(temporal, 'w', encoding='utf-8') as f:
+                json.dump(contenido, f, ensure_ascii=False)
+            os.replace(temporal, self.ruta_cache)
+            self._cambios_sin_guardar = False
+        except OSError:
+            # Sin cache solo se pierde tiempo en el siguiente inicio
+            return
+
+    def _cargar_cache(self) -> bool:
+        """Carga el cache si corresponde a la version actual del archivo"""
+        if not self.ruta_cache or not os.path.exists(self.ruta_cache):
+            return False
+
+        version = self.persistencia.version()
+        try:
+            with open(self.ruta_cache, 'r', encoding='utf-8') as f:
+                contenido = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return False
+
+        if contenido.get("version_cache") != self.VERSION_CACHE or contenido.get("firma") != list(version[1:]):
+            return False
+
+        self._limpiar()
+        for nombre in self.CONTADORES:
+            for clave, cantidad in contenido["contadores"].get(nombre, []):
+                self._contadores[nombre][tuple(clave) if isinstance(clave, list) else clave] = cantidad
+
+        self._versiones[self.persistencia.ruta] = version
+        return True
+
+    # ========== MANTENIMIENTO ==========
+    def _limpiar(self) -> None:
+        self._contadores = {nombre: {} for nombre in self.CONTADORES}
+
+    def _agregar(self, registro: Dict, ruta: str) -> None:
+        self._aplicar(registro, 1)
+
+    def _quitar(self, registro: Dict, ruta: str) -> None:
+        self._aplicar(registro, -1)
+
+    def _aplicar(self, registro: Dict, delta: int) -> None:
+        """Suma o resta el registro en cada contador"""
+        self._sumar("estado_rol", (registro.get("rol"), registro.get("estado")), delta)
+
+        if registro.get("estado") != "Activo":
+            return
+
+        for id_departamento in registro.get("departamentos") or []:
+            self._sumar("departamento", id_departamento, delta)
+        self._sumar("jornada_turno", (registro.get("jornada"), registro.get("turno")), delta)
+
+    def _sumar(self, nombre: str, clave: Any, delta: int) -> None:
+        contador = self._contadores[nombre]
+        cantidad = contador.get(clave, 0) + delta
+        if cantidad:
+            contador[clave] = cantidad
+        else:
+            contador.pop(clave, None)
+
+
+class DisponibilidadPersonal(IndiceBase):
+    """
+    Horario en que cada miembro del personal atiende citas, como mascara de bits
+
+    Usa los mismos 60 bloques de 15 minutos que MapaOcupacion. La mascara
+    base sale del turno (jornada "Por turnos") o de la jornada y se guarda
+    por empleado; las excepciones (data/excepciones_horario.json) se guardan
+    por (empleado, fecha) como bloques a quitar (Ausencia) y a agregar
+    (Horario extra). La mascara de un dia se arma con dos operaciones de bits.
+
+    Ejemplo:
+        >>> disponibilidad = DisponibilidadPersonal.compartido(personal, excepciones)
+        >>> disponibilidad.mascara(3, date(2026, 11, 2)) == MapaOcupacion.mascara_entre(time(13, 0), time(19, 0))
+        True
+    """
+
+    def __init__(self, personal: Persistencia, excepciones: Persistencia) -> None:
+        """
+        Args:
+            personal (Persistencia): data/personal.json
+            excepciones (Persistencia): data/excepciones_horario.json
+        """
+        self._manejadores = {
+            personal.ruta: self._aplicar_personal,
+            excepciones.ruta: self._aplicar_excepcion
+        }
+        self._base: Dict[Any, int] = {}
+        self._excepciones: Dict[tuple, Dict[Any, Tuple[int, int]]] = {}
+        self._ajustes: Dict[tuple, Tuple[int, int]] = {}
+        super().__init__(personal, excepciones)
+
+    # ========== CONSULTAS ==========
+    def mascara(self, id_personal: Any, fecha: date) -> int:
+        """
+        Devuelve los bloques en que el empleado atiende ese dia
+
+        Returns:
+            int: Mascara de bloques (0 si no atiende o no esta activo)
+        """
+        self.asegurar()
+        base = self._base.get(id_personal)
+        if base is None:
+            return 0
+
+        quitar, agregar = self._ajustes.get((id_personal, fecha.isoformat()), (0, 0))
+        return (base & ~quitar) | agregar
+
+    def disponible(self, id_personal: Any, fecha: date, hora: time) -> bool:
+        """
+        Verifica si el bloque que contiene la hora esta dentro del horario del empleado
+
+        Returns:
+            bool: True si atiende en ese bloque | False si no (o si esta fuera del horario de atencion)
+        """
+        bloque = MapaOcupacion.bloque_de(hora)
+        if bloque < 0:
+            return False
+
+        return bool((self.mascara(id_personal, fecha) >> bloque) & 1)
+
+    def filtrar(self, ids: List[Any], fecha: date, hora: time) -> List[Any]:
+        """
+        Filtra los empleados que atienden a esa hora
+
+        Returns:
+            List[Any]: IDs en el mismo orden recibido
+        """
+        return [id_personal for id_personal in ids if self.disponible(id_personal, fecha, hora)]
+
+    @staticmethod
+    def mascara_jornada(jornada: str | None, turno: str | None) -> int:
+        """
+        Mascara base segun el turno (jornada "Por turnos") o la jornada
+
+        Sin horario definido para la jornada no se restringe (todo el dia).
+
+        Returns:
+            int: Mascara de bloques
+        """
+        if jornada == "Por turnos":
+            horario = HORARIOS_TURNO.get(turno)
+        else:
+            horario = HORARIOS_JORNADA.get(jornada)
+
+        if horario is None:
+            return MapaOcupacion.DIA_COMPLETO
+
+        return MapaOcupacion.mascara_entre(time(horario[0], 0), time(horario[1], 0))
+
+    # ========== MANTENIMIENTO ==========
+    def _limpiar(self) -> None:
+        self._base = {}
+        self._excepciones = {}
+        self._ajustes = {}
+
+    def _agregar(self, registro: Dict, ruta: str) -> None:
+        self._manejadores[ruta](registro, True)
+
+    def _quitar(self, registro: Dict, ruta: str) -> None:
+        self._manejadores[ruta](registro, False)
+
+    def _aplicar_personal(self, registro: Dict, agregar: bool) -> None:
+        # Solo el personal activo tiene horario
+        if not agregar or registro.get("estado") != "Activo":
+            self._base.pop(registro.get("id_personal"), None)
+            return
+
+        self._base[registro.get("id_personal")] = self.mascara_jornada(registro.get("jornada"), registro.get("turno"))
+
+    def _aplicar_excepcion(self, registro: Dict, agregar: bool) -> None:
+        clave = (registro.get("id_personal"), registro.get("fecha"))
+        excepciones = self._excepciones.setdefault(clave, {})
+
+        if agregar:
+            if registro.get("hora_inicio") and registro.get("hora_fin"):
+                bloques = MapaOcupacion.mascara_entre(time.fromisoformat(registro["hora_inicio"]),
+                                                      time.fromisoformat(registro["hora_fin"]))
+            else:
+                bloques = MapaOcupacion.DIA_COMPLETO
+
+            if registro.get("tipo") == "Horario extra":
+                excepciones[registro.get("id_excepcion")] = (0, bloques)
+            else:
+                excepciones[registro.get("id_excepcion")] = (bloques, 0)
+        else:
+            excepciones.pop(registro.get("id_excepcion"), None)
+
+        # Combinar las excepciones del dia (suelen ser una o dos)
+        if not excepciones:
+            del self._excepciones[clave]
+            self._ajustes.pop(clave, None)
+            return
+
+        ausencias = extras = 0
+        for quitar, sumar in excepciones.values():
+            ausencias |= quitar
+            extras |= sumar
+        self._ajustes[clave] = (ausencias, extras)
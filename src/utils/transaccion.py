@@ -0,0 +1,432 @@
+"""
+Transacciones sobre varios archivos JSON con diario de recuperacion
+
+"""
+from copy import deepcopy
+from datetime import datetime
+from typing import List, Dict, Any, Optional, Callable
+from src.utils.persistencia import Persistencia
+
+class Transaccion:
+    """
+    Agrupa los cambios de una operacion que toca varios archivos
+
+    Los cambios se preparan en memoria (cada archivo se lee una sola vez) y al
+    confirmar se escribe cada archivo una sola vez. Antes de escribir, el
+    diario (data/transacciones.json) guarda la version anterior de cada
+    registro tocado y los pasos externos ya realizados (ej: descontar stock)
+    junto con la accion que los compensa. Asi:
+
+    - Si algo falla antes de confirmar, revertir es descartar lo preparado y
+      ejecutar las compensaciones: no se relee ningun archivo.
+    - Si algo falla despues de confirmar, se restauran las versiones
+      anteriores guardadas en el diario (una escritura por archivo).
+    - Si el programa se corta a mitad, la transaccion sigue en el diario y
+      se revierte con recuperar() al iniciar el programa.
+
+    Ejemplo:
+        >>> transaccion = Transaccion("completar_consulta")
+        >>> transaccion.ejecutar("procesar_recetas", procesar, recetas, compensacion="restaurar_stock")
+        >>> transaccion.agregar(persistencia_consultas, consulta.to_dict())
+        >>> transaccion.actualizar(persistencia_citas, id_cita, {"estado": "Completada"})
+        >>> transaccion.confirmar()
+        >>> transaccion.terminar()
+    """
+
+    RUTA_DIARIO = "data/transacciones.json"
+
+    # ========== INICIALIZA ==========
+    def __init__(self, nombre: str, diario: Persistencia | None = None) -> None:
+        """
+        Args:
+            nombre (str): Nombre de la operacion (se guarda en el diario)
+            diario (Persistencia | None): Archivo del diario (por defecto data/transacciones.json)
+        """
+        self.nombre = nombre
+        self.diario = diario or Persistencia(Transaccion.RUTA_DIARIO)
+        self.id_transaccion = None
+        self.estado = "Abierta"
+        self._fecha_inicio = datetime.now().isoformat()
+
+        self._pasos: List[Dict[str, Any]] = []
+        self._compensaciones: List[Callable | None] = []
+        self._archivos: Dict[str, Dict[str, Any]] = {}
+        self._errores_reversion: List[str] = []
+
+    # ========== LECTURA ==========
+    def leer(self, persistencia: Persistencia, campo_id: str | None = None) -> List[Dict]:
+        """
+        Devuelve los registros del archivo con los cambios ya preparados
+
+        El archivo se lee solo la primera vez; las siguientes lecturas usan la copia en memoria.
+
+        Returns:
+            List[Dict]: Registros del archivo (no modificar directamente)
+        """
+        return self._archivo(persistencia, campo_id)["datos"]
+
+    def buscar_por_id(self, persistencia: Persistencia, id_valor: Any, campo_id: str | None = None) -> Optional[Dict]:
+        """
+        Busca un registro por ID en la copia en memoria del archivo
+
+        Devuelve una copia: los cambios se hacen con actualizar()
+
+        Returns:
+            Optional[Dict]: Copia del registro (con los cambios preparados) o None
+        """
+        registro = self._archivo(persistencia, campo_id)["por_id"].get(id_valor)
+        return deepcopy(registro) if registro is not None else None
+
+    def generar_id(self, persistencia: Persistencia, campo_id: str | None = None) -> int:
+        """
+        Genera el siguiente ID del archivo contando los registros ya preparados
+
+        Returns:
+            int: Nuevo ID (maximo + 1)
+        """
+        archivo = self._archivo(persistencia, campo_id)
+        return max((id_valor for id_valor in archivo["por_id"] if isinstance(id_valor, int)), default=0) + 1
+
+    # ========== CAMBIOS PREPARADOS ==========
+    def agregar(self, persistencia: Persistencia, registro: Dict, campo_id: str | None = None) -> None:
+        """
+        Prepara un registro nuevo para el archivo
+
+        Raises:
+            ValueError: Ya existe un registro con ese ID
+        """
+        archivo = self._archivo(persistencia, campo_id)
+        id_valor = registro.get(archivo["campo_id"])
+
+        if id_valor in archivo["por_id"]:
+            raise ValueError(f"Ya existe un registro con {archivo['campo_id']} = {id_valor} en {persistencia.archivo}")
+
+        archivo["anteriores"].setdefault(id_valor, None)
+        archivo["datos"].append(registro)
+        archivo["por_id"][id_valor] = registro
+
+    def actualizar(self, persistencia: Persistencia, id_valor: Any, campos_actualizar: Dict, campo_id: str | None = None) -> bool:
+        """
+        Prepara la actualizacion de campos de un registro
+
+        Returns:
+            bool: True si se encontro el registro
+        """
+        archivo = self._archivo(persistencia, campo_id)
+        registro = archivo["por_id"].get(id_valor)
+
+        if registro is None:
+            return False
+
+        # Solo se guarda la primera version anterior del registro (copia completa:
+        # los modelos pueden compartir listas con el registro, ej: historial_consultas)
+        if id_valor not in archivo["anteriores"]:
+            archivo["anteriores"][id_valor] = deepcopy(registro)
+
+        registro.update(campos_actualizar)
+        return True
+
+    # ========== PASOS EXTERNOS ==========
+    def ejecutar(self, accion: str, funcion: Callable[[Any], dict], datos: Any,
+                 compensacion: str | None = None, funcion_compensacion: Callable[[Any], Any] | None = None) -> dict:
+        """
+        Ejecuta un paso que escribe fuera de la transaccion (ej: descontar stock)
+
+        El paso queda en el diario antes de ejecutarse, con el nombre de su
+        compensacion para poder revertirlo aun despues de un corte.
+
+        Args:
+            accion (str): Nombre del paso
+            funcion (Callable): Funcion a ejecutar con los datos; devuelve {"exito", "mensaje", ...}
+            datos (Any): Datos del paso (deben poder guardarse en JSON)
+            compensacion (str | None): Nombre de la accion que revierte el paso
+            funcion_compensacion (Callable | None): Funcion que revierte el paso (recibe los datos)
+
+        Returns:
+            dict: Resultado de la funcion
+        """
+        paso = {"accion": accion, "compensacion": compensacion, "datos": datos, "estado": "Iniciado"}
+        self._pasos.append(paso)
+        self._compensaciones.append(funcion_compensacion)
+        self._guardar_diario()
+
+        resultado = funcion(datos)
+
+        # Un paso fallido no se compensa
+        if resultado.get("exito"):
+            paso["estado"] = "Hecho"
+        else:
+            paso["estado"] = "Fallido"
+        self._guardar_diario()
+
+        return resultado
+
+    # ========== CIERRE ==========
+    def confirmar(self) -> None:
+        """
+        Escribe todos los cambios preparados: una escritura por archivo
+
+        El diario queda abierto (con las versiones anteriores) hasta llamar a
+        terminar(), para poder revertir pasos posteriores a la confirmacion.
+
+        Raises:
+            Exception: Error al escribir (los archivos ya escritos se restauran)
+        """
+        if self.estado != "Abierta":
+            raise ValueError(f"La transaccion no se puede confirmar. Estado: {self.estado}")
+
+        # Primero el diario: si se corta a mitad de las escrituras se puede deshacer
+        self.estado = "Confirmando"
+        self._guardar_diario()
+
+        try:
+            for archivo in self._archivos.values():
+                if not archivo["anteriores"]:
+                    continue
+
+                cambios = [
+                    (anterior, archivo["por_id"].get(id_valor))
+                    for id_valor, anterior in archivo["anteriores"].items()
+                ]
+                archivo["persistencia"].guardar_lote(archivo["datos"], cambios, archivo["version"])
+                archivo["escrito"] = True
+
+        except Exception:
+            self.revertir()
+            raise
+
+        # El diario ya tiene lo necesario para deshacer: no hace falta reescribirlo
+        self.estado = "Confirmada"
+
+    def terminar(self) -> None:
+        """Da por terminada la transaccion y la borra del diario"""
+        if self.estado == "Abierta":
+            self.confirmar()
+
+        self._borrar_diario()
+        self.estado = "Terminada"
+
+    def revertir(self) -> List[str]:
+        """
+        Deshace la transaccion usando solo lo guardado en memoria/diario
+
+        Si ya se revirtio (ej: confirmar() fallo y revirtio antes de relanzar el
+        error) no hace nada y devuelve los errores de esa reversion: lo que no
+        se pudo restaurar queda en el diario para recuperar(), y una segunda
+        llamada no debe borrarlo.
+
+        Returns:
+            List[str]: Errores encontrados al revertir (lista vacia si todo salio bien)
+        """
+        if self.estado in ("Revertida", "Revirtiendo"):
+            return list(self._errores_reversion)
+
+        errores = []
+        pendientes = {}
+
+        # Restaurar los archivos que ya se escribieron
+        for ruta, archivo in self._archivos.items():
+            if not archivo.get("escrito"):
+                continue
+            try:
+                Transaccion._restaurar(archivo["persistencia"], archivo["campo_id"], archivo["anteriores"], archivo["datos"])
+            except Exception as e:
+                errores.append(f"No se pudo restaurar {archivo['persistencia'].archivo}: {e}")
+                pendientes[ruta] = archivo
+
+        # Compensar pasos externos en orden inverso (los compensados no se repiten)
+        for paso, funcion in reversed(list(zip(self._pasos, self._compensaciones))):
+            if paso["estado"] != "Hecho" or funcion is None:
+                continue
+            try:
+                Transaccion._compensar(funcion, paso["datos"])
+                paso["estado"] = "Compensado"
+            except Exception as e:
+                errores.append(f"No se pudo compensar '{paso['accion']}': {e}")
+
+        # Si algo no se pudo revertir, el diario guarda solo lo pendiente (recuperar() lo reintenta)
+        self._archivos = pendientes
+        if errores:
+            self.estado = "Revirtiendo"
+            self._guardar_diario()
+        else:
+            self._borrar_diario()
+            self.estado = "Revertida"
+
+        self._archivos = {}
+        self._errores_reversion = errores
+        return errores
+
+    # ========== RECUPERACION ==========
+    @staticmethod
+    def recuperar(compensaciones: Dict[str, Callable[[Any], Any]], diario: Persistencia | None = None) -> List[str]:
+        """
+        Revierte las transacciones que quedaron abiertas en el diario (programa cortado)
+
+        El avance se guarda en el diario despues de cada accion: los archivos
+        restaurados salen de la entrada y los pasos compensados quedan como
+        "Compensado". Si la entrada termina con errores, la siguiente pasada
+        solo reintenta lo pendiente (no vuelve a pisar ediciones posteriores
+        ni a devolver stock dos veces).
+
+        Args:
+            compensaciones (Dict[str, Callable]): Funciones de compensacion por nombre
+            diario (Persistencia | None): Archivo del diario
+
+        Returns:
+            List[str]: Descripcion de lo recuperado y de los errores
+        """
+        diario = diario or Persistencia(Transaccion.RUTA_DIARIO)
+        mensajes = []
+
+        for entrada in diario.leer_todos():
+            errores = []
+            id_transaccion = entrada.get("id_transaccion")
+            archivos = entrada.get("archivos") or {}
+            pasos = entrada.get("pasos") or []
+
+            def guardar_avance() -> None:
+                diario.actualizar(id_transaccion, {"archivos": archivos, "pasos": pasos}, "id_transaccion")
+
+            # Restaurar versiones anteriores (una lectura y una escritura por archivo)
+            if entrada.get("estado") in ("Confirmando", "Confirmada", "Revirtiendo"):
+                for ruta in list(archivos):
+                    archivo = archivos[ruta]
+                    try:
+                        anteriores = {item["id"]: item["anterior"] for item in archivo["anteriores"]}
+                        Transaccion._restaurar(Persistencia(ruta), archivo["campo_id"], anteriores)
+                    except Exception as e:
+                        errores.append(f"{ruta}: {e}")
+                        continue
+
+                    del archivos[ruta]
+                    guardar_avance()
+
+            # Compensar pasos externos realizados
+            for paso in reversed(pasos):
+                if paso.get("estado") == "Iniciado":
+                    errores.append(f"El paso '{paso['accion']}' quedo sin confirmar, revisar manualmente")
+                    continue
+
+                if paso.get("estado") != "Hecho" or not paso.get("compensacion"):
+                    continue
+
+                funcion = compensaciones.get(paso["compensacion"])
+                if funcion is None:
+                    errores.append(f"No hay compensacion registrada para '{paso['compensacion']}'")
+                    continue
+                try:
+                    Transaccion._compensar(funcion, paso["datos"])
+                except Exception as e:
+                    errores.append(f"No se pudo compensar '{paso['accion']}': {e}")
+                    continue
+
+                paso["estado"] = "Compensado"
+                guardar_avance()
+
+            if errores:
+                mensajes.append(f"Transaccion {id_transaccion} ({entrada.get('nombre')}) con errores: " + "; ".join(errores))
+            else:
+                diario.eliminar(id_transaccion, "id_transaccion")
+                mensajes.append(f"Transaccion {id_transaccion} ({entrada.get('nombre')}) revertida")
+
+        return mensajes
+
+    # ========== METODOS PRIVADOS ==========
+    def _archivo(self, persistencia: Persistencia, campo_id: str | None) -> Dict[str, Any]:
+        """Devuelve (leyendolo la primera vez) el estado en memoria de un archivo"""
+        archivo = self._archivos.get(persistencia.ruta)
+
+        if archivo is None:
+            if self.estado != "Abierta":
+                raise ValueError(f"La transaccion ya no acepta cambios. Estado: {self.estado}")
+
+            campo_id = campo_id or persistencia.campo_id_por_defecto()
+            version = persistencia.version()
+            datos = persistencia.leer_todos()
+
+            archivo = {
+                "persistencia": persistencia,
+                "campo_id": campo_id,
+                "version": version,
+                "datos": datos,
+                "por_id": {registro.get(campo_id): registro for registro in datos},
+                "anteriores": {},
+                "escrito": False
+            }
+            self._archivos[persistencia.ruta] = archivo
+
+        return archivo
+
+    def _guardar_diario(self) -> None:
+        """Crea o actualiza la entrada de la transaccion en el diario"""
+        entrada = {
+            "nombre": self.nombre,
+            "estado": self.estado,
+            "fecha_inicio": self._fecha_inicio,
+            "pasos": self._pasos,
+            "archivos": {
+                archivo["persistencia"].archivo: {
+                    "campo_id": archivo["campo_id"],
+                    "anteriores": [{"id": id_valor, "anterior": anterior} for id_valor, anterior in archivo["anteriores"].items()]
+                }
+                for archivo in self._archivos.values() if archivo["anteriores"]
+            }
+        }
+
+        if self.id_transaccion is None:
+            self.id_transaccion = self.diario.generar_id_autoincremental("id_transaccion")
+            self.diario.agregar({"id_transaccion": self.id_transaccion, **entrada})
+        else:
+            self.diario.actualizar(self.id_transaccion, entrada, "id_transaccion")
+
+    def _borrar_diario(self) -> None:
+        """Quita la transaccion del diario"""
+        if self.id_transaccion is not None:
+            self.diario.eliminar(self.id_transaccion, "id_transaccion")
+            self.id_transaccion = None
+
+    @staticmethod
+    def _compensar(funcion: Callable[[Any], Any], datos: Any) -> None:
+        """
+        Ejecuta una compensacion; un resultado {"exito": False} cuenta como error
+
+        Raises:
+            RuntimeError: La compensacion informo que no se pudo realizar
+        """
+        resultado = funcion(datos)
+        if isinstance(resultado, dict) and resultado.get("exito") is False:
+            raise RuntimeError(resultado.get("mensaje") or "la compensacion no se realizo")
+
+    @staticmethod
+    def _restaurar(persistencia: Persistencia, campo_id: str, anteriores: Dict[Any, Optional[Dict]],
+                   datos: List[Dict] | None = None) -> None:
+        """
+        Devuelve los registros a su version anterior con una sola escritura
+
+        Args:
+            persistencia (Persistencia): Archivo a restaurar
+            campo_id (str): Campo ID de los registros
+            anteriores (Dict): {ID: version anterior o None si el registro era nuevo}
+            datos (List[Dict] | None): Contenido actual si ya se tiene en memoria
+        """
+        version = persistencia.version()
+        if datos is None:
+            datos = persistencia.leer_todos()
+
+        restaurados = []
+        cambios = []
+        for registro in datos:
+            id_valor = registro.get(campo_id)
+
+            if id_valor not in anteriores:
+                restaurados.append(registro)
+                continue
+
+            # Los registros nuevos se quitan, los modificados vuelven a su version anterior
+            anterior = anteriores[id_valor]
+            cambios.append((registro, anterior))
+            if anterior is not None:
+                restaurados.append(anterior)
+
+        persistencia.guardar_lote(restaurados, cambios, version)
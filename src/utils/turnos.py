@@ -0,0 +1,243 @@
+"""
+Generacion del rol mensual de turnos del personal
+
+Reglas (ver constantes.py):
+- Cada empleado trabaja como maximo un turno por dia y solo en sus departamentos.
+- Jornada "Por turnos": solo su turno asignado. Otras jornadas: TURNOS_JORNADA_FIJA.
+- Limite de turnos al mes segun la jornada (TURNOS_MAXIMOS_MES).
+- Descanso: despues de una Noche no se trabaja Manana ni Tarde al dia siguiente,
+  y no se trabajan mas de DIAS_SEGUIDOS_MAXIMOS dias seguidos.
+- Solo cuenta el personal activo desde su fecha de contratacion.
+
+Primero se llena cada turno de forma voraz (los turnos con menos candidatos
+primero y, entre los candidatos, el de menor carga relativa). Luego se
+intenta reparar cada hueco: un empleado que no puede tomar el hueco por
+limite o descanso cede uno de sus turnos a otro empleado libre y toma el hueco.
+"""
+import calendar
+from datetime import date, timedelta
+from typing import Any, Dict, Iterable, List, Tuple
+from src.utils.excepciones import ValidationException
+from src.config.constantes import TURNOS, TURNOS_MAXIMOS_MES, TURNOS_JORNADA_FIJA, DIAS_SEGUIDOS_MAXIMOS
+
+class RolTurnos:
+    """
+    Rol de turnos de un mes
+
+    Ejemplo:
+        >>> rol = RolTurnos(2026, 11, persistencia.iterar(), {"Manana": 2, "Tarde": 2, "Noche": 1}, [1, 6])
+        >>> rol.asignaciones()[0]
+        {"fecha": "2026-11-01", "id_departamento": 1, "turno": "Noche", "id_personal": 3}
+        >>> rol.faltantes()
+        []
+    """
+
+    def __init__(self, anio: int, mes: int, personal: Iterable[Dict], cobertura: Dict[str, int],
+                 departamentos: List[int] | None = None) -> None:
+        """
+        Args:
+            anio (int): Año del rol
+            mes (int): Mes del rol (1 - 12)
+            personal (Iterable[Dict]): Registros de data/personal.json
+            cobertura (Dict[str, int]): Personas necesarias por turno y departamento cada dia
+            departamentos (List[int] | None): Departamentos a cubrir (None = los del personal activo)
+
+        Raises:
+            ValidationException: Periodo o cobertura invalidos
+        """
+        if not isinstance(anio, int) or not isinstance(mes, int) or not 1 <= mes <= 12 or anio < 1:
+            raise ValidationException("Periodo del rol invalido. El mes debe estar entre 1 y 12")
+
+        if not isinstance(cobertura, dict) or any(turno not in TURNOS for turno in cobertura):
+            raise ValidationException(f"Cobertura invalida. Los turnos deben ser: {', '.join(TURNOS)}")
+
+        if not all(isinstance(cantidad, int) and cantidad >= 0 for cantidad in cobertura.values()):
+            raise ValidationException("La cobertura de cada turno debe ser un numero entero positivo")
+
+        self.anio = anio
+        self.mes = mes
+        self.cobertura = {turno: cantidad for turno, cantidad in cobertura.items() if cantidad > 0}
+        self.dias = [date(anio, mes, dia) for dia in range(1, calendar.monthrange(anio, mes)[1] + 1)]
+
+        self._cargar(personal, departamentos)
+
+        # Estado del rol: {id_personal: {dia: (id_departamento, turno)}} y {(dia, departamento, turno): [ids]}
+        self._turnos_de: Dict[Any, Dict[date, Tuple[int, str]]] = {id_personal: {} for id_personal in self._empleados}
+        self._cubierto: Dict[Tuple[date, int, str], List[Any]] = {}
+
+        self._llenar()
+        self._reparar()
+
+    # ========== RESULTADOS ==========
+    def asignaciones(self) -> List[Dict[str, Any]]:
+        """
+        Turnos asignados, ordenados por fecha, turno y departamento
+
+        Returns:
+            List[Dict]: {"fecha", "id_departamento", "turno", "id_personal"}
+        """
+        orden = {turno: posicion for posicion, turno in enumerate(TURNOS)}
+        return [
+            {"fecha": dia.isoformat(), "id_departamento": id_departamento, "turno": turno, "id_personal": id_personal}
+            for (dia, id_departamento, turno), ids in sorted(self._cubierto.items(), key=lambda item: (item[0][0], orden[item[0][2]], item[0][1]))
+            for id_personal in sorted(ids)
+        ]
+
+    def faltantes(self) -> List[Dict[str, Any]]:
+        """
+        Turnos que no se pudieron cubrir completos
+
+        Returns:
+            List[Dict]: {"fecha", "id_departamento", "turno", "faltan"}
+        """
+        return [
+            {"fecha": dia.isoformat(), "id_departamento": id_departamento, "turno": turno, "faltan": faltan}
+            for dia, id_departamento, turno in self._huecos()
+            for faltan in [self.cobertura[turno] - len(self._cubierto.get((dia, id_departamento, turno), []))]
+        ]
+
+    def resumen(self) -> List[Dict[str, Any]]:
+        """
+        Turnos asignados a cada empleado
+
+        Returns:
+            List[Dict]: {"id_personal", "nombre", "jornada", "turno", "turnos", "noches", "limite"}
+        """
+        return [
+            {
+                "id_personal": id_personal,
+                "nombre": empleado["nombre"],
+                "jornada": empleado["jornada"],
+                "turno": empleado["turno"],
+                "turnos": len(self._turnos_de[id_personal]),
+                "noches": sum(1 for _, turno in self._turnos_de[id_personal].values() if turno == "Noche"),
+                "limite": empleado["limite"]
+            }
+            for id_personal, empleado in sorted(self._empleados.items())
+        ]
+
+    # ========== CARGA ==========
+    def _cargar(self, personal: Iterable[Dict], departamentos: List[int] | None) -> None:
+        """Guarda el personal activo y los candidatos de cada (departamento, turno)"""
+        self._empleados: Dict[Any, Dict[str, Any]] = {}
+        self._candidatos: Dict[Tuple[int, str], List[Any]] = {}
+        filtro = set(departamentos) if departamentos is not None else None
+
+        for registro in personal:
+            if registro.get("estado") != "Activo":
+                continue
+
+            propios = [d for d in registro.get("departamentos") or [] if filtro is None or d in filtro]
+            if not propios:
+                continue
+
+            jornada = registro.get("jornada")
+            turnos = [registro.get("turno")] if jornada == "Por turnos" else TURNOS_JORNADA_FIJA
+
+            self._empleados[registro["id_personal"]] = {
+                "nombre": registro.get("nombre"),
+                "jornada": jornada,
+                "turno": registro.get("turno"),
+                "desde": date.fromisoformat(registro["fecha_contratacion"]),
+                "limite": TURNOS_MAXIMOS_MES.get(jornada, 0)
+            }
+            for id_departamento in propios:
+                for turno in turnos:
+                    self._candidatos.setdefault((id_departamento, turno), []).append(registro["id_personal"])
+
+        self.departamentos = sorted(filtro) if filtro is not None else sorted({d for d, _ in self._candidatos})
+
+    # ========== REGLAS ==========
+    def _puede(self, id_personal: Any, dia: date, turno: str) -> bool:
+        """Indica si el empleado puede tomar el turno sin romper limites ni descansos"""
+        empleado = self._empleados[id_personal]
+        turnos = self._turnos_de[id_personal]
+
+        if dia in turnos or dia < empleado["desde"] or len(turnos) >= empleado["limite"]:
+            return False
+
+        # Descanso despues de una Noche (en ambos sentidos: el rol se puede reparar hacia atras)
+        anterior = turnos.get(dia - timedelta(days=1))
+        if turno != "Noche" and anterior is not None and anterior[1] == "Noche":
+            return False
+        siguiente = turnos.get(dia + timedelta(days=1))
+        if turno == "Noche" and siguiente is not None and siguiente[1] != "Noche":
+            return False
+
+        # Dias seguidos contando hacia atras y hacia adelante
+        seguidos = 1
+        for paso in (-1, 1):
+            cursor = dia + timedelta(days=paso)
+            while cursor in turnos:
+                seguidos += 1
+                cursor += timedelta(days=paso)
+        return seguidos <= DIAS_SEGUIDOS_MAXIMOS
+
+    def _asignar(self, id_personal: Any, dia: date, id_departamento: int, turno: str) -> None:
+        self._turnos_de[id_personal][dia] = (id_departamento, turno)
+        self._cubierto.setdefault((dia, id_departamento, turno), []).append(id_personal)
+
+    def _quitar(self, id_personal: Any, dia: date) -> Tuple[int, str]:
+        id_departamento, turno = self._turnos_de[id_personal].pop(dia)
+        self._cubierto[(dia, id_departamento, turno)].remove(id_personal)
+        return id_departamento, turno
+
+    def _carga(self, id_personal: Any) -> float:
+        """Turnos asignados en proporcion a su limite (reparte segun la jornada)"""
+        return len(self._turnos_de[id_personal]) / (self._empleados[id_personal]["limite"] or 1)
+
+    # ========== SOLUCION ==========
+    def _huecos(self) -> List[Tuple[date, int, str]]:
+        """Turnos con menos personal del requerido"""
+        return [
+            (dia, id_departamento, turno)
+            for dia in self.dias
+            for turno in TURNOS if turno in self.cobertura
+            for id_departamento in self.departamentos
+            if len(self._cubierto.get((dia, id_departamento, turno), [])) < self.cobertura[turno]
+        ]
+
+    def _llenar(self) -> None:
+        """Llenado voraz dia por dia; primero los turnos con menos candidatos"""
+        turnos_dia = sorted(
+            ((id_departamento, turno) for id_departamento in self.departamentos for turno in self.cobertura),
+            key=lambda clave: len(self._candidatos.get(clave, []))
+        )
+
+        for dia in self.dias:
+            for id_departamento, turno in turnos_dia:
+                disponibles = [c for c in self._candidatos.get((id_departamento, turno), []) if self._puede(c, dia, turno)]
+                disponibles.sort(key=lambda c: (self._carga(c), c))
+
+                for id_personal in disponibles[:self.cobertura[turno]]:
+                    self._asignar(id_personal, dia, id_departamento, turno)
+
+    def _reparar(self) -> None:
+        """Cubre huecos haciendo que un empleado ceda otro de sus turnos a un compañero libre"""
+        for dia, id_departamento, turno in self._huecos():
+            while len(self._cubierto.get((dia, id_departamento, turno), [])) < self.cobertura[turno]:
+                if not self._mover_para(dia, id_departamento, turno):
+                    break
+
+    def _mover_para(self, dia: date, id_departamento: int, turno: str) -> bool:
+        """Intenta un intercambio para cubrir un lugar del turno; True si lo logro"""
+        for candidato in self._candidatos.get((id_departamento, turno), []):
+            if dia in self._turnos_de[candidato] or dia < self._empleados[candidato]["desde"]:
+                continue
+
+            for otro_dia in list(self._turnos_de[candidato]):
+                otro_departamento, otro_turno = self._quitar(candidato, otro_dia)
+
+                if self._puede(candidato, dia, turno):
+                    reemplazo = next(
+                        (c for c in self._candidatos.get((otro_departamento, otro_turno), [])
+                         if c != candidato and self._puede(c, otro_dia, otro_turno)),
+                        None
+                    )
+                    if reemplazo is not None:
+                        self._asignar(reemplazo, otro_dia, otro_departamento, otro_turno)
+                        self._asignar(candidato, dia, id_departamento, turno)
+                        return True
+
+                self._asignar(candidato, otro_dia, otro_departamento, otro_turno)
+        return False
@@ -4,19 +4,22 @@ Gestiona personal, contratos y genera reportes
 
 """
 
+from datetime import date
 from src.utils.helpers import Helpers
 from src.controllers.personal_controller import PersonalController
+from src.controllers.departamento_controller import DepartamentoController
 from src.views.componentes.inputs import Entradas
 from src.views.componentes.mensajes import Mensajes
 from src.views.componentes.tablas import Tablas
-from src.config.constantes import ROLES_PERSONAL, ESPECIALIDADES, DEPARTAMENTOS, JORNADAS, TURNOS, SALARIOS_BASE, TIPOS_CONTRATOS, MOTIVOS_BAJA
+from src.config.constantes import ROLES_PERSONAL, ESPECIALIDADES, DEPARTAMENTOS, JORNADAS, TURNOS, SALARIOS_BASE, TIPOS_CONTRATOS, MOTIVOS_BAJA, TIPOS_EXCEPCION_HORARIO
 
 class MenuRRHH:
     """Menu principal del Administrador de Recursos Humanos"""
     
     def __init__(self) -> None:
-        """Inicializa el menu con el controlador de Personal"""
+        """Inicializa el menu con los controladores de Personal y Departamentos"""
         self.controlador = PersonalController()
+        self.controlador_departamentos = DepartamentoController()
         
     def mostrar(self):
         """Muestra el menu principal de RRHH y maneja las opciones"""
@@ -37,11 +40,15 @@ class MenuRRHH:
             print("7. Personal activo vs inactivo")
             print("8. Personal por departamento")
             print("9. Turnos asignados")
+            print("\nHORARIOS:")
+            print("10. Ausencias y horarios extra")
+            print("\nDEPARTAMENTOS:")
+            print("11. Registrar departamento o cambiar jefe")
             print("\n0. Cerrar sesión")
             print("═" * 50)
             
             # Se ingresa una opcion y se valida (int)
-            opcion = Entradas.pedir_entero("\nSeleccione una opcion", 0, 9)
+            opcion = Entradas.pedir_entero("\nSeleccione una opcion", 0, 11)
             
             # Opciones
             if opcion == 1:
@@ -62,6 +69,10 @@ class MenuRRHH:
                 self.reporte_por_departamento()
             elif opcion == 9:
                 self.reporte_turnos()
+            elif opcion == 10:
+                self.excepciones_horario()
+            elif opcion == 11:
+                self.gestionar_departamentos()
             elif opcion == 0:
                 print("\nCerrando sesión de RRHH...")
                 Helpers.pausar()
@@ -362,8 +373,23 @@ class MenuRRHH:
         print("═" * 50)
         print("    CONTRATOS PRÓXIMOS A VENCER")
         print("═" * 50)
-        print("\n⚠ Funcionalidad en desarrollo...")
-        print("(Requiere implementar métodos en ReporteController)")
+        
+        dias = Entradas.pedir_entero("\nDias de alerta", 1, 365)
+        resultado = self.controlador.contratos_por_vencer(dias)
+        
+        if not resultado["exito"] or not resultado["datos"]:
+            Mensajes.mostrar(resultado)
+            return
+        
+        config = [
+            ("id_contrato", "ID contrato"),
+            ("id_personal", "ID personal"),
+            ("nombre", "Nombre"),
+            ("fecha_fin", "Fecha fin"),
+            ("dias_restantes", "Dias restantes")
+        ]
+        
+        Tablas.mostrar(f"CONTRATOS QUE VENCEN EN {dias} DIAS", config, resultado["datos"])
         Helpers.pausar()
 
     # ========== REPORTES ==========
@@ -374,8 +400,35 @@ class MenuRRHH:
         print("═" * 50)
         print("    REPORTE: PERSONAL ACTIVO VS INACTIVO")
         print("═" * 50)
-        print("\n⚠ Funcionalidad en desarrollo...")
-        print("(Requiere implementar métodos en ReporteController)")
+
+        resultado = self.controlador.contar_por_estado_y_rol()
+
+        if not resultado["exito"]:
+            Mensajes.mostrar(resultado)
+            return
+
+        datos_tabla = [{
+            "rol": rol,
+            "activos": estados["Activo"],
+            "inactivos": estados["Inactivo"],
+            "total": estados["Activo"] + estados["Inactivo"]
+        } for rol, estados in resultado["datos"].items()]
+
+        datos_tabla.append({
+            "rol": "TOTAL",
+            "activos": sum(fila["activos"] for fila in datos_tabla),
+            "inactivos": sum(fila["inactivos"] for fila in datos_tabla),
+            "total": sum(fila["total"] for fila in datos_tabla)
+        })
+
+        config = [
+            ("rol", "Rol"),
+            ("activos", "Activos"),
+            ("inactivos", "Inactivos"),
+            ("total", "Total")
+        ]
+
+        Tablas.mostrar("PERSONAL ACTIVO VS INACTIVO", config, datos_tabla)
         Helpers.pausar()
 
     def reporte_por_departamento(self):
@@ -384,8 +437,26 @@ class MenuRRHH:
         print("═" * 50)
         print("    REPORTE: PERSONAL POR DEPARTAMENTO")
         print("═" * 50)
-        print("\n⚠ Funcionalidad en desarrollo...")
-        print("(Requiere implementar métodos en ReporteController)")
+        
+        resultado = self.controlador.contar_por_departamento()
+        
+        if not resultado["exito"]:
+            Mensajes.mostrar(resultado)
+            return
+        
+        datos_tabla = [{
+            "id": id_departamento,
+            "departamento": DEPARTAMENTOS[id_departamento]["nombre"],
+            "cantidad": cantidad
+        } for id_departamento, cantidad in resultado["datos"].items()]
+        
+        config = [
+            ("id", "ID"),
+            ("departamento", "Departamento"),
+            ("cantidad", "Personal activo")
+        ]
+        
+        Tablas.mostrar("PERSONAL ACTIVO POR DEPARTAMENTO", config, datos_tabla)
         Helpers.pausar()
 
     def reporte_turnos(self):
@@ -394,6 +465,154 @@ class MenuRRHH:
         print("═" * 50)
         print("    REPORTE: TURNOS ASIGNADOS")
         print("═" * 50)
-        print("\n⚠ Funcionalidad en desarrollo...")
-        print("(Requiere implementar métodos en ReporteController)")
-        Helpers.pausar()
\ No newline at end of file
+
+        # Personal activo por jornada y turno (contadores, sin recorrer el archivo)
+        conteo = self.controlador.contar_por_jornada_y_turno()
+        if not conteo["exito"]:
+            Mensajes.mostrar(conteo)
+            return
+
+        config = [
+            ("jornada", "Jornada"),
+            ("turno", "Turno"),
+            ("cantidad", "Personal activo")
+        ]
+        Tablas.mostrar("PERSONAL ACTIVO POR JORNADA Y TURNO", config,
+                       [{**fila, "turno": fila["turno"] or "-"} for fila in conteo["datos"]])
+
+        if not Entradas.confirmar_accion("¿Desea generar el rol de turnos de un mes?"):
+            return
+
+        anio = Entradas.pedir_entero("\nAño", 2000, 2100)
+        mes = Entradas.pedir_entero("Mes", 1, 12)
+        id_departamento = Entradas.pedir_entero("ID del departamento (0 = todos)", 0, 10)
+
+        print("\nPersonal requerido por turno en cada departamento:")
+        cobertura = {turno: Entradas.pedir_entero(f"    {turno}", 0, 50) for turno in TURNOS}
+
+        departamentos = [id_departamento] if id_departamento else None
+        resultado = self.controlador.generar_rol_turnos(anio, mes, cobertura, departamentos)
+
+        if not resultado["exito"]:
+            Mensajes.mostrar(resultado)
+            return
+
+        print(f"\n{resultado['mensaje']}")
+
+        config = [
+            ("id_personal", "ID"),
+            ("nombre", "Nombre"),
+            ("jornada", "Jornada"),
+            ("turno", "Turno"),
+            ("turnos", "Turnos asignados"),
+            ("noches", "Noches"),
+            ("limite", "Limite")
+        ]
+        Tablas.mostrar(f"TURNOS ASIGNADOS {resultado['datos']['periodo']}", config, resultado["datos"]["resumen"])
+
+        if resultado["datos"]["faltantes"]:
+            config = [
+                ("fecha", "Fecha"),
+                ("id_departamento", "Departamento"),
+                ("turno", "Turno"),
+                ("faltan", "Faltan")
+            ]
+            Tablas.mostrar("TURNOS SIN CUBRIR", config, resultado["datos"]["faltantes"])
+
+        Helpers.pausar()
+
+    # ========== HORARIOS ==========
+
+    def excepciones_horario(self):
+        """Opción 10: Ausencias y horarios extra (la agenda de citas los respeta)"""
+        Helpers.limpiar_pantalla()
+        print("═" * 50)
+        print("    AUSENCIAS Y HORARIOS EXTRA")
+        print("═" * 50)
+
+        id_personal = Entradas.pedir_entero("\nIngrese ID del personal", 1)
+
+        resultado = self.controlador.listar_excepciones_horario(id_personal, date.today())
+        if resultado["exito"]:
+            config = [
+                ("id_excepcion", "ID"),
+                ("fecha", "Fecha"),
+                ("tipo", "Tipo"),
+                ("hora_inicio", "Desde"),
+                ("hora_fin", "Hasta"),
+                ("motivo", "Motivo")
+            ]
+            Tablas.mostrar("PROXIMAS EXCEPCIONES DE HORARIO", config,
+                           [{**fila, "hora_inicio": fila["hora_inicio"] or "Todo el dia", "hora_fin": fila["hora_fin"] or "-"}
+                            for fila in resultado["datos"]])
+        else:
+            print(f"\n{resultado['mensaje']}")
+
+        print("\n1. Registrar ausencia u horario extra")
+        print("2. Eliminar una excepcion")
+        print("0. Volver")
+        opcion = Entradas.pedir_entero("\nSeleccione una opcion", 0, 2)
+
+        if opcion == 1:
+            fecha = Entradas.pedir_fecha("Fecha")
+
+            print("\nTipos:")
+            for i, tipo in enumerate(TIPOS_EXCEPCION_HORARIO, 1):
+                print(f"    {i}. {tipo}")
+            tipo = Entradas.pedir_opcion("Seleccione tipo", list(TIPOS_EXCEPCION_HORARIO))
+
+            hora_inicio = hora_fin = None
+            if tipo == "Horario extra" or not Entradas.confirmar_accion("¿Aplica todo el dia?"):
+                hora_inicio = Entradas.pedir_hora("Hora de inicio")
+                hora_fin = Entradas.pedir_hora("Hora de fin")
+
+            motivo = Entradas.pedir_texto("Motivo", obligatorio=False)
+            Mensajes.mostrar(self.controlador.registrar_excepcion_horario(id_personal, fecha, tipo, hora_inicio, hora_fin, motivo))
+
+        elif opcion == 2:
+            id_excepcion = Entradas.pedir_entero("ID de la excepcion", 1)
+            if Entradas.confirmar_accion(f"¿Confirma eliminar la excepcion {id_excepcion}?"):
+                Mensajes.mostrar(self.controlador.eliminar_excepcion_horario(id_excepcion))
+
+    # ========== DEPARTAMENTOS ==========
+    def gestionar_departamentos(self):
+        """Opción 11: Registrar un departamento del catalogo o cambiar su jefe"""
+        Helpers.limpiar_pantalla()
+        print("═" * 50)
+        print("    DEPARTAMENTOS")
+        print("═" * 50)
+
+        # Catalogo con el estado de registro de cada departamento
+        filas = []
+        for id_departamento, info in DEPARTAMENTOS.items():
+            registrado = self.controlador_departamentos.obtener_departamento(id_departamento)["datos"]
+            filas.append({
+                "id_departamento": id_departamento,
+                "nombre": info["nombre"],
+                "jefe": registrado["id_jefe"] if registrado else "-",
+                "personal": len(registrado["personal_asignado"]) if registrado else "-"
+            })
+
+        config = [
+            ("id_departamento", "ID"),
+            ("nombre", "Departamento"),
+            ("jefe", "ID Jefe"),
+            ("personal", "Personal")
+        ]
+        Tablas.mostrar("DEPARTAMENTOS DEL HOSPITAL", config, filas)
+
+        print("\n1. Registrar departamento")
+        print("2. Cambiar jefe de departamento")
+        print("0. Volver")
+        opcion = Entradas.pedir_entero("\nSeleccione una opcion", 0, 2)
+
+        if opcion == 0:
+            return
+
+        id_departamento = Entradas.pedir_entero("ID del departamento", min(DEPARTAMENTOS), max(DEPARTAMENTOS))
+        id_jefe = Entradas.pedir_entero("ID del personal que sera jefe", 1)
+
+        if opcion == 1:
+            Mensajes.mostrar(self.controlador_departamentos.crear_departamento(id_departamento, id_jefe))
+        else:
+            Mensajes.mostrar(self.controlador_departamentos.asignar_jefe(id_departamento, id_jefe))
@@ -11,7 +11,7 @@ from src.utils.helpers import Helpers
 from src.views.componentes.inputs import Entradas
 from src.views.componentes.mensajes import Mensajes
 from src.views.componentes.tablas import Tablas
-from src.config.constantes import ESTADOS_CITA
+from src.config.constantes import ESTADOS_CITA, ESPECIALIDADES
 class MenuDoctor:
     """Menu de Doctor"""
     
@@ -36,16 +36,18 @@ class MenuDoctor:
             print("1. Ver mis citas del día")
             print("2. Ver mis citas futuras")
             print("3. Completar consulta")
+            print("7. Completar consultas en lote (fin de turno)")
             print("\nPACIENTES:")
             print("4. Buscar paciente")
             print("5. Ver historial clínico de paciente")
+            print("8. Buscar casos anteriores (diagnóstico / tratamiento)")
             print("\nINVENTARIO:")
             print("6. Consultar medicamentos disponibles")
             print("\n0. Cerrar sesión")
             print("═" * 50)
             
             # Ingresar opcion
-            opcion = Entradas.pedir_entero("\nSeleccione una opcion", 0, 6)
+            opcion = Entradas.pedir_entero("\nSeleccione una opcion", 0, 8)
             
             # Opciones
             if opcion == 0:
@@ -65,6 +67,10 @@ class MenuDoctor:
                 self.ver_historial_clinico()
             elif opcion == 6:
                 self.medicamentos_disponibles()
+            elif opcion == 7:
+                self.completar_consultas_lote()
+            elif opcion == 8:
+                self.buscar_casos()
 
     # ========== GESTION DE CONSULTAS ==========
     def ver_citas(self):
@@ -424,6 +430,89 @@ class MenuDoctor:
         except Exception as e:
             Mensajes.mostrar({"exito": False, "mensaje": f"Error inesperado: {str(e)}"})
 
+    def completar_consultas_lote(self):
+        """Opcion 7: Completar consultas en lote (fin de turno)"""
+        Helpers.limpiar_pantalla()
+        print("=" * 50)
+        print("     COMPLETAR CONSULTAS EN LOTE")
+        print("=" * 50)
+
+        try:
+            # Pedir ID
+            id_doctor = Entradas.pedir_entero("\nIngrese su ID", 1)
+            
+            # Buscar doctor
+            doctor_encontrado = self.controlador_personal.obtener_doctor_activo_por_id(id_doctor)
+            
+            if not doctor_encontrado["exito"]:
+                Mensajes.mostrar(doctor_encontrado)
+                return
+            
+            doctor = doctor_encontrado["datos"]
+            print(f"Doctor {doctor._nombre} | Especialidad: {doctor.especialidad}")
+            
+            # Buscar citas agendadas para hoy
+            citas_encontradas = self.controlador_citas.listar_agenda_actual_doctor(id_doctor, "Agendada")
+            
+            if not citas_encontradas["exito"]:
+                Mensajes.mostrar(citas_encontradas)
+                return
+            
+            # Recorrer las citas pidiendo los datos de cada consulta
+            items = []
+            for cita in citas_encontradas["datos"]:
+                print(f"\nCita {cita.id_cita} | {cita.hora.strftime('%H:%M')} | Paciente ID: {cita.id_paciente} | Motivo: {cita.motivo}")
+                
+                if not Entradas.confirmar_accion("¿Completar esta consulta?"):
+                    continue
+                
+                item = {"id_cita": cita.id_cita}
+                item["diagnostico"] = Entradas.pedir_texto("Ingrese diagnostico (minimo 20 caracteres)")
+                
+                if Entradas.confirmar_accion("¿Desea agregar tratamiento?"):
+                    item["tratamiento"] = Entradas.pedir_texto("Ingrese tratamiento (minimo 10 caracteres)")
+                
+                recetas = []
+                while Entradas.confirmar_accion("¿Desea agregar un medicamento?"):
+                    id_medicamento = Entradas.pedir_entero("ID del medicamento", 1)
+                    cantidad = Entradas.pedir_entero("Ingrese cantidad", 1)
+                    recetas.append({"id_medicamento": id_medicamento, "cantidad": cantidad})
+                if recetas:
+                    item["recetas"] = recetas
+                
+                items.append(item)
+            
+            if not items:
+                print("\nNo se selecciono ninguna consulta")
+                Helpers.pausar()
+                return
+            
+            # Confirmacion
+            if not Entradas.confirmar_accion(f"\n¿Confirma el registro de {len(items)} consultas?"):
+                print("Consultas canceladas")
+                Helpers.pausar()
+                return
+            
+            resultado = self.controlador_consultas.completar_consultas_lote(id_doctor, items)
+            
+            # Mostrar resultado por consulta
+            if resultado["datos"]:
+                config = [
+                    ("id_cita", "ID Cita"),
+                    ("id_consulta", "ID Consulta"),
+                    ("id_factura", "ID Factura"),
+                    ("mensaje", "Resultado")
+                ]
+                Tablas.mostrar("RESULTADO DEL LOTE", config, resultado["datos"])
+            
+            Mensajes.mostrar({"exito": resultado["exito"], "mensaje": resultado["mensaje"]})
+            
+        except KeyboardInterrupt:
+            print("\n\nAccion cancelada por el Doctor.")
+            Helpers.pausar()
+        except Exception as e:
+            Mensajes.mostrar({"exito": False, "mensaje": f"Error inesperado: {str(e)}"})
+
     # ========== GESTION DE PACIENTES ==========
     def buscar_paciente(self):
         """Opcion 4: Buscar paciente"""
@@ -437,7 +526,7 @@ class MenuDoctor:
             dni_paciente = Entradas.pedir_texto("\nIngrese DNI del paciente")
             
             # Buscar paciente
-            paciente_encontrado = self.controlador_pacientes.buscar_por_dni(dni_paciente)
+            paciente_encontrado = self.controlador_pacientes.obtener_resumen(dni=dni_paciente)
             
             # Verificar existencia
             if not paciente_encontrado["exito"]:
@@ -448,15 +537,21 @@ class MenuDoctor:
             paciente = paciente_encontrado["datos"]
             
             Tablas.mostrar_detalle("DATOS DEL PACIENTE", {
-                "ID": paciente.id_paciente,
-                "DNI": paciente._dni,
-                "Nombre": paciente._nombre,
-                "Fecha nacimiento": paciente._fecha_nacimiento,
-                "Telefono": paciente._telefono,
-                "Tipo de seguro": paciente.tipo_seguro,
-                "Fecha de registro": paciente._fecha_registro,
-                "Porcentaje de descuento": f"{paciente._porcentaje_descuento}%",
-                "Historial de consultas": ", ".join(map(str, paciente.historial_consultas)) if paciente.historial_consultas else "Sin consultas"
+                "ID": paciente["id_paciente"],
+                "DNI": paciente["dni"],
+                "Nombre": paciente["nombre"],
+                "Edad": paciente["edad"],
+                "Fecha nacimiento": paciente["fecha_nacimiento"],
+                "Telefono": paciente["telefono"],
+                "Tipo de seguro": paciente["tipo_seguro"],
+                "Fecha de registro": paciente["fecha_registro"],
+                "Porcentaje de descuento": f"{paciente['porcentaje_descuento']}%",
+                "Visitas": paciente["visitas"],
+                "Ultima visita": paciente["ultima_visita"] or "Sin consultas",
+                "Citas pendientes": paciente["citas_pendientes"],
+                "Proxima cita": paciente["proxima_cita"] or "-",
+                "Facturas pendientes": f"{paciente['facturas_pendientes']} ({Helpers.formatear_precio(paciente['monto_pendiente'])})",
+                "Historial de consultas": ", ".join(map(str, paciente["historial_consultas"])) if paciente["historial_consultas"] else "Sin consultas"
             })
             
             Helpers.pausar()
@@ -544,6 +639,65 @@ class MenuDoctor:
             Mensajes.mostrar({"exito": False, "mensaje": f"Error inesperado: {str(e)}"})
     
     # ========== VER INVENTARIO ==========
+    def buscar_casos(self):
+        """Opcion 8: Buscar casos anteriores por diagnostico o tratamiento"""
+        Helpers.limpiar_pantalla()
+        print("=" * 50)
+        print("     BUSCAR CASOS ANTERIORES")
+        print("=" * 50)
+        
+        try:
+            texto = Entradas.pedir_texto("\nPalabras a buscar (ej: dolor toracico)")
+            
+            # Filtros opcionales
+            especialidad = None
+            if Entradas.confirmar_accion("¿Filtrar por especialidad?"):
+                especialidad = Entradas.pedir_opcion("Especialidad", ESPECIALIDADES)
+            
+            id_doctor = None
+            if Entradas.confirmar_accion("¿Solo mis consultas?"):
+                id_doctor = Entradas.pedir_entero("Ingrese su ID", 1)
+            
+            fecha_desde = fecha_hasta = None
+            if Entradas.confirmar_accion("¿Filtrar por rango de fechas?"):
+                fecha_desde = Entradas.pedir_fecha("Desde (DD/MM/AAAA)")
+                fecha_hasta = Entradas.pedir_fecha("Hasta (DD/MM/AAAA)")
+            
+            resultado = self.controlador_consultas.buscar_casos(texto, especialidad, id_doctor, fecha_desde, fecha_hasta)
+            
+            if not resultado["exito"]:
+                Mensajes.mostrar(resultado)
+                return
+            
+            datos_tabla = [{
+                "id_consulta": caso["id_consulta"],
+                "id_paciente": caso["id_paciente"],
+                "id_doctor": caso["id_doctor"],
+                "fecha": caso["fecha_hora"][:10],
+                "especialidad": caso["especialidad"],
+                "diagnostico": caso["diagnostico"],
+                "tratamiento": caso.get("tratamiento") or "-"
+            } for caso in resultado["datos"]]
+            
+            config = [
+                ("id_consulta", "ID Consulta"),
+                ("id_paciente", "ID Paciente"),
+                ("id_doctor", "ID Doctor"),
+                ("fecha", "Fecha"),
+                ("especialidad", "Especialidad"),
+                ("diagnostico", "Diagnostico"),
+                ("tratamiento", "Tratamiento")
+            ]
+            
+            Tablas.mostrar(f"CASOS PARA '{texto}'", config, datos_tabla)
+            Helpers.pausar()
+        
+        except KeyboardInterrupt:
+            print("\n\nBusqueda cancelada por el Doctor.")
+            Helpers.pausar()
+        except Exception as e:
+            Mensajes.mostrar({"exito": False, "mensaje": f"Error inesperado: {str(e)}"})
+    
     def medicamentos_disponibles(self):
         """Opción 6: Ver inventario de medicamentos"""
         Helpers.limpiar_pantalla()
@@ -8,10 +8,11 @@ from src.controllers.personal_controller import PersonalController
 from src.controllers.facturacion_controller import FacturacionController
 from src.controllers.inventario_controller import InventarioController
 from src.utils.helpers import Helpers
+from src.utils.validaciones import Validaciones
 from src.views.componentes.inputs import Entradas
 from src.views.componentes.mensajes import Mensajes
 from src.views.componentes.tablas import Tablas
-from src.config.constantes import TIPOS_SEGURO, ESPECIALIDADES
+from src.config.constantes import TIPOS_SEGURO, ESPECIALIDADES, PRIORIDADES_ESPERA
 from datetime import date
 class MenuRecepcionista:
     """Menu principal de Recepcionista"""
@@ -43,6 +44,8 @@ class MenuRecepcionista:
             print("6. Reprogramar cita")
             print("7. Cancelar cita")
             print("8. Consultar citas del día")
+            print("12. Agregar paciente a lista de espera")
+            print("13. Responder oferta de lista de espera")
             print("\nFACTURACIÓN:")
             print("9. Registrar pago de factura")
             print("10. Consultar facturas pendientes")
@@ -52,7 +55,7 @@ class MenuRecepcionista:
             print("═" * 50)
             
             # Pedir opcion y validar
-            opcion = Entradas.pedir_entero("\nSeleccione una opcion", 0, 11)
+            opcion = Entradas.pedir_entero("\nSeleccione una opcion", 0, 13)
             
             # Opciones
             if opcion == 1:
@@ -77,6 +80,10 @@ class MenuRecepcionista:
                 self.consultar_facturas()
             elif opcion == 11:
                 self.inventario_medicamentos()
+            elif opcion == 12:
+                self.agregar_lista_espera()
+            elif opcion == 13:
+                self.responder_oferta_espera()
             elif opcion == 0:
                 print("\nCerrando sesion de Recepcionista...")
                 Helpers.pausar()
@@ -153,10 +160,37 @@ class MenuRecepcionista:
         print("=" * 50)
         
         try:
-            # Pedir DNI
-            dni_buscar = Entradas.pedir_texto("\nIngrese DNI a buscar")
+            # Pedir DNI o nombre
+            texto_buscar = Entradas.pedir_texto("\nIngrese DNI o nombre a buscar")
             
-            resultado = self.controlador_pacientes.buscar_por_dni(dni_buscar)
+            # Si no es un DNI se buscan pacientes con nombre parecido
+            if not Validaciones.validar_dni(texto_buscar):
+                resultado = self.controlador_pacientes.buscar_por_nombre(texto_buscar)
+                
+                if resultado["exito"]:
+                    datos_tabla = [{
+                        "id_paciente": p.id_paciente,
+                        "dni": p._dni,
+                        "nombre": p._nombre,
+                        "telefono": p._telefono,
+                        "tipo_seguro": p.tipo_seguro
+                    } for p in resultado["datos"]]
+                    
+                    config = [
+                        ("id_paciente", "ID"),
+                        ("dni", "DNI"),
+                        ("nombre", "Nombre"),
+                        ("telefono", "Telefono"),
+                        ("tipo_seguro", "Seguro")
+                    ]
+                    
+                    Tablas.mostrar(f"PACIENTES PARECIDOS A '{texto_buscar}'", config, datos_tabla)
+                    Helpers.pausar()
+                else:
+                    Mensajes.mostrar(resultado)
+                return
+            
+            resultado = self.controlador_pacientes.obtener_resumen(dni=texto_buscar)
             
             # Evaluar si se encontro al paciente
             if resultado["exito"]:
@@ -164,15 +198,21 @@ class MenuRecepcionista:
                 
                 # Mostrar en formato detalles
                 Tablas.mostrar_detalle("DATOS DEL PACIENTE", {
-                    "ID": paciente.id_paciente,
-                    "DNI": paciente._dni,
-                    "Nombre": paciente._nombre,
-                    "Fecha nacimiento": paciente._fecha_nacimiento,
-                    "Telefono": paciente._telefono,
-                    "Tipo de seguro": paciente.tipo_seguro,
-                    "Fecha de registro": paciente._fecha_registro,
-                    "Porcentaje de descuento": f"{paciente._porcentaje_descuento}%",
-                    "Historial de consultas": ", ".join(map(str, paciente.historial_consultas)) if paciente.historial_consultas else "Sin consultas"
+                    "ID": paciente["id_paciente"],
+                    "DNI": paciente["dni"],
+                    "Nombre": paciente["nombre"],
+                    "Edad": paciente["edad"],
+                    "Fecha nacimiento": paciente["fecha_nacimiento"],
+                    "Telefono": paciente["telefono"],
+                    "Tipo de seguro": paciente["tipo_seguro"],
+                    "Fecha de registro": paciente["fecha_registro"],
+                    "Porcentaje de descuento": f"{paciente['porcentaje_descuento']}%",
+                    "Visitas": paciente["visitas"],
+                    "Ultima visita": paciente["ultima_visita"] or "Sin consultas",
+                    "Citas pendientes": paciente["citas_pendientes"],
+                    "Proxima cita": paciente["proxima_cita"] or "-",
+                    "Facturas pendientes": f"{paciente['facturas_pendientes']} ({Helpers.formatear_precio(paciente['monto_pendiente'])})",
+                    "Historial de consultas": ", ".join(map(str, paciente["historial_consultas"])) if paciente["historial_consultas"] else "Sin consultas"
                 })
                 
                 Helpers.pausar()
@@ -398,8 +438,18 @@ class MenuRecepcionista:
             id_doctor = int(Entradas.pedir_opcion("Selecciona ID del Doctor", ids_permitidos))
             nombre_doctor = next((d._nombre for d in doctores if d.id_personal == id_doctor), "")
             
-            # Pedir fecha y hora
+            # Pedir fecha y mostrar horarios libres del doctor
             fecha = Entradas.pedir_fecha("Fecha de la cita")
+
+            horarios_libres = self.controlador_citas.listar_horarios_libres(id_doctor, fecha)
+            if horarios_libres["exito"]:
+                print(f"\nHorarios libres del {fecha.strftime('%d/%m/%Y')}:")
+                horas = [hora.strftime("%H:%M") for hora in horarios_libres["datos"]]
+                for i in range(0, len(horas), 8):
+                    print("    " + "  ".join(horas[i:i + 8]))
+            else:
+                print(f"\n[!] AVISO: {horarios_libres['mensaje']}")
+
             hora = Entradas.pedir_hora("Hora de la cita")
             
             # Motivo
@@ -666,6 +716,129 @@ class MenuRecepcionista:
         except Exception as e:
             Mensajes.mostrar({"exito": False, "mensaje": f"Error inesperado: {str(e)}"})
     
+    def agregar_lista_espera(self):
+        """Opcion 12: Agregar paciente a lista de espera"""
+        Helpers.limpiar_pantalla()
+        print("=" * 50)
+        print("     AGREGAR A LISTA DE ESPERA")
+        print("=" * 50)
+        
+        try:
+            # Solicitar DNI
+            dni_paciente = Entradas.pedir_texto("\nIngrese DNI del paciente")
+            
+            # Buscar paciente
+            resultado_paciente = self.controlador_pacientes.buscar_por_dni(dni_paciente)
+        
+            if not resultado_paciente["exito"]:
+                Mensajes.mostrar(resultado_paciente)
+                return 
+            
+            paciente = resultado_paciente["datos"]
+            print(f"Paciente: {paciente._nombre} | ID: {paciente.id_paciente}")
+            
+            # Mostrar especialidades
+            print("\nEspecialidades de Doctores:")
+            for i, esp in enumerate(ESPECIALIDADES, 1):
+                print(f"    {i}. {esp}") 
+            especialidad = Entradas.pedir_opcion("Seleccione especialidad", list(ESPECIALIDADES))
+            
+            # Doctor especifico (opcional)
+            id_doctor = None
+            if Entradas.confirmar_accion("¿El paciente quiere un doctor en especifico?"):
+                doctores_encontrados = self.controlador_personal.obtener_doctores_por_especialidad(especialidad)
+                
+                if not doctores_encontrados["exito"]:
+                    Mensajes.mostrar(doctores_encontrados)
+                    return
+                
+                doctores = doctores_encontrados["datos"]
+                ids_permitidos = [doctor.id_personal for doctor in doctores]
+                for i, doctor in enumerate(doctores, 1):
+                    print(f"    {i}. Doctor: {doctor._nombre} | ID: {doctor.id_personal}")
+                id_doctor = int(Entradas.pedir_opcion("Selecciona ID del Doctor", ids_permitidos))
+            
+            # Ventana de fechas y prioridad
+            fecha_desde = Entradas.pedir_fecha("Desde que fecha puede asistir")
+            fecha_hasta = Entradas.pedir_fecha("Hasta que fecha puede asistir")
+            
+            print("\nPrioridad:")
+            for valor, nombre in PRIORIDADES_ESPERA.items():
+                print(f"    {valor}. {nombre}")
+            prioridad = Entradas.pedir_entero("Seleccione prioridad", 1, 3)
+            
+            # Registrar
+            resultado = self.controlador_citas.lista_espera.registrar_solicitud(
+                id_paciente=paciente.id_paciente,
+                especialidad=especialidad,
+                fecha_desde=fecha_desde,
+                fecha_hasta=fecha_hasta,
+                prioridad=prioridad,
+                id_doctor=id_doctor
+            )
+            
+            # Mostrar resultado
+            Mensajes.mostrar(resultado)
+            
+        except KeyboardInterrupt:
+            print("\n\nAccion cancelada por el usuario.")
+            Helpers.pausar()
+        except Exception as e:
+            Mensajes.mostrar({"exito": False, "mensaje": f"Error inesperado: {str(e)}"})
+    
+    def responder_oferta_espera(self):
+        """Opcion 13: Responder oferta de lista de espera"""
+        Helpers.limpiar_pantalla()
+        print("=" * 50)
+        print("     RESPONDER OFERTA DE LISTA DE ESPERA")
+        print("=" * 50)
+        
+        try:
+            # Solicitar ID de la solicitud
+            id_solicitud = Entradas.pedir_entero("\nIngresa ID de la solicitud", 1)
+            
+            # Buscar solicitud
+            resultado_solicitud = self.controlador_citas.lista_espera.buscar_por_id(id_solicitud)
+            
+            if not resultado_solicitud["exito"]:
+                Mensajes.mostrar(resultado_solicitud)
+                return
+            
+            solicitud = resultado_solicitud["datos"]
+            oferta = solicitud.oferta
+            
+            if oferta is None:
+                print(f"\n[!] AVISO: La solicitud no tiene una oferta vigente. Estado: {solicitud.estado}")
+                Helpers.pausar()
+                return
+            
+            # Mostrar oferta
+            Tablas.mostrar_detalle("HUECO OFRECIDO", {
+                "ID Solicitud": solicitud.id_solicitud,
+                "ID Paciente": solicitud.id_paciente,
+                "ID Doctor": oferta["id_doctor"],
+                "Especialidad": solicitud.especialidad,
+                "Fecha": oferta["fecha"],
+                "Hora": oferta["hora"],
+                "Responder antes de": oferta.get("vence", "-")
+            })
+            
+            # Aceptar o rechazar
+            if Entradas.confirmar_accion("¿El paciente acepta el hueco?"):
+                motivo = Entradas.pedir_texto("Motivo")
+                resultado = self.controlador_citas.aceptar_oferta_espera(id_solicitud, motivo)
+            else:
+                resultado = self.controlador_citas.lista_espera.rechazar_oferta(id_solicitud)
+            
+            # Mostrar resultado
+            Mensajes.mostrar(resultado)
+            
+        except KeyboardInterrupt:
+            print("\n\nAccion cancelada por el usuario.")
+            Helpers.pausar()
+        except Exception as e:
+            Mensajes.mostrar({"exito": False, "mensaje": f"Error inesperado: {str(e)}"})
+    
     # ========== GESTION DE FACTURACION ==========
     def registrar_pago_factura(self):
         """Opción 9: Registrar pago de factura"""
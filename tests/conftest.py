@@ -0,0 +1,68 @@
+"""
+Configuracion comun de las pruebas
+
+Cada prueba trabaja en una carpeta temporal con su propio data/: los
+archivos JSON empiezan vacios y los indices compartidos no se mezclan entre
+pruebas (se identifican por la ruta absoluta del archivo).
+"""
+import json
+import pytest
+
+ARCHIVOS_DATOS = [
+    "citas", "consultas", "contratos", "departamentos", "excepciones_horario", "facturas",
+    "lista_espera", "medicamentos", "movimientos_inventario", "pacientes", "personal", "transacciones"
+]
+
+def escribir_json(ruta, datos) -> None:
+    """Escribe un archivo JSON de prueba"""
+    with open(ruta, "w", encoding="utf-8") as archivo:
+        json.dump(datos, archivo, ensure_ascii=False, indent=2)
+
+def leer_json(ruta):
+    """Lee un archivo JSON de prueba"""
+    with open(ruta, encoding="utf-8") as archivo:
+        return json.load(archivo)
+
+def paciente(id_paciente: int, dni: str | None = None) -> dict:
+    """Registro de paciente valido"""
+    return {
+        "dni": dni or f"1000{id_paciente:04d}",
+        "nombre": f"Paciente Numero {id_paciente}",
+        "fecha_nacimiento": "1990-01-01",
+        "telefono": "912345678",
+        "id_paciente": id_paciente,
+        "tipo_seguro": "Publico",
+        "porcentaje_descuento": 20,
+        "fecha_registro": "2024-01-01",
+        "historial_consultas": []
+    }
+
+def personal(id_personal: int, rol: str = "Doctor", jornada: str = "Tiempo completo", turno: str | None = None,
+             estado: str = "Activo", departamentos: list | None = None) -> dict:
+    """Registro de personal valido"""
+    return {
+        "dni": f"2000{id_personal:04d}",
+        "nombre": f"Personal Numero {id_personal}",
+        "fecha_nacimiento": "1980-01-01",
+        "telefono": "912345678",
+        "id_personal": id_personal,
+        "rol": rol,
+        "especialidad": "Medicina General" if rol == "Doctor" else None,
+        "departamentos": departamentos or [6],
+        "jornada": jornada,
+        "turno": turno,
+        "salario_base": 5000.0,
+        "estado": estado,
+        "fecha_contratacion": "2020-01-01",
+        "fecha_baja": None,
+        "motivo_baja": None
+    }
+
+@pytest.fixture(autouse=True)
+def carpeta_datos(tmp_path, monkeypatch):
+    """Carpeta de trabajo temporal con data/ vacio"""
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "data").mkdir()
+    for nombre in ARCHIVOS_DATOS:
+        escribir_json(tmp_path / "data" / f"{nombre}.json", [])
+    return tmp_path
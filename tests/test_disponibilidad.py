@@ -0,0 +1,59 @@
+"""Pruebas de DisponibilidadPersonal: horario base y excepciones como mascaras"""
+from datetime import date, time
+from src.utils.persistencia import Persistencia
+from src.utils.indices import MapaOcupacion
+from src.utils.proyecciones import DisponibilidadPersonal
+from tests.conftest import personal
+
+DIA = date(2026, 11, 2)
+
+def crear_disponibilidad():
+    personal_datos = Persistencia("data/personal.json")
+    excepciones = Persistencia("data/excepciones_horario.json")
+    return personal_datos, excepciones, DisponibilidadPersonal.compartido(personal_datos, excepciones)
+
+def test_mascara_base_por_jornada_y_turno():
+    personal_datos, _, disponibilidad = crear_disponibilidad()
+    personal_datos.agregar(personal(1, jornada="Tiempo completo"))
+    personal_datos.agregar(personal(2, jornada="Por turnos", turno="Tarde"))
+    personal_datos.agregar(personal(3, jornada="Medio tiempo"))
+
+    assert disponibilidad.mascara(1, DIA) == MapaOcupacion.DIA_COMPLETO
+    assert disponibilidad.mascara(2, DIA) == MapaOcupacion.mascara_entre(time(13, 0), time(19, 0))
+    assert disponibilidad.mascara(3, DIA) == MapaOcupacion.mascara_entre(time(7, 0), time(13, 0))
+    assert disponibilidad.filtrar([1, 2, 3], DIA, time(14, 0)) == [1, 2]
+
+def test_personal_inactivo_o_inexistente_no_atiende():
+    personal_datos, _, disponibilidad = crear_disponibilidad()
+    personal_datos.agregar(personal(1))
+
+    personal_datos.actualizar(1, {"estado": "Inactivo"}, "id_personal")
+    assert disponibilidad.mascara(1, DIA) == 0
+    assert disponibilidad.mascara(99, DIA) == 0
+    assert not disponibilidad.disponible(99, DIA, time(9, 0))
+
+def test_excepciones_quitan_y_agregan_bloques():
+    personal_datos, excepciones, disponibilidad = crear_disponibilidad()
+    personal_datos.agregar(personal(2, jornada="Por turnos", turno="Tarde"))
+
+    excepciones.agregar({"id_excepcion": 1, "id_personal": 2, "fecha": DIA.isoformat(), "tipo": "Ausencia",
+                         "hora_inicio": "13:00:00", "hora_fin": "14:00:00", "motivo": ""})
+    excepciones.agregar({"id_excepcion": 2, "id_personal": 2, "fecha": DIA.isoformat(), "tipo": "Horario extra",
+                         "hora_inicio": "09:00:00", "hora_fin": "10:00:00", "motivo": ""})
+
+    esperado = (MapaOcupacion.mascara_entre(time(14, 0), time(19, 0))
+                | MapaOcupacion.mascara_entre(time(9, 0), time(10, 0)))
+    assert disponibilidad.mascara(2, DIA) == esperado
+    assert not disponibilidad.disponible(2, DIA, time(13, 30))
+    assert disponibilidad.disponible(2, DIA, time(9, 45))
+
+    # Otro dia no se ve afectado
+    assert disponibilidad.mascara(2, date(2026, 11, 3)) == MapaOcupacion.mascara_entre(time(13, 0), time(19, 0))
+
+    # Ausencia de todo el dia y luego su eliminacion
+    excepciones.agregar({"id_excepcion": 3, "id_personal": 2, "fecha": DIA.isoformat(), "tipo": "Ausencia",
+                         "hora_inicio": None, "hora_fin": None, "motivo": "Licencia"})
+    assert disponibilidad.mascara(2, DIA) == MapaOcupacion.mascara_entre(time(9, 0), time(10, 0))
+
+    excepciones.eliminar(3, "id_excepcion")
+    assert disponibilidad.mascara(2, DIA) == esperado
@@ -0,0 +1,157 @@
+"""Pruebas de las importaciones de pacientes y de personal (duplicados y filas invalidas)"""
+import csv
+import json
+from src.controllers.paciente_controller import PacienteController
+from src.controllers.personal_controller import PersonalController
+from tests.conftest import escribir_json, leer_json, paciente, personal
+
+CAMPOS_PACIENTE = ["dni", "nombre", "fecha_nacimiento", "telefono", "tipo_seguro", "fecha_registro"]
+CAMPOS_PERSONAL = ["dni", "nombre", "fecha_nacimiento", "telefono", "rol", "especialidad", "departamentos",
+                   "jornada", "turno", "salario_base", "fecha_contratacion", "tipo_contrato", "fecha_fin"]
+
+def escribir_csv(ruta, campos, filas) -> None:
+    """Escribe un CSV de prueba con encabezado"""
+    with open(ruta, "w", encoding="utf-8", newline="") as archivo:
+        escritor = csv.DictWriter(archivo, fieldnames=campos)
+        escritor.writeheader()
+        escritor.writerows(filas)
+
+def leer_rechazos(ruta) -> dict:
+    """Motivo de rechazo por numero de fila"""
+    with open(ruta, encoding="utf-8", newline="") as archivo:
+        return {int(fila["fila"]): fila["motivo"] for fila in csv.DictReader(archivo)}
+
+def fila_personal(dni: str, **campos) -> dict:
+    """Fila valida de importacion de personal"""
+    fila = {"dni": dni, "nombre": f"Empleado {dni}", "fecha_nacimiento": "15/03/1985", "telefono": "912345678",
+            "rol": "Doctor", "especialidad": "Pediatria", "departamentos": "1", "jornada": "Tiempo completo",
+            "turno": "", "salario_base": "", "fecha_contratacion": "01/02/2024", "tipo_contrato": "Indefinido",
+            "fecha_fin": ""}
+    fila.update(campos)
+    return fila
+
+# ========== Pacientes ==========
+def test_importar_pacientes_rechaza_duplicados_y_filas_invalidas():
+    escribir_json("data/pacientes.json", [paciente(1, dni="11111111")])
+    escribir_csv("pacientes.csv", CAMPOS_PACIENTE, [
+        {"dni": "22222222", "nombre": "Ana Torres", "fecha_nacimiento": "10/05/1990", "telefono": "987654321",
+         "tipo_seguro": "Privado", "fecha_registro": ""},
+        {"dni": "11111111", "nombre": "Ya Registrado", "fecha_nacimiento": "10/05/1990", "telefono": "987654321",
+         "tipo_seguro": "Publico", "fecha_registro": ""},
+        {"dni": "22222222", "nombre": "Repetida En Archivo", "fecha_nacimiento": "10/05/1990", "telefono": "987654321",
+         "tipo_seguro": "Publico", "fecha_registro": ""},
+        {"dni": "33333333", "nombre": "Fecha Mala", "fecha_nacimiento": "31/02/1990", "telefono": "987654321",
+         "tipo_seguro": "Publico", "fecha_registro": ""},
+        {"dni": "44444444", "nombre": "Telefono Malo", "fecha_nacimiento": "1990-05-10", "telefono": "12345",
+         "tipo_seguro": "Publico", "fecha_registro": ""},
+        {"dni": "55555555", "nombre": "Luis Ramos", "fecha_nacimiento": "1990-05-10", "telefono": "987654321",
+         "tipo_seguro": "Ninguno", "fecha_registro": "2024-01-15"},
+    ])
+
+    resultado = PacienteController().importar_pacientes("pacientes.csv", procesos=1)
+
+    assert resultado["exito"]
+    assert resultado["datos"]["importados"] == 2
+    assert resultado["datos"]["rechazados"] == 4
+    assert resultado["datos"]["ids"] == [2, 3]
+
+    rechazos = leer_rechazos(resultado["datos"]["ruta_rechazos"])
+    assert sorted(rechazos) == [3, 4, 5, 6]
+    assert rechazos[3] == rechazos[4] == "El DNI ya existe"
+
+    guardados = {p["dni"]: p for p in leer_json("data/pacientes.json")}
+    assert sorted(guardados) == ["11111111", "22222222", "55555555"]
+    assert guardados["22222222"]["porcentaje_descuento"] == 50
+    assert guardados["55555555"]["fecha_registro"] == "2024-01-15"
+
+def test_importar_pacientes_sin_filas_validas_no_escribe():
+    escribir_csv("pacientes.csv", CAMPOS_PACIENTE, [
+        {"dni": "abc", "nombre": "DNI Malo", "fecha_nacimiento": "10/05/1990", "telefono": "987654321",
+         "tipo_seguro": "Publico", "fecha_registro": ""},
+    ])
+
+    resultado = PacienteController().importar_pacientes("pacientes.csv", procesos=1)
+
+    assert not resultado["exito"]
+    assert resultado["datos"]["rechazados"] == 1
+    assert leer_json("data/pacientes.json") == []
+
+def test_importar_pacientes_archivo_inexistente():
+    resultado = PacienteController().importar_pacientes("no_existe.csv", procesos=1)
+    assert not resultado["exito"]
+    assert resultado["datos"] is None
+
+# ========== Personal ==========
+def test_importar_personal_csv_rechaza_duplicados_y_filas_invalidas():
+    escribir_json("data/personal.json", [personal(1, departamentos=[1])])
+    escribir_json("data/departamentos.json", [
+        {"id_departamento": 1, "nombre": "Pediatria", "descripcion": None, "id_jefe": 1, "personal_asignado": [1]}
+    ])
+    escribir_csv("personal.csv", CAMPOS_PERSONAL, [
+        fila_personal("30000001"),
+        fila_personal("30000001", nombre="Repetido En Archivo"),
+        fila_personal("30000002", departamentos="1;1"),
+        fila_personal("30000003", fecha_contratacion="2024-13-01"),
+        fila_personal("30000004", rol="Cirujano"),
+        fila_personal("30000005", rol="Enfermera", especialidad="", jornada="Por turnos", turno="Noche",
+                      departamentos="2", tipo_contrato="Temporal", fecha_fin="31/12/2030"),
+    ])
+
+    resultado = PersonalController().importar_personal("personal.csv", procesos=1)
+
+    assert resultado["exito"]
+    assert resultado["datos"]["importados"] == 2
+    assert resultado["datos"]["rechazados"] == 4
+
+    rechazos = leer_rechazos(resultado["datos"]["ruta_rechazos"])
+    assert sorted(rechazos) == [3, 4, 5, 6]
+    assert rechazos[3] == "El DNI ya existe"
+    assert "Departamentos repetidos" in rechazos[4]
+
+    assert resultado["datos"]["ids"] == [2, 3]
+    guardados = leer_json("data/personal.json")
+    assert [p["dni"] for p in guardados[1:]] == ["30000001", "30000005"]
+    assert [c["id_personal"] for c in leer_json("data/contratos.json")] == [2, 3]
+    # El departamento 2 no esta registrado: solo se actualiza el 1
+    assert leer_json("data/departamentos.json")[0]["personal_asignado"] == [1, 2]
+    assert leer_json("data/transacciones.json") == []
+
+def test_importar_personal_json_contra_el_sistema():
+    primero = PersonalController().importar_personal(
+        _escribir_personal_json("primero.json", [fila_personal("30000001", departamentos=[1])]), procesos=1
+    )
+    assert primero["exito"]
+
+    resultado = PersonalController().importar_personal(
+        _escribir_personal_json("segundo.json", [
+            fila_personal("30000001", departamentos=[1]),
+            fila_personal("30000002", departamentos=[2, 2]),
+            "no es un objeto",
+            fila_personal("30000003", departamentos=[1], salario_base=4200),
+            fila_personal("30000004", departamentos=[1], salario_base=5000),
+        ]), procesos=1
+    )
+
+    assert resultado["datos"]["importados"] == 1
+    assert resultado["datos"]["ids"] == [2]
+
+    rechazos = leer_rechazos(resultado["datos"]["ruta_rechazos"])
+    assert sorted(rechazos) == [1, 2, 3, 4]
+    assert rechazos[1] == "El DNI ya existe"
+    assert "Departamentos repetidos" in rechazos[2]
+    assert "no concuerda" in rechazos[4]
+
+    guardados = {p["dni"]: p for p in leer_json("data/personal.json")}
+    assert sorted(guardados) == ["30000001", "30000004"]
+    assert guardados["30000004"]["salario_base"] == 5000
+
+def test_importar_personal_formato_invalido():
+    escribir_json("personal.txt", [])
+    resultado = PersonalController().importar_personal("personal.txt", procesos=1)
+    assert not resultado["exito"]
+
+def _escribir_personal_json(ruta, filas) -> str:
+    """Escribe un JSON de importacion de personal y devuelve su ruta"""
+    with open(ruta, "w", encoding="utf-8") as archivo:
+        json.dump(filas, archivo, ensure_ascii=False)
+    return ruta
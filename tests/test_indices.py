@@ -0,0 +1,152 @@
+"""Pruebas de los indices en memoria (rangos, ocupacion y valores unicos)"""
+import random
+from datetime import date, time, timedelta
+import pytest
+from src.utils.persistencia import Persistencia
+from src.utils.indices import IndiceIntervalos, IndiceOrdenado, IndiceUnico, MapaOcupacion
+from src.utils.excepciones import DNIDuplicadoException
+from src.controllers.paciente_controller import PacienteController
+from tests.conftest import escribir_json, leer_json, paciente
+
+# ========== IndiceOrdenado ==========
+def test_ordenado_anteriores_y_entre():
+    citas = Persistencia("data/citas.json")
+    indice = IndiceOrdenado.compartido(citas, campos_orden=("fecha", "hora"), campo_id="id_cita",
+                                       filtro={"estado": "Agendada"})
+    for id_cita, (fecha, hora, estado) in enumerate([
+        ("2026-01-02", "09:00:00", "Agendada"),
+        ("2026-01-01", "10:00:00", "Agendada"),
+        ("2026-01-03", "08:00:00", "Cancelada"),
+        ("2026-01-03", "11:00:00", "Agendada"),
+        ("2026-01-05", "07:00:00", "Agendada"),
+    ], 1):
+        citas.agregar({"id_cita": id_cita, "fecha": fecha, "hora": hora, "estado": estado})
+
+    assert [c["id_cita"] for c in indice.anteriores(("2026-01-03", "00:00:00"))] == [2, 1]
+    assert [c["id_cita"] for c in indice.entre(("2026-01-02",), ("2026-01-03",))] == [1, 4]
+    assert indice.entre(("2026-01-06",), ("2026-01-09",)) == []
+
+    # Los cambios se aplican sin releer el archivo
+    citas.actualizar(4, {"estado": "Cancelada"}, "id_cita")
+    assert [c["id_cita"] for c in indice.entre(("2026-01-01",), ("2026-01-31",))] == [2, 1, 5]
+
+# ========== IndiceIntervalos ==========
+def test_intervalos_vigentes_y_solapados():
+    contratos = Persistencia("data/contratos.json")
+    indice = IndiceIntervalos.compartido(contratos, campo_desde="fecha_inicio", campo_hasta="fecha_fin",
+                                         campo_id="id_contrato", campos_grupo=("id_personal",))
+    contratos.agregar({"id_contrato": 1, "id_personal": 1, "fecha_inicio": "2025-01-01", "fecha_fin": "2025-06-30"})
+    contratos.agregar({"id_contrato": 2, "id_personal": 1, "fecha_inicio": "2025-07-01", "fecha_fin": None})
+    contratos.agregar({"id_contrato": 3, "id_personal": 2, "fecha_inicio": "2025-03-01", "fecha_fin": "2025-03-31"})
+
+    assert [c["id_contrato"] for c in indice.vigentes("2025-03-15")] == [1, 3]
+    assert [c["id_contrato"] for c in indice.vigentes(date(2030, 1, 1))] == [2]
+    assert [c["id_contrato"] for c in indice.solapados("2025-06-15", "2025-07-15", campo="id_personal", valor=1)] == [1, 2]
+    assert indice.vigentes("2024-12-31") == []
+
+    with pytest.raises(ValueError):
+        indice.vigentes("2025-03-15", campo="tipo", valor="Temporal")
+
+def test_intervalos_cambios_incrementales_coinciden_con_recorrido():
+    registros = Persistencia("data/contratos.json")
+    indice = IndiceIntervalos.compartido(registros, campo_desde="desde", campo_hasta="hasta",
+                                         campo_id="id", campos_grupo=("grupo",), filtro={"estado": "A"})
+    azar = random.Random(7)
+    base = date(2025, 1, 1)
+
+    def dia(n: int) -> str:
+        return (base + timedelta(days=n)).isoformat()
+
+    def nuevo(id_registro: int) -> dict:
+        inicio = azar.randint(0, 300)
+        return {"id": id_registro, "desde": dia(inicio), "hasta": azar.choice([None, dia(inicio + azar.randint(0, 60))]),
+                "grupo": azar.randint(1, 3), "estado": "A"}
+
+    for id_registro in range(1, 101):
+        registros.agregar(nuevo(id_registro))
+    indice.vigentes(dia(0))
+
+    def esperado(desde: str, hasta: str, grupo) -> list:
+        filas = [r for r in registros.leer_todos()
+                 if r["estado"] == "A" and (grupo is None or r["grupo"] == grupo)
+                 and r["desde"] <= hasta and (r["hasta"] or IndiceIntervalos.SIN_FIN) >= desde]
+        filas.sort(key=lambda r: (r["desde"], r["hasta"] or IndiceIntervalos.SIN_FIN, r["id"]))
+        return [r["id"] for r in filas]
+
+    siguiente = 101
+    for _ in range(200):
+        operacion = azar.random()
+        if operacion < 0.35:
+            registros.agregar(nuevo(siguiente))
+            siguiente += 1
+        elif operacion < 0.7:
+            elegido = azar.choice(registros.leer_todos())
+            registros.actualizar(elegido["id"], {"estado": azar.choice("AB"), "hasta": dia(azar.randint(150, 400))}, "id")
+        else:
+            registros.eliminar(azar.choice(registros.leer_todos())["id"], "id")
+
+        desde = azar.randint(0, 350)
+        hasta = desde + azar.randint(0, 30)
+        grupo = azar.choice([None, 1, 2, 3])
+        if grupo is None:
+            obtenido = indice.solapados(dia(desde), dia(hasta))
+        else:
+            obtenido = indice.solapados(dia(desde), dia(hasta), campo="grupo", valor=grupo)
+        assert [r["id"] for r in obtenido] == esperado(dia(desde), dia(hasta), grupo)
+
+# ========== MapaOcupacion ==========
+def test_mascara_entre_y_bloques():
+    assert MapaOcupacion.bloque_de(time(7, 0)) == 0
+    assert MapaOcupacion.bloque_de(time(21, 59)) == 59
+    assert MapaOcupacion.bloque_de(time(22, 0)) == -1
+    assert MapaOcupacion.bloque_de(time(6, 45)) == -1
+    assert MapaOcupacion.hora_de(4) == time(8, 0)
+
+    assert MapaOcupacion.mascara_entre(time(7, 0), time(8, 0)) == 0b1111
+    assert MapaOcupacion.mascara_entre(time(7, 10), time(7, 20)) == 0b11
+    assert MapaOcupacion.mascara_entre(time(6, 0), time(23, 0)) == MapaOcupacion.DIA_COMPLETO
+    assert MapaOcupacion.mascara_entre(time(9, 0), time(9, 0)) == 0
+
+def test_ocupacion_de_citas_agendadas():
+    citas = Persistencia("data/citas.json")
+    mapa = MapaOcupacion.compartido(citas, campo_recurso="id_doctor", campo_fecha="fecha", campo_hora="hora",
+                                    filtro={"estado": "Agendada"})
+    dia = date(2026, 3, 2)
+    citas.agregar({"id_cita": 1, "id_doctor": 1, "fecha": dia.isoformat(), "hora": "07:00:00", "estado": "Agendada"})
+    citas.agregar({"id_cita": 2, "id_doctor": 1, "fecha": dia.isoformat(), "hora": "07:30:00", "estado": "Agendada"})
+    citas.agregar({"id_cita": 3, "id_doctor": 2, "fecha": dia.isoformat(), "hora": "07:00:00", "estado": "Cancelada"})
+
+    assert mapa.ocupacion(1, dia) == 0b101
+    assert not mapa.libre(1, dia, time(7, 10))
+    assert mapa.libre(1, dia, time(7, 15))
+    assert mapa.bloques_libres(1, dia, MapaOcupacion.mascara_entre(time(7, 0), time(8, 0))) == [time(7, 15), time(7, 45)]
+    assert mapa.recursos_libres([1, 2], dia, time(7, 0)) == [2]
+
+    citas.actualizar(1, {"estado": "Cancelada"}, "id_cita")
+    assert mapa.libre(1, dia, time(7, 0))
+
+# ========== IndiceUnico (DNI) ==========
+def test_dni_unico_entre_instancias():
+    primera = Persistencia("data/pacientes.json")
+    segunda = Persistencia("data/pacientes.json")
+    IndiceUnico.compartido(primera, campo="dni", campo_id="id_paciente", excepcion=DNIDuplicadoException)
+
+    primera.agregar(paciente(1, dni="12345678"))
+    with pytest.raises(DNIDuplicadoException):
+        segunda.agregar(paciente(2, dni="12345678"))
+
+    assert len(primera.leer_todos()) == 1
+
+def test_dni_unico_con_escritura_concurrente():
+    controlador = PacienteController()
+
+    # El DNI esta libre cuando el controlador lo revisa...
+    assert not controlador.indice_dni.existe("12345678")
+
+    # ...pero otro proceso lo registra antes de que el controlador escriba
+    escribir_json("data/pacientes.json", [paciente(1, dni="12345678")])
+
+    resultado = controlador.registrar_paciente("12345678", "Otro Paciente", date(1990, 1, 1), "912345678",
+                                               "Ninguno", date(2024, 1, 1))
+    assert not resultado["exito"]
+    assert [p["id_paciente"] for p in leer_json("data/pacientes.json")] == [1]
@@ -0,0 +1,86 @@
+"""Pruebas de la lista de espera: ofrecer, aceptar y vencer ofertas"""
+from datetime import date, datetime, time, timedelta
+import pytest
+from src.controllers.cita_controller import CitaController
+from src.utils.persistencia import Persistencia
+from tests.conftest import escribir_json, paciente, personal
+
+HUECO = date.today() + timedelta(days=3)
+
+@pytest.fixture
+def citas():
+    escribir_json("data/pacientes.json", [paciente(1), paciente(2), paciente(3)])
+    escribir_json("data/personal.json", [personal(1)])
+    controlador = CitaController()
+
+    # Tres pacientes en espera de Medicina General; el 2 con prioridad Alta
+    for id_paciente, prioridad in ((1, 2), (2, 1), (3, 3)):
+        resultado = controlador.lista_espera.registrar_solicitud(
+            id_paciente, "Medicina General", date.today() + timedelta(days=1), date.today() + timedelta(days=10), prioridad
+        )
+        assert resultado["exito"]
+    return controlador
+
+def test_ofrecer_al_de_mayor_prioridad(citas):
+    espera = citas.lista_espera
+    resultado = espera.ofrecer_hueco(1, "Medicina General", HUECO, time(9, 0))
+
+    assert resultado["id"] == 2
+    solicitud = espera.buscar_por_id(2)["datos"]
+    assert solicitud.estado == "Ofrecida"
+    assert solicitud.oferta["vence"] <= datetime.combine(HUECO, time(9, 0)).isoformat()
+    assert espera.cantidad_en_espera() == 2
+
+def test_aceptar_oferta_agenda_la_cita(citas):
+    espera = citas.lista_espera
+    id_solicitud = espera.ofrecer_hueco(1, "Medicina General", HUECO, time(9, 0))["id"]
+
+    resultado = citas.aceptar_oferta_espera(id_solicitud, "Control de rutina")
+
+    assert resultado["exito"]
+    solicitud = espera.buscar_por_id(id_solicitud)["datos"]
+    assert solicitud.estado == "Asignada"
+    assert solicitud.id_cita == resultado["datos"]["id_cita"]
+
+def test_rechazar_pasa_el_hueco_al_siguiente(citas):
+    espera = citas.lista_espera
+    espera.ofrecer_hueco(1, "Medicina General", HUECO, time(9, 0))
+
+    resultado = espera.rechazar_oferta(2)
+
+    assert resultado["id"] == 1
+    assert espera.buscar_por_id(2)["datos"].estado == "Pendiente"
+
+def test_oferta_vencida_vuelve_a_la_cola(citas):
+    espera = citas.lista_espera
+    espera.ofrecer_hueco(1, "Medicina General", HUECO, time(9, 0))
+
+    assert espera.vencer_ofertas() == 0
+    assert espera.vencer_ofertas(datetime.now() + timedelta(days=2)) == 1
+
+    # La solicitud vencida vuelve a la cola y el hueco pasa al siguiente
+    assert espera.buscar_por_id(2)["datos"].estado == "Pendiente"
+    assert espera.buscar_por_id(1)["datos"].estado == "Ofrecida"
+
+def test_aceptar_oferta_vencida_no_agenda(citas):
+    espera = citas.lista_espera
+    espera.ofrecer_hueco(1, "Medicina General", HUECO, time(9, 0))
+
+    # El plazo de respuesta ya paso
+    Persistencia("data/lista_espera.json").actualizar(
+        2, {"oferta": {**espera.buscar_por_id(2)["datos"].oferta, "vence": "2000-01-01T00:00:00"},
+            "vence_oferta": "2000-01-01T00:00:00"}, "id_solicitud"
+    )
+
+    resultado = citas.aceptar_oferta_espera(2, "Control de rutina")
+
+    assert not resultado["exito"]
+    assert espera.buscar_por_id(2)["datos"].estado == "Pendiente"
+
+def test_reprogramar_en_el_mismo_bloque_no_ofrece_hueco(citas):
+    id_cita = citas.agendar_cita(1, 1, HUECO, time(9, 0), "Control de rutina")["datos"]["id_cita"]
+
+    resultado = citas.reprogramar_cita(id_cita, 1, HUECO, time(9, 10))
+
+    assert resultado["exito"]
+    assert citas.lista_espera.buscar_por_id(2)["datos"].estado == "Pendiente"
@@ -0,0 +1,105 @@
+"""Pruebas de Transaccion: confirmar, revertir y recuperar desde el diario"""
+import pytest
+from src.utils.persistencia import Persistencia
+from src.utils.transaccion import Transaccion
+
+@pytest.fixture
+def archivos():
+    a = Persistencia("data/a.json")
+    b = Persistencia("data/b.json")
+    diario = Persistencia("data/transacciones.json")
+    a.agregar({"id": 1, "valor": 0})
+    b.agregar({"id": 1, "valor": 0})
+    return a, b, diario
+
+def test_confirmar_escribe_todos_los_archivos(archivos):
+    a, b, diario = archivos
+    transaccion = Transaccion("prueba", diario)
+    transaccion.actualizar(a, 1, {"valor": 1}, "id")
+    transaccion.agregar(b, {"id": 2, "valor": 5}, "id")
+
+    transaccion.confirmar()
+    assert diario.leer_todos()[0]["estado"] == "Confirmando"
+
+    transaccion.terminar()
+    assert a.leer_todos() == [{"id": 1, "valor": 1}]
+    assert b.leer_todos() == [{"id": 1, "valor": 0}, {"id": 2, "valor": 5}]
+    assert diario.leer_todos() == []
+
+def test_revertir_despues_de_confirmar_restaura_y_compensa(archivos):
+    a, b, diario = archivos
+    compensados = []
+    transaccion = Transaccion("prueba", diario)
+    transaccion.ejecutar("paso", lambda datos: {"exito": True}, {"n": 1},
+                         compensacion="deshacer", funcion_compensacion=compensados.append)
+    transaccion.actualizar(a, 1, {"valor": 1}, "id")
+    transaccion.confirmar()
+
+    assert transaccion.revertir() == []
+    assert a.leer_todos() == [{"id": 1, "valor": 0}]
+    assert compensados == [{"n": 1}]
+    assert diario.leer_todos() == []
+
+    # Una segunda llamada no repite la compensacion
+    assert transaccion.revertir() == []
+    assert compensados == [{"n": 1}]
+
+def test_fallo_al_confirmar_deja_lo_pendiente_en_el_diario(archivos, monkeypatch):
+    a, b, diario = archivos
+    transaccion = Transaccion("prueba", diario)
+    transaccion.actualizar(a, 1, {"valor": 1}, "id")
+    transaccion.actualizar(b, 1, {"valor": 1}, "id")
+
+    # Falla la escritura de b y tambien la restauracion de a
+    def escritura_fallida(*args):
+        raise IOError("disco lleno")
+    monkeypatch.setattr(b, "guardar_lote", escritura_fallida)
+
+    restaurar = Transaccion._restaurar
+    def restauracion_fallida(persistencia, *args, **kwargs):
+        if persistencia is a:
+            raise IOError("sin acceso")
+        return restaurar(persistencia, *args, **kwargs)
+    monkeypatch.setattr(Transaccion, "_restaurar", staticmethod(restauracion_fallida))
+
+    with pytest.raises(IOError):
+        transaccion.confirmar()
+
+    # El llamador vuelve a revertir: no debe borrar la entrada del diario
+    errores = transaccion.revertir()
+    assert errores and "data/a.json" in errores[0]
+    assert transaccion.estado == "Revirtiendo"
+    assert diario.leer_todos()[0]["estado"] == "Revirtiendo"
+    assert a.leer_todos() == [{"id": 1, "valor": 1}]
+
+    # Al reiniciar, recuperar() termina de deshacer la escritura a medias
+    monkeypatch.setattr(Transaccion, "_restaurar", staticmethod(restaurar))
+    mensajes = Transaccion.recuperar({}, diario)
+    assert "revertida" in mensajes[0]
+    assert a.leer_todos() == [{"id": 1, "valor": 0}]
+    assert diario.leer_todos() == []
+
+def test_recuperar_es_idempotente(archivos):
+    a, b, diario = archivos
+    transaccion = Transaccion("prueba", diario)
+    transaccion.ejecutar("paso", lambda datos: {"exito": True}, {"n": 1}, compensacion="deshacer")
+    transaccion.actualizar(a, 1, {"valor": 1}, "id")
+    transaccion.confirmar()
+    # El programa se corta aqui: la transaccion queda en el diario
+
+    llamadas = []
+    def compensacion_fallida(datos):
+        llamadas.append(datos)
+        return {"exito": False, "mensaje": "servicio caido"}
+
+    mensajes = Transaccion.recuperar({"deshacer": compensacion_fallida}, diario)
+    assert "con errores" in mensajes[0]
+    assert a.leer_todos() == [{"id": 1, "valor": 0}]
+
+    # Una edicion posterior no se pisa al reintentar
+    a.actualizar(1, {"valor": 7}, "id")
+    mensajes = Transaccion.recuperar({"deshacer": lambda datos: llamadas.append(datos)}, diario)
+    assert "revertida" in mensajes[0]
+    assert a.leer_todos() == [{"id": 1, "valor": 7}]
+    assert llamadas == [{"n": 1}, {"n": 1}]
+    assert diario.leer_todos() == []